@@ -1,42 +1,1504 @@
 import sys
 import os
 import subprocess
+import threading
+import queue
+import multiprocessing
+import mmap
+from array import array
+from bisect import bisect_right
+
+# Frozen builds start extraction workers by re-running this file; they branch off here, before Qt loads
+multiprocessing.freeze_support()
+
 from PyQt6.QtWidgets import (
 QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog,
 QTreeWidget, QTreeWidgetItem, QLabel, QGridLayout, QScrollArea, QFrame,
 QListWidget, QMessageBox, QTabWidget, QSplitter, QGroupBox, QComboBox,
 QInputDialog, QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox, QLineEdit,
-QTextBrowser,  QAbstractItemView, QAbstractScrollArea, QMenu)
-from PyQt6.QtGui import QFileSystemModel, QDrag, QAction, QClipboard
+QTextBrowser,  QAbstractItemView, QAbstractScrollArea, QMenu, QSpinBox, QFileIconProvider, QDialog,
+QDialogButtonBox, QFormLayout)
+from PyQt6.QtGui import QDrag, QAction, QShortcut, QKeySequence, QClipboard, QTextCursor, QTextBlockFormat, QImageReader
 import time
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer,QMimeData, QUrl, QByteArray, QTimer
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, QTimer,QMimeData, QUrl, QByteArray, QTimer, QSize, QFileInfo
 from pathlib import Path
 import shutil
-from docx import Document
+import functools
+import json
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import OrderedDict
 from datetime import datetime
 import re
 from urllib.parse import urlparse
+from extraction import (
+    ExtractionCancelled, ExtractedTextStore, ExtractionPool, check_cancelled, file_signature, join_pages,
+    split_pages)
+from perf import EventLoopWatchdog, PerfRecorder
+import organizer_core
+import organizer_daemon
+import catalog_index
+import batch_rename
+
+APP_START_TIME = time.perf_counter()  # Baseline for the time-to-first-paint report
 
 
 class FileLoaderThread(QThread):
+    """Lists a folder off the UI thread: its regular files, or with all_entries every entry, folders too."""
     files_loaded = pyqtSignal(list)
 
-    def __init__(self, path, parent=None):
+    def __init__(self, path, all_entries=False, parent=None):
         super().__init__(parent)
         self.path = path
+        self.all_entries = all_entries
 
     def run(self):
         files = []
+        with PERF.span("scan_directory", path=self.path, syscalls=1) as span:
+            try:
+                if self.all_entries:
+                    files = [os.path.join(self.path, name) for name in os.listdir(self.path)]
+                    span.set("entries", len(files))
+                else:
+                    files = organizer_core.scan_directory(self.path, span=span)
+            except Exception as e:
+                print(f"[ERROR] Failed to load files in background: {e}")
+            span.set("files", len(files))
+        self.files_loaded.emit(files)
+
+
+PREVIEW_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif")
+
+
+class PreviewCache:
+    """Byte-bounded LRU of finished previews.
+
+    Keys include the file's size and mtime, so an edited file simply misses
+    the cache instead of showing a stale preview.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(file_path, variant):
+        stat = os.stat(file_path)
+        return (os.path.normcase(os.path.abspath(file_path)), stat.st_size, stat.st_mtime_ns, variant)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, cost):
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (value, cost)
+            self.total_bytes += cost
+            while self.total_bytes > self.max_bytes:
+                _, (_, old_cost) = self._entries.popitem(last=False)
+                self.total_bytes -= old_cost
+
+
+PREVIEW_CACHE = PreviewCache(96 * 1024 * 1024)
+
+
+class OpenDocumentCache:
+    """Small LRU of documents held open for previews, reopened when the file changes.
+
+    factory(file_path) must return an object with a signature attribute of
+    (size, mtime_ns) and a close() method.
+    """
+
+    def __init__(self, factory, limit):
+        self.factory = factory
+        self.limit = limit
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path):
+        key = os.path.normcase(os.path.abspath(file_path))
+        stat = os.stat(file_path)
+        evicted = []
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None and document.signature != (stat.st_size, stat.st_mtime_ns):
+                evicted.append(self._documents.pop(key))
+                document = None
+            if document is None:
+                document = self.factory(file_path)
+                self._documents[key] = document
+                while len(self._documents) > self.limit:
+                    evicted.append(self._documents.popitem(last=False)[1])
+            else:
+                self._documents.move_to_end(key)
+
+        for old_document in evicted:
+            old_document.close()
+        return document
+
+
+TEXT_PREVIEW_WINDOW = 64 * 1024  # Bytes decoded per text preview window
+TEXT_PREVIEW_MAX_WINDOWS = 4  # Windows appended by scrolling before Next has to page
+TEXT_LINE_INDEX_CHUNK = 1024 * 1024  # Bytes between line index checkpoints
+
+
+class TextFileWindow:
+    """Memory-mapped text file that is decoded one window at a time.
+
+    Only the requested window is copied out of the map, so a 2 GB log costs
+    the same memory to preview as a short note. The line index is sparse:
+    one (line number, byte offset) checkpoint per TEXT_LINE_INDEX_CHUNK bytes.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        stat = os.stat(file_path)
+        self.signature = (stat.st_size, stat.st_mtime_ns)
+        self.size = stat.st_size
+        self.line_count = None
+        self._index_lines = None
+        self._index_offsets = None
+        self._lock = threading.Lock()
+        self._file = open(file_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def read_window(self, offset, length=TEXT_PREVIEW_WINDOW):
+        """Decode about length bytes from offset, snapped to line boundaries.
+
+        Returns (start, end, text) where start/end are the byte offsets used.
+        """
+        with self._lock:
+            if self._map is None:
+                return 0, 0, ""
+            start = max(0, min(offset, self.size))
+            if 0 < start < self.size and self._map[start - 1] != 0x0A:
+                newline = self._map.find(b"\n", start, min(start + length, self.size))
+                if newline != -1:
+                    start = newline + 1
+            end = min(start + length, self.size)
+            if end < self.size:
+                newline = self._map.rfind(b"\n", start, end)
+                if newline != -1:
+                    end = newline + 1
+            return start, end, self._map[start:end].decode("utf-8", errors="ignore")
+
+    def build_line_index(self, cancel_event=None):
+        """Count lines once, recording a checkpoint at the start of each chunk."""
+        if self.line_count is not None:
+            return
+        lines = array("Q")
+        offsets = array("Q")
+        line = 0
+        position = 0
+        while position < self.size:
+            check_cancelled(cancel_event)
+            with self._lock:
+                if self._map is None:
+                    raise ExtractionCancelled()
+                end = min(position + TEXT_LINE_INDEX_CHUNK, self.size)
+                if end < self.size:
+                    newline = self._map.rfind(b"\n", position, end)
+                    if newline != -1:
+                        end = newline + 1
+                lines.append(line)
+                offsets.append(position)
+                line += self._map[position:end].count(b"\n")
+            position = end
+
+        with self._lock:
+            if self.size and self._map is not None and self._map[self.size - 1] != 0x0A:
+                line += 1  # Last line has no trailing newline
+        self._index_lines = lines
+        self._index_offsets = offsets
+        self.line_count = line
+
+    def offset_for_line(self, line):
+        """Byte offset where a 0-based line starts; needs the line index."""
+        index = max(bisect_right(self._index_lines, line) - 1, 0)
+        position = self._index_offsets[index]
+        current = self._index_lines[index]
+        with self._lock:
+            while current < line:
+                newline = self._map.find(b"\n", position)
+                if newline == -1:
+                    break
+                position = newline + 1
+                current += 1
+        return position
+
+    def line_at_offset(self, offset):
+        """0-based line number containing offset; needs the line index."""
+        index = max(bisect_right(self._index_offsets, offset) - 1, 0)
+        with self._lock:
+            return self._index_lines[index] + self._map[self._index_offsets[index]:offset].count(b"\n")
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+
+
+TEXT_DOCUMENTS = OpenDocumentCache(TextFileWindow, 8)
+
+
+def extract_txt_preview(file_path, cancel_event=None, offset=0, line=None, on_partial=None):
+    """Decode one window of a text file; line (0-based) is used once the line index exists."""
+    try:
+        window = TEXT_DOCUMENTS.get(file_path)
+        if window.size == 0:
+            return "text", "[File is empty]"
+        if line is not None and window.line_count is not None:
+            offset = window.offset_for_line(line)
+        start, end, text = window.read_window(offset)
+        return "text_window", {
+            "path": file_path,
+            "start": start,
+            "end": end,
+            "size": window.size,
+            "text": text,
+            "line": window.line_at_offset(start) if window.line_count is not None else None,
+            "line_count": window.line_count,
+        }
+    except ExtractionCancelled:
+        raise
+    except Exception as e:
+        return "text", f"[Failed to read text file: {e}]"
+
+
+def build_text_line_index(file_path, cancel_event=None, on_partial=None):
+    """Background job: index a text file's lines so the pager can jump by line."""
+    try:
+        window = TEXT_DOCUMENTS.get(file_path)
+        window.build_line_index(cancel_event)
+        return "text_index", {"path": file_path, "line_count": window.line_count}
+    except ExtractionCancelled:
+        raise
+    except Exception as e:
+        print(f"[ERROR] Could not index lines of {file_path}: {e}")
+        return "text_index", {"path": file_path, "line_count": None}
+
+
+DOCX_STREAM_INTERVAL = 0.1  # Seconds between partial DOCX preview updates
+
+
+def extract_docx_preview(file_path, cancel_event=None, on_partial=None):
+    """Preview a .docx from the text store, or stream its paragraphs while parsing.
+
+    With on_partial, paragraphs are sent as "text_stream" chunks while
+    word/document.xml is still being parsed; the returned value is the last
+    chunk. The full text is stored either way.
+    """
+    try:
+        key = PreviewCache.key(file_path, "docx")
+        cached = PREVIEW_CACHE.get(key)
+        if cached is not None:
+            return "text", cached
+
+        signature = file_signature(file_path)
+        stored = TEXT_STORE.get(file_path, signature)
+        if stored is not None:
+            content = stored[0] or "[Document is empty]"
+            PREVIEW_CACHE.put(key, content, len(content) * 2)
+            return "text", content
+
+        paragraphs = []
+        pending = []
+        streamed = False
+        last_emit = time.monotonic()
+
+        def add_paragraphs(batch, emit=True):
+            nonlocal pending, streamed, last_emit
+            for paragraph in batch:
+                if paragraph.strip():
+                    paragraphs.append(paragraph)
+                    pending.append(paragraph)
+            if emit and on_partial is not None and pending and time.monotonic() - last_emit >= DOCX_STREAM_INTERVAL:
+                on_partial("text_stream", {"path": file_path, "text": "\n\n".join(pending), "first": not streamed})
+                streamed = True
+                pending = []
+                last_emit = time.monotonic()
+
+        # Parsed in a worker process; batches of paragraphs arrive while it runs
+        last_batch = EXTRACTION_POOL.call(
+            "docx_paragraphs", file_path, cancel_event=cancel_event, on_partial=add_paragraphs)
+        add_paragraphs(last_batch, emit=False)
+
+        content = "\n\n".join(paragraphs)
+        TEXT_STORE.put(file_path, content, None, signature)
+        content = content or "[Document is empty]"
+        PREVIEW_CACHE.put(key, content, len(content) * 2)
+        if streamed:
+            return "text_stream", {"path": file_path, "text": "\n\n".join(pending), "first": False}
+        return "text", content
+    except ExtractionCancelled:
+        raise
+    except Exception as e:
+        return "text", f"[Failed to preview document: {e}]"
+
+
+PDF_PREVIEW_PAGES = 5  # Pages extracted per preview chunk
+PDF_PAGE_CACHE_DOCS = 8  # Open PDFs kept with their extracted pages
+
+
+class PdfPageCache:
+    """Page-indexed text of one PDF, extracted lazily and kept for reuse.
+
+    A PDF already in TEXT_STORE is served from there without opening it.
+    Otherwise missing pages are extracted in EXTRACTION_POOL as they are
+    asked for, and the full text is written to the store once every page
+    has been seen.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.signature = file_signature(file_path)
+        self.page_count = None
+        self._pages = {}
+        self._stored = False
+        self._lock = threading.Lock()
+
+        stored = TEXT_STORE.get(file_path, self.signature)
+        if stored is not None and stored[1] is not None:
+            self._pages = dict(enumerate(split_pages(*stored)))
+            self.page_count = len(self._pages)
+            self._stored = True
+
+    def get_pages(self, start, count, cancel_event=None):
+        """Return [(page_index, text), ...] for a range, extracting only pages not seen before."""
+        start = max(start, 0)
+        with self._lock:
+            if self.page_count is None:
+                missing = list(range(start, start + count))
+            else:
+                missing = [index for index in range(start, min(start + count, self.page_count))
+                           if index not in self._pages]
+            if missing:
+                page_count, texts = EXTRACTION_POOL.call(
+                    "pdf_pages", self.file_path, missing[0], missing[-1] + 1 - missing[0],
+                    cancel_event=cancel_event)
+                self.page_count = page_count
+                for offset, text in enumerate(texts):
+                    self._pages.setdefault(missing[0] + offset, text)
+
+            pages = [(index, self._pages[index]) for index in range(start, min(start + count, self.page_count))]
+
+            if not self._stored and len(self._pages) == self.page_count:
+                text, offsets = join_pages([self._pages[index] for index in range(self.page_count)])
+                TEXT_STORE.put(self.file_path, text, offsets, self.signature)
+                self._stored = True
+            return pages
+
+    def close(self):
+        with self._lock:
+            self._pages = {}
+
+
+PDF_DOCUMENTS = OpenDocumentCache(PdfPageCache, PDF_PAGE_CACHE_DOCS)
+
+
+def extract_pdf_preview(file_path, cancel_event=None, start=0, on_partial=None):
+    """Extract one chunk of pages; payload carries the page range so the UI can page on demand."""
+    try:
+        cache = PDF_DOCUMENTS.get(file_path)
+        pages = cache.get_pages(start, PDF_PREVIEW_PAGES, cancel_event)
+        if cache.page_count == 0 or (
+                start == 0 and cache.page_count <= PDF_PREVIEW_PAGES and not any(text.strip() for _, text in pages)):
+            return "text", "[PDF is empty]"
+        return "pdf", {
+            "path": file_path,
+            "start": start,
+            "pages": pages,
+            "page_count": cache.page_count,
+        }
+    except ExtractionCancelled:
+        raise
+    except Exception as e:
+        return "text", f"[Failed to load PDF: {e}]"
+
+
+def format_pdf_pages(pages, page_count):
+    """Join extracted pages with page markers for the preview pane."""
+    return "".join(f"\n— Page {index + 1} of {page_count} —\n\n{text}" for index, text in pages)
+
+
+def extract_image_preview(file_path, cancel_event=None, target_size=None):
+    """Decode an image at the size of the preview pane rather than at full resolution.
+
+    QImageReader.setScaledSize lets the JPEG decoder skip most of the work for
+    large photos. QImage (unlike QPixmap) is safe to build off the UI thread.
+    """
+    try:
+        key = PreviewCache.key(file_path, ("image", target_size))
+        cached = PREVIEW_CACHE.get(key)
+        if cached is not None:
+            return "image", cached
+
+        reader = QImageReader(file_path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if target_size and size.isValid():
+            scaled = size.scaled(QSize(*target_size), Qt.AspectRatioMode.KeepAspectRatio)
+            if scaled.width() < size.width():
+                reader.setScaledSize(scaled)
+
+        check_cancelled(cancel_event)
+        image = reader.read()
+        if image.isNull():
+            raise ValueError(reader.errorString())
+
+        payload = {"path": file_path, "image": image}
+        PREVIEW_CACHE.put(key, payload, image.sizeInBytes())
+        return "image", payload
+
+    except ExtractionCancelled:
+        raise
+    except Exception as e:
+        return "text", f"[Failed to preview image: {e}]"
+
+
+def extract_preview(file_path, cancel_event=None, image_size=None, on_partial=None):
+    """Return (kind, payload) for the preview pane; kind tells show_preview how to render it."""
+    if not os.path.exists(file_path):
+        return "text", "[File does not exist]"
+
+    ext = os.path.splitext(file_path)[1].lower()
+
+    if ext == ".docx":
+        return extract_docx_preview(file_path, cancel_event, on_partial)
+    elif ext == ".txt":
+        return extract_txt_preview(file_path, cancel_event)
+    elif ext == ".pdf":
+        return extract_pdf_preview(file_path, cancel_event)
+    elif ext in PREVIEW_IMAGE_EXTENSIONS:
+        return extract_image_preview(file_path, cancel_event, image_size)
+    else:
+        return "text", f"[Preview not available for file type: {ext}]"
+
+
+class PreviewWorker(QThread):
+    """Runs one preview extraction job off the UI thread.
+
+    job is called with the cancel event and an on_partial(kind, payload)
+    callback for early results, and returns the final (kind, payload).
+    """
+    preview_ready = pyqtSignal(int, str, object)
+    preview_partial = pyqtSignal(int, str, object)
+
+    def __init__(self, job, generation, cancel_event, parent=None):
+        super().__init__(parent)
+        self.job = job
+        self.generation = generation
+        self.cancel_event = cancel_event
+
+    def run(self):
+        job_name = getattr(getattr(self.job, "func", self.job), "__name__", "preview")
+        with PERF.span("preview", job=job_name) as span:
+            try:
+                kind, payload = self.job(self.cancel_event, on_partial=self.report_partial)
+            except ExtractionCancelled:
+                span.set("cancelled", 1)
+                return
+            span.set("kind", kind)
+        if not self.cancel_event.is_set():
+            self.preview_ready.emit(self.generation, kind, payload)
+
+    def report_partial(self, kind, payload):
+        if not self.cancel_event.is_set():
+            self.preview_partial.emit(self.generation, kind, payload)
+
+
+class PreviewController(QObject):
+    """Coalesces preview requests from the Saved Files table into one worker job.
+
+    Requests are debounced so arrow-keying through the table only extracts the
+    row the user stops on. Starting a new job cancels the previous one, and
+    results from superseded jobs are dropped by generation number.
+    """
+    preview_ready = pyqtSignal(str, object)
+    DEBOUNCE_MS = 120
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._pending_path = None
+        self._active_path = None
+        self._cancel_event = None
+        self._workers = set()
+        self.image_size = None
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self._start_pending)
+
+    def request(self, file_path):
+        """Schedule a preview of file_path, replacing any request not yet started."""
+        if file_path == self._active_path:
+            # Already extracting this file; drop anything queued behind it
+            self._debounce_timer.stop()
+            self._pending_path = None
+            return
+        self._pending_path = file_path
+        self._debounce_timer.start()
+
+    def cancel(self):
+        """Drop the pending request and abandon the running job, if any."""
+        self._debounce_timer.stop()
+        self._pending_path = None
+        self._active_path = None
+        self._generation += 1
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+
+    def request_pdf_pages(self, file_path, start):
+        """Fetch another chunk of pages for the PDF currently on screen.
+
+        The job belongs to the current selection, so a new selection cancels it.
+        """
+        job = functools.partial(extract_pdf_preview, file_path, start=start)
+        self._start_worker(job)
+
+    def request_text_window(self, file_path, offset=0, line=None):
+        """Fetch another window of the text file currently on screen."""
+        job = functools.partial(extract_txt_preview, file_path, offset=offset, line=line)
+        self._start_worker(job)
+
+    def request_text_line_index(self, file_path):
+        """Index the lines of the text file on screen in the background."""
+        self._start_worker(functools.partial(build_text_line_index, file_path))
+
+    def _start_pending(self):
+        file_path = self._pending_path
+        self._pending_path = None
+        if file_path is None:
+            return
+
+        # Stale jobs stop at their next checkpoint; their results are ignored anyway
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+
+        self._generation += 1
+        self._cancel_event = threading.Event()
+        self._active_path = file_path
+        self._start_worker(functools.partial(extract_preview, file_path, image_size=self.image_size))
+
+    def _start_worker(self, job):
+        worker = PreviewWorker(job, self._generation, self._cancel_event)
+        worker.preview_ready.connect(self._on_worker_ready)
+        worker.preview_partial.connect(self._on_worker_partial)
+        worker.finished.connect(lambda w=worker: self._on_worker_finished(w))
+        self._workers.add(worker)
+        worker.start()
+
+    def _on_worker_ready(self, generation, kind, payload):
+        if generation != self._generation:
+            return  # Superseded by a newer selection
+        self._active_path = None
+        self.preview_ready.emit(kind, payload)
+
+    def _on_worker_partial(self, generation, kind, payload):
+        if generation == self._generation:
+            self.preview_ready.emit(kind, payload)
+
+    def _on_worker_finished(self, worker):
+        self._workers.discard(worker)
+        if worker.generation == self._generation:
+            self._active_path = None
+        worker.deleteLater()
+
+
+class PrefetchWorker(QThread):
+    """Warms the preview caches for a few files, one at a time, at idle priority."""
+
+    def __init__(self, file_paths, cancel_event, image_size, parent=None):
+        super().__init__(parent)
+        self.file_paths = file_paths
+        self.cancel_event = cancel_event
+        self.image_size = image_size
+
+    def run(self):
+        for file_path in self.file_paths:
+            if self.cancel_event.is_set():
+                return
+            try:
+                if os.path.getsize(file_path) > PreviewPrefetcher.MAX_FILE_BYTES:
+                    continue
+                # Results land in PREVIEW_CACHE and the open document caches
+                extract_preview(file_path, self.cancel_event, image_size=self.image_size)
+            except ExtractionCancelled:
+                return
+            except OSError:
+                continue
+
+
+class PreviewPrefetcher(QObject):
+    """Prefetches previews of the rows around the selection once the UI is idle.
+
+    Each plan is bounded to MAX_FILES files of at most MAX_FILE_BYTES each.
+    Stepping onto a planned row lets the running workers keep going, and the
+    next plan only adds the files they do not already have; jumping anywhere
+    else cancels them.
+    """
+    IDLE_DELAY_MS = 300
+    MAX_FILES = 4
+    MAX_FILE_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._planned = []  # Files of running workers plus _pending
+        self._pending = []  # Files waiting for the idle delay
+        self._cancel_event = None
+        self._workers = set()
+        self.image_size = None
+
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(self.IDLE_DELAY_MS)
+        self._idle_timer.timeout.connect(self._start)
+
+    def schedule(self, file_paths, image_size):
+        """Plan file_paths, started after an idle delay; files a running worker has are left to it."""
+        if image_size != self.image_size:
+            self.cancel()  # Running workers render images for the old size
+        self.image_size = image_size
+        running = [path for worker in self._workers if not worker.cancel_event.is_set() and worker.isRunning()
+                   for path in worker.file_paths]
+        self._pending = [path for path in dict.fromkeys(file_paths) if path not in running][:self.MAX_FILES]
+        self._planned = running + self._pending
+        if self._pending:
+            self._idle_timer.start()
+        else:
+            self._idle_timer.stop()
+
+    def on_selection(self, file_path):
+        """Keep the running plan only if the user moved onto one of its rows."""
+        if file_path not in self._planned:
+            self.cancel()
+
+    def cancel(self):
+        self._idle_timer.stop()
+        self._planned = []
+        self._pending = []
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self._cancel_event = None
+
+    def _start(self):
+        if self._cancel_event is None:
+            self._cancel_event = threading.Event()
+        worker = PrefetchWorker(self._pending, self._cancel_event, self.image_size)
+        self._pending = []
+        worker.finished.connect(lambda w=worker: self._on_worker_finished(w))
+        self._workers.add(worker)
+        worker.start(QThread.Priority.IdlePriority)
+
+    def _on_worker_finished(self, worker):
+        self._workers.discard(worker)
+        worker.deleteLater()
+
+
+class DraggedTextWriter(QThread):
+    """Background writer that turns dropped text into .docx files in a list.
+
+    Drops arriving within COALESCE_MS of each other are written as one batch:
+    all documents are saved, then the catalog gets a single append and the UI
+    a single files_saved signal.
+    """
+    files_saved = pyqtSignal(list)  # [(file_path, section_name), ...]
+    save_failed = pyqtSignal(str)
+    COALESCE_MS = 250
+
+    def __init__(self, organizer, parent=None):
+        super().__init__(parent)
+        self.organizer = organizer
+        self._queue = queue.Queue()
+
+    def enqueue(self, text, file_path, section_name):
+        self._queue.put((text, file_path, section_name))
+        if not self.isRunning():
+            self.start()
+
+    def stop(self):
+        """Flush queued drops and end the thread."""
+        if self.isRunning():
+            self._queue.put(None)
+            self.wait()
+
+    def run(self):
+        from docx import Document
+
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch = [job]
+            stopping = False
+            while True:
+                try:
+                    job = self._queue.get(timeout=self.COALESCE_MS / 1000)
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+
+            saved = []
+            used_paths = set()
+            for text, file_path, section_name in batch:
+                # Quick repeated drops can produce the same name within a minute
+                name, ext = os.path.splitext(file_path)
+                counter = 2
+                while file_path in used_paths or os.path.exists(file_path):
+                    file_path = f"{name}_{counter}{ext}"
+                    counter += 1
+                used_paths.add(file_path)
+
+                try:
+                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                    doc = Document()
+                    doc.add_paragraph(text)
+                    doc.save(file_path)
+                    saved.append((file_path, section_name))
+                except Exception as e:
+                    self.save_failed.emit(f"Saving dragged text failed: {e}")
+
+            if saved:
+                try:
+                    with PERF.span("catalog_write", source="dragged_text", lines=len(saved)):
+                        self.organizer.record(saved)
+                except Exception as e:
+                    self.save_failed.emit(f"Recording dragged text failed: {e}")
+                    saved = []
+            if saved:
+                self.files_saved.emit(saved)
+            if stopping:
+                return
+
+
+class BulkImportThread(QThread):
+    """Copies dropped files and whole folders into a directory in parallel.
+
+    Destination names are planned up front (collisions get a timestamp
+    suffix, as single-file drops always have), folders are recreated, and the
+    copies run on a bounded thread pool. Files landing directly in the target
+    directory are reported in batches so the view can grow as they arrive.
+    """
+    files_imported = pyqtSignal(list)  # New top-level files in the target directory
+    progress = pyqtSignal(int, int)  # (files done, files planned)
+    import_finished = pyqtSignal(int, list)  # (files copied, [(source, error), ...])
+    MAX_WORKERS = min(8, (os.cpu_count() or 2) * 2)
+    MAX_IN_FLIGHT = 64
+    REPORT_INTERVAL = 0.1
+
+    def __init__(self, sources, target_directory, parent=None):
+        super().__init__(parent)
+        self.sources = sources
+        self.target_directory = target_directory
+        self.created_folders = False
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _unique_name(self, directory, name, planned, is_dir):
+        candidate = os.path.join(directory, name)
+        if candidate not in planned and not os.path.exists(candidate):
+            return candidate
+        base, ext = (name, "") if is_dir else os.path.splitext(name)
+        stamp = int(time.time())
+        candidate = os.path.join(directory, f"{base}_{stamp}{ext}")
+        counter = 2
+        while candidate in planned or os.path.exists(candidate):
+            candidate = os.path.join(directory, f"{base}_{stamp}_{counter}{ext}")
+            counter += 1
+        return candidate
+
+    @staticmethod
+    def _copy_file(source, destination):
+        shutil.copy2(source, destination)
+        return os.path.getsize(destination)
+
+    def plan(self):
+        """Return (folders to create, [(source, destination), ...])."""
+        planned = set()
+        folders = []
+        copies = []
+        for source in self.sources:
+            name = os.path.basename(os.path.normpath(source))
+            if os.path.isfile(source):
+                destination = self._unique_name(self.target_directory, name, planned, False)
+                planned.add(destination)
+                copies.append((source, destination))
+            elif os.path.isdir(source):
+                root_destination = self._unique_name(self.target_directory, name, planned, True)
+                planned.add(root_destination)
+                for root, _, files in os.walk(source):
+                    if self._stop_event.is_set():
+                        break
+                    destination_root = os.path.normpath(os.path.join(root_destination, os.path.relpath(root, source)))
+                    folders.append(destination_root)
+                    copies.extend((os.path.join(root, file_name), os.path.join(destination_root, file_name))
+                                  for file_name in files)
+        return folders, copies
+
+    def run(self):
+        with PERF.span("bulk_import", sources=len(self.sources)) as span:
+            self._run(span)
+
+    def _run(self, span):
+        with PERF.span("bulk_import_plan") as plan_span:
+            folders, copies = self.plan()
+            plan_span.set("files", len(copies))
+            plan_span.set("folders", len(folders))
+        failures = []
+        for folder in folders:
+            try:
+                os.makedirs(folder, exist_ok=True)
+                self.created_folders = True
+            except OSError as e:
+                failures.append((folder, str(e)))
+
+        target = os.path.normcase(os.path.abspath(self.target_directory))
+        done = 0
+        copied = 0
+        ready = []
+        last_report = time.monotonic()
+        in_flight = set()
+
+        def collect(finished):
+            nonlocal done, copied
+            for future in finished:
+                source, destination = future.job
+                done += 1
+                try:
+                    span.add("bytes", future.result())
+                    copied += 1
+                    if os.path.normcase(os.path.dirname(os.path.abspath(destination))) == target:
+                        ready.append(destination)
+                except Exception as e:
+                    failures.append((source, str(e)))
+
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as pool:
+            for job in copies:
+                if self._stop_event.is_set():
+                    break
+                if len(in_flight) >= self.MAX_IN_FLIGHT:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                future = pool.submit(self._copy_file, *job)
+                future.job = job
+                in_flight.add(future)
+
+                if time.monotonic() - last_report >= self.REPORT_INTERVAL:
+                    if ready:
+                        self.files_imported.emit(ready)
+                        ready = []
+                    self.progress.emit(done, len(copies))
+                    last_report = time.monotonic()
+
+            finished, _ = wait(in_flight)
+            collect(finished)
+
+        if ready:
+            self.files_imported.emit(ready)
+        span.set("files", copied)
+        span.set("failures", len(failures))
+        self.progress.emit(done, len(copies))
+        self.import_finished.emit(copied, failures)
+
+
+class ListMoveThread(QThread):
+    """Moves dropped files into a list folder in the background.
+
+    Moves within one filesystem are renames; others stream a copy and then
+    delete the source. Catalog entries are appended in batches as files land,
+    so the table fills in while a large batch is still moving. Entries in
+    other lists that pointed at a moved file are re-pointed at the end.
+    """
+    files_moved = pyqtSignal(list)  # [(new path, section_name), ...] just recorded
+    progress = pyqtSignal(int, int)  # (files done, files planned)
+    move_finished = pyqtSignal(int, list)  # (files moved, [(source, error), ...])
+    MAX_WORKERS = 4  # Cross-device moves are disk-bound; renames are instant either way
+    REPORT_INTERVAL = 0.25
+
+    def __init__(self, organizer, sources, section_name, section_folder, parent=None):
+        super().__init__(parent)
+        self.organizer = organizer
+        self.sources = sources
+        self.section_name = section_name  # The list's id
+        self.section_folder = section_folder
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Finish the moves in progress and record them; the rest stay where they are."""
+        self._stop_event.set()
+
+    def plan(self):
+        """Return ([(source, destination), ...], [(source, reason skipped), ...])."""
+        saved_names = {os.path.basename(path) for path, _ in self.organizer.entries([self.section_name])}
+        list_name = self.organizer.list_names().get(self.section_name, self.section_name)
+        planned = set()
+        jobs = []
+        skipped = []
+        stamp = int(time.time())
+        for source in self.sources:
+            base_name = os.path.basename(source)
+            if not os.path.isfile(source):
+                skipped.append((source, "Not a regular file"))
+            elif base_name in saved_names:
+                skipped.append((source, f"Already in list '{list_name}'"))
+            else:
+                saved_names.add(base_name)
+                destination = organizer_core.unique_list_path(self.section_folder, base_name, planned, stamp)
+                planned.add(destination)
+                jobs.append((source, destination))
+        return jobs, skipped
+
+    def _move(self, job):
+        if self._stop_event.is_set():
+            return None, "Cancelled"
         try:
-            with os.scandir(self.path) as entries:
-                for entry in entries:
-                    if entry.is_file():
-                        files.append(entry.path)
-                        if len(files) >= 700:  # Only load first 500 paths
-                            break
+            return organizer_core.move_file(*job), None
         except Exception as e:
-            print(f"[ERROR] Failed to load files in background: {e}")
-        self.files_loaded.emit(files)
+            return None, str(e)
+
+    def run(self):
+        with PERF.span("list_move", sources=len(self.sources)) as span:
+            self._run(span)
+
+    def _run(self, span):
+        jobs, failures = self.plan()
+        moved = []
+        batch = []
+        last_report = time.monotonic()
+
+        def flush():
+            entries = [(destination, self.section_name) for _, destination in batch]
+            try:
+                self.organizer.record(entries)
+                self.files_moved.emit(entries)
+            except Exception as e:
+                failures.extend((destination, f"Moved but not recorded: {e}") for destination, _ in entries)
+            batch.clear()
+
+        try:
+            os.makedirs(self.section_folder, exist_ok=True)
+        except OSError as e:
+            jobs, failures = [], failures + [(source, str(e)) for source, _ in jobs]
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as pool:
+            for done, (job, (copied_bytes, error)) in enumerate(zip(jobs, pool.map(self._move, jobs)), 1):
+                if error:
+                    failures.append((job[0], error))
+                else:
+                    span.add("bytes", copied_bytes)
+                    moved.append(job)
+                    batch.append(job)
+                if time.monotonic() - last_report >= self.REPORT_INTERVAL:
+                    if batch:
+                        flush()
+                    self.progress.emit(done, len(jobs))
+                    last_report = time.monotonic()
+        if batch:
+            flush()
+
+        if moved:
+            try:
+                self.organizer.relocate(moved)
+            except Exception as e:
+                print(f"[ERROR] Could not update entries of moved files: {e}")
+        span.set("files", len(moved))
+        span.set("failures", len(failures))
+        self.progress.emit(len(jobs), len(jobs))
+        self.move_finished.emit(len(moved), failures)
+
+
+class ListSaveThread(QThread):
+    """Copies (or links) files into a list in the background, as one save_to_list batch and one catalog write."""
+    progress = pyqtSignal(int, int)  # (files placed, files planned)
+    save_finished = pyqtSignal(int, int, list)  # (files saved, files already in the list, [(source, error), ...])
+
+    def __init__(self, organizer, sources, section_name, parent=None):
+        super().__init__(parent)
+        self.organizer = organizer
+        self.sources = sources
+        self.section_name = section_name  # The list's id
+
+    def run(self):
+        with PERF.span("save_to_list", files=len(self.sources)) as span:
+            try:
+                copied, failures = self.organizer.save_to_list(self.sources, self.section_name,
+                                                               progress=self.progress.emit)
+            except Exception as e:
+                copied, failures = [], [(source, str(e)) for source in self.sources]
+            span.set("copied", len(copied))
+        self.save_finished.emit(len(copied), len(self.sources) - len(copied) - len(failures), failures)
+
+
+class ListRemovalThread(QThread):
+    """Removes a list in the background: it leaves the catalog at once, then its folder is deleted."""
+    progress = pyqtSignal(int, int)  # (files deleted, files in the folder)
+    removal_finished = pyqtSignal(int, int, list)  # (entries removed, files deleted, [(path, error), ...])
+
+    def __init__(self, organizer, list_id, parent=None):
+        super().__init__(parent)
+        self.organizer = organizer
+        self.list_id = list_id
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Stop deleting files; the rest is left for 'organizer_cli.py verify --fix'."""
+        self._stop_event.set()
+
+    def run(self):
+        with PERF.span("list_remove") as span:
+            try:
+                removed, deleted, failures = self.organizer.remove_list(
+                    self.list_id, progress=self.progress.emit, stop_event=self._stop_event)
+            except Exception as e:
+                removed, deleted, failures = 0, 0, [(self.list_id, str(e))]
+            span.set("entries", removed)
+            span.set("files", deleted)
+        self.removal_finished.emit(removed, deleted, failures)
+
+
+SESSION_SNAPSHOT_MAGIC = b"FOSNAP"
+SESSION_SNAPSHOT_VERSION = 1
+
+
+class CatalogQueryThread(QThread):
+    """Runs a structured query on the catalog index off the UI thread.
+
+    The index is only re-synced when the catalog changed, or with refresh.
+    """
+    query_finished = pyqtSignal(str, list)  # (query, [(path, size, mtime, ctime, atime, missing), ...])
+    query_failed = pyqtSignal(str, str)  # (query, error)
+
+    def __init__(self, organizer, query, refresh=False, parent=None):
+        super().__init__(parent)
+        self.organizer = organizer
+        self.query = query
+        self.refresh = refresh
+
+    def run(self):
+        with PERF.span("catalog_query", refresh=int(self.refresh)) as span:
+            try:
+                rows = self.organizer.find(self.query, refresh=self.refresh)
+            except Exception as e:
+                self.query_failed.emit(self.query, str(e))
+                return
+            span.set("rows", len(rows))
+        self.query_finished.emit(self.query, rows)
+
+
+class RenamePreviewThread(QThread):
+    """Plans a batch rename off the UI thread; date tokens stat() every file."""
+    preview_ready = pyqtSignal(int, list, str)  # (generation, [(old, new, problem), ...], pattern error)
+
+    def __init__(self, generation, paths, options, lists, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.paths = paths
+        self.options = options
+        self.lists = lists
+
+    def run(self):
+        with PERF.span("rename_preview", files=len(self.paths)):
+            try:
+                planned, error = batch_rename.plan(self.paths, lists=self.lists, **self.options), ""
+            except batch_rename.RenamePatternError as e:
+                planned, error = [], str(e)
+        self.preview_ready.emit(self.generation, planned, error)
+
+
+class BatchRenameThread(QThread):
+    """Renames files on disk, then commits the catalog, notes and tags once for the whole batch."""
+    rename_finished = pyqtSignal(list, list)  # ([(old, new), ...], [(old, error), ...])
+
+    def __init__(self, organizer, renames, parent=None):
+        super().__init__(parent)
+        self.organizer = organizer
+        self.renames = renames
+
+    def run(self):
+        with PERF.span("catalog_write", source="batch_rename", files=len(self.renames)) as span:
+            try:
+                done, failures = self.organizer.rename([(old, new, None) for old, new in self.renames])
+            except Exception as e:
+                done, failures = [], [(old, str(e)) for old, _ in self.renames]
+            span.set("renamed", len(done))
+        self.rename_finished.emit(done, failures)
+
+
+class BatchRenameDialog(QDialog):
+    """Pattern, find/replace and numbering for renaming many files, previewed as you type."""
+    PREVIEW_DELAY_MS = 150
+    PREVIEW_ROWS = 2000  # Rows shown; the counts above the table cover every file
+
+    def __init__(self, paths, lists, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Batch Rename ({len(paths):,} files)")
+        self.resize(900, 550)
+        self.paths = paths
+        self.lists = lists
+        self.planned = []
+        self.generation = 0
+        self.preview_threads = set()  # Every preview still planning; done() waits for them
+
+        form = QFormLayout()
+        self.pattern_box = QLineEdit("{name}{ext}")
+        self.pattern_box.setToolTip(batch_rename.__doc__)
+        form.addRow("New name:", self.pattern_box)
+        self.find_box = QLineEdit()
+        form.addRow("Find:", self.find_box)
+        self.replace_box = QLineEdit()
+        form.addRow("Replace with:", self.replace_box)
+        self.regex_check = QCheckBox("Regular expression (\\1 for groups)")
+        form.addRow("", self.regex_check)
+        numbering = QHBoxLayout()
+        self.start_spin = QSpinBox()
+        self.start_spin.setRange(0, 1_000_000)
+        self.start_spin.setValue(1)
+        self.step_spin = QSpinBox()
+        self.step_spin.setRange(1, 1000)
+        numbering.addWidget(QLabel("Start at"))
+        numbering.addWidget(self.start_spin)
+        numbering.addWidget(QLabel("Step"))
+        numbering.addWidget(self.step_spin)
+        numbering.addStretch()
+        form.addRow("{n}:", numbering)
+
+        self.status_label = QLabel()
+        self.preview_table = QTableWidget()
+        self.preview_table.setColumnCount(3)
+        self.preview_table.setHorizontalHeaderLabels(["Old Name", "New Name", "Status"])
+        self.preview_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.preview_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.rename_button = buttons.button(QDialogButtonBox.StandardButton.Ok)
+        self.rename_button.setText("Rename")
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addLayout(form)
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.preview_table)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+        # Each edit restarts the timer, so a preview is planned once typing pauses
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(self.PREVIEW_DELAY_MS)
+        self.preview_timer.timeout.connect(self.start_preview)
+        for box in (self.pattern_box, self.find_box, self.replace_box):
+            box.textChanged.connect(lambda *_: self.preview_timer.start())
+        self.regex_check.toggled.connect(lambda *_: self.preview_timer.start())
+        for spin in (self.start_spin, self.step_spin):
+            spin.valueChanged.connect(lambda *_: self.preview_timer.start())
+        self.start_preview()
+
+    def options(self):
+        return {"pattern": self.pattern_box.text(), "find": self.find_box.text(), "replace": self.replace_box.text(),
+                "regex": self.regex_check.isChecked(), "start": self.start_spin.value(), "step": self.step_spin.value()}
+
+    def start_preview(self):
+        self.generation += 1
+        self.rename_button.setEnabled(False)
+        self.status_label.setText("Updating preview...")
+        preview_thread = RenamePreviewThread(self.generation, self.paths, self.options(), self.lists, self)
+        preview_thread.preview_ready.connect(self.show_preview)
+        preview_thread.finished.connect(lambda: self.preview_threads.discard(preview_thread))
+        self.preview_threads.add(preview_thread)
+        preview_thread.start()
+
+    def show_preview(self, generation, planned, error):
+        if generation != self.generation:
+            return  # A newer edit is already being planned
+        self.planned = planned
+        if error:
+            self.preview_table.setRowCount(0)
+            self.status_label.setText(f"⚠️ {error}")
+            return
+        shown = planned[:self.PREVIEW_ROWS]
+        self.preview_table.setUpdatesEnabled(False)
+        self.preview_table.setRowCount(len(shown))
+        for row, (old_path, new_path, problem) in enumerate(shown):
+            self.preview_table.setItem(row, 0, QTableWidgetItem(os.path.basename(old_path)))
+            self.preview_table.setItem(row, 1, QTableWidgetItem(os.path.basename(new_path)))
+            self.preview_table.setItem(row, 2, QTableWidgetItem(problem or "OK"))
+        self.preview_table.setUpdatesEnabled(True)
+
+        ready = len(self.renames())
+        unchanged = sum(1 for _, _, problem in planned if problem == batch_rename.UNCHANGED)
+        text = f"{ready:,} to rename, {unchanged:,} unchanged, {len(planned) - ready - unchanged:,} blocked"
+        if len(planned) > len(shown):
+            text += f" (showing the first {len(shown):,})"
+        self.status_label.setText(text)
+        self.rename_button.setEnabled(ready > 0)
+
+    def renames(self):
+        """(old path, new path) of every file the current preview can rename."""
+        return [(old_path, new_path) for old_path, new_path, problem in self.planned if problem is None]
+
+    def done(self, result):
+        self.preview_timer.stop()
+        for preview_thread in list(self.preview_threads):
+            preview_thread.wait()  # They are children of this dialog and go with it
+        super().done(result)
+
+
+class SortableItem(QTableWidgetItem):
+    """Table cell that shows formatted text but sorts by a raw value (timestamp, byte count)."""
+
+    def __init__(self, text, sort_key):
+        super().__init__(text)
+        self.sort_key = float("-inf") if sort_key is None else sort_key
+
+    def __lt__(self, other):
+        if isinstance(other, SortableItem):
+            return self.sort_key < other.sort_key
+        return super().__lt__(other)
+
+
+def date_item(timestamp):
+    text = time.strftime('%m-%d-%Y %H:%M:%S', time.localtime(timestamp)) if timestamp is not None else ""
+    return SortableItem(text, timestamp)
+
+
+def format_size(size):
+    if size < 1024 * 1024:
+        return f"{round(size / 1024, 2)} KB"
+    return f"{round(size / (1024 * 1024), 2)} MB"
+
+
+def size_item(size):
+    return SortableItem(format_size(size) if size is not None else "", size)
+
+
+def stat_times(path):
+    """(mtime, ctime, atime) of a path, or None if it cannot be read."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime, st.st_ctime, st.st_atime)
+
+
+def catalog_signature(paths):
+    """(size, mtime_ns) of each catalog file, so an edited catalog invalidates a snapshot."""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append([st.st_size, st.st_mtime_ns])
+        except OSError:
+            signature.append(None)
+    return signature
+
+
+def write_session_snapshot(snapshot_path, snapshot):
+    """Write the session snapshot as a version-tagged, zlib-compressed blob."""
+    payload = zlib.compress(json.dumps(snapshot, separators=(",", ":")).encode("utf-8"), 6)
+    temp_path = snapshot_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(SESSION_SNAPSHOT_MAGIC + bytes([SESSION_SNAPSHOT_VERSION]) + payload)
+    os.replace(temp_path, snapshot_path)
+
+
+def read_session_snapshot(snapshot_path):
+    """Load the last session snapshot; None if it is missing, foreign or corrupt."""
+    try:
+        with open(snapshot_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    header_length = len(SESSION_SNAPSHOT_MAGIC) + 1
+    if data[:len(SESSION_SNAPSHOT_MAGIC)] != SESSION_SNAPSHOT_MAGIC or data[header_length - 1:header_length] != bytes([SESSION_SNAPSHOT_VERSION]):
+        return None
+    try:
+        return json.loads(zlib.decompress(data[header_length:]).decode("utf-8"))
+    except (zlib.error, ValueError) as e:
+        print(f"[ERROR] Ignoring unreadable session snapshot: {e}")
+        return None
+
+
+class SnapshotRevalidator(QThread):
+    """Checks a restored snapshot against the disk without blocking the UI.
+
+    The listing is stale if the directory's mtime moved or any listed file's
+    times changed; saved-file rows whose times changed are reported so only
+    their cells are refreshed.
+    """
+    directory_stale = pyqtSignal(str)
+    row_stats_changed = pyqtSignal(dict)
+
+    def __init__(self, snapshot, parent=None):
+        super().__init__(parent)
+        self.snapshot = snapshot
+
+    def run(self):
+        directory = self.snapshot.get("directory")
+        if directory:
+            try:
+                stale = os.stat(directory).st_mtime_ns != self.snapshot.get("directory_mtime_ns")
+            except OSError:
+                stale = True
+            if not stale:
+                for path, times in self.snapshot.get("listing", []):
+                    if stat_times(path) != (tuple(times) if times else None):
+                        stale = True
+                        break
+            if stale:
+                self.directory_stale.emit(directory)
+
+        changed = {}
+        for path, section, times, *_ in self.snapshot.get("table") or []:
+            current = stat_times(path)
+            if current != (tuple(times) if times else None):
+                changed[path] = current
+        if changed:
+            self.row_stats_changed.emit(changed)
+
+
+class PerfPanel(QWidget):
+    """Per-span totals and the latest spans from PERF, refreshed while visible."""
+    REFRESH_MS = 1000
+    RECENT_ROWS = 50
+
+    def __init__(self, recorder, watchdog=None, parent=None):
+        super().__init__(parent)
+        self.recorder = recorder
+        self.watchdog = watchdog
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        header = QHBoxLayout()
+        header.addWidget(QLabel("Performance (Ctrl+Shift+P to hide)"))
+        self.latency_label = QLabel()
+        header.addWidget(self.latency_label)
+        header.addStretch()
+        if watchdog is not None:
+            export_button = QPushButton("Export Stalls...")
+            export_button.clicked.connect(self.export_stalls)
+            header.addWidget(export_button)
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        header.addWidget(reset_button)
+        layout.addLayout(header)
+
+        self.totals_table = QTableWidget()
+        self.totals_table.setColumnCount(7)
+        self.totals_table.setHorizontalHeaderLabels(["Span", "Count", "Total ms", "Avg ms", "Max ms", "Last ms", "Counters"])
+        self.totals_table.horizontalHeader().setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)
+        self.totals_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+
+        self.recent_list = QListWidget()
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        splitter.addWidget(self.totals_table)
+        splitter.addWidget(self.recent_list)
+        splitter.setSizes([900, 500])
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def reset(self):
+        self.recorder.reset()
+        self.refresh()
+
+    def export_stalls(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export UI Stalls", "ui_stalls.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.watchdog.export(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Export Failed", f"Could not export stalls:\n{e}")
+
+    def refresh(self):
+        if self.watchdog is not None:
+            stats = self.watchdog.summary()
+            worst = max(stats["slots"].items(), key=lambda item: item[1]["max_ms"], default=None)
+            text = f"  |  UI stalls: {len(stats['stalls'])}, max latency {stats['max_latency_ms']:.0f} ms"
+            if worst:
+                text += f", worst slot {worst[0]} ({worst[1]['max_ms']:.0f} ms)"
+            self.latency_label.setText(text)
+        totals, recent = self.recorder.summary()
+        self.totals_table.setSortingEnabled(False)
+        self.totals_table.setRowCount(len(totals))
+        for row, (name, total) in enumerate(sorted(totals.items(), key=lambda item: -item[1]["total_ms"])):
+            counters = ", ".join(f"{key}={value:g}" for key, value in sorted(total["counters"].items()))
+            values = [name, str(total["count"]), f"{total['total_ms']:.1f}", f"{total['total_ms'] / total['count']:.2f}",
+                      f"{total['max_ms']:.1f}", f"{total['last_ms']:.1f}", counters]
+            for column, value in enumerate(values):
+                self.totals_table.setItem(row, column, QTableWidgetItem(value))
+
+        self.recent_list.clear()
+        for entry in reversed(recent[-self.RECENT_ROWS:]):
+            counters = " ".join(f"{key}={value}" for key, value in entry.get("counters", {}).items())
+            stamp = time.strftime("%H:%M:%S", time.localtime(entry["ts"]))
+            self.recent_list.addItem(f"{stamp}  {entry['span']}  {entry['ms']:.1f} ms  {counters}")
+
+
+class CatalogEvents(QObject):
+    """Relays catalog change events from organizer_daemon.py to the UI thread.
+
+    Bursts of events (including the echo of this window's own changes) are
+    coalesced into one changed signal.
+    """
+    changed = pyqtSignal(list)  # Names of the changed files: "catalog", "notes", "sections"
+    disconnected = pyqtSignal()
+    _received = pyqtSignal(dict)
+    COALESCE_MS = 200
+
+    def __init__(self, client, parent=None):
+        super().__init__(parent)
+        self._pending = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.COALESCE_MS)
+        self._timer.timeout.connect(self._flush)
+        self._received.connect(self._on_received)  # Queued: emitted from the client's listener thread
+        client.subscribe(self._received.emit)
+
+    def _on_received(self, event):
+        if event.get("event") == "disconnected":
+            self.disconnected.emit()
+        elif event.get("event") == "changed":
+            self._pending.update(event.get("files", []))
+            self._timer.start()
+
+    def _flush(self):
+        files, self._pending = sorted(self._pending), set()
+        self.changed.emit(files)
 
 
 class BreadcrumbLabel(QTextBrowser):
@@ -68,15 +1530,30 @@ class BreadcrumbLabel(QTextBrowser):
 
 
 class FileExplorerApp(QWidget):
+    DEBUG_CLIPBOARD = bool(os.environ.get("FILEORGANIZER_DEBUG_CLIPBOARD"))
+    STALL_THRESHOLD_MS = int(os.environ.get("FILEORGANIZER_STALL_MS", "250"))
     BOOKMARKS_FILE = "bookmarks.txt"
+    EXTRACTED_TEXT_FILE = "extracted_text.db"
+    PERF_LOG_FILE = "perf.log"
+    SESSION_SNAPSHOT_FILE = "session_snapshot.bin"
     NOTES_FILE = "notes.txt"
     SAVED_FILES_FILE = "saved_files_all.txt"
+    TAGS_FILE = "tags.txt"
+    QUERY_SORT_COLUMNS = {"path": 0, "name": 0, "mtime": 2, "ctime": 3, "atime": 4, "size": 8}  # Index column -> table column
     if getattr(sys, 'frozen', False):
         BASE_DIR = os.path.dirname(sys.executable)
     else:
         BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
     LISTS_DIR = os.path.join(BASE_DIR, "lists")
+    STORAGE_MODE_LABELS = [
+        ("Store: copies", "copy"),
+        ("Store: zero-copy (auto)", organizer_core.AUTO_MODE),
+        ("Store: reflinks", "reflink"),
+        ("Store: hardlinks", "hardlink"),
+        ("Store: symlinks", "symlink"),
+        ("Store: references", "reference"),
+    ]
 
 
 
@@ -87,6 +1564,17 @@ class FileExplorerApp(QWidget):
         
         self.selected_files = []
         self.notes = {}
+        self.import_threads = set()
+        # With organizer_daemon.py running, list jobs go through it and its change events refresh the views
+        self.organizer = organizer_daemon.connect(".", lists_dir=self.LISTS_DIR)
+        self.catalog_events = None
+        if self.organizer is not None:
+            self.catalog_events = CatalogEvents(self.organizer.client, self)
+            self.catalog_events.changed.connect(self.on_catalog_changed)
+            self.catalog_events.disconnected.connect(self.on_daemon_disconnected)
+        else:
+            self.organizer = organizer_core.Organizer(
+                catalog_file=self.SAVED_FILES_FILE, notes_file=self.NOTES_FILE, lists_dir=self.LISTS_DIR)
 
 
         # Create tab widget
@@ -116,42 +1604,344 @@ class FileExplorerApp(QWidget):
         # Set default heights (e.g., 150 px for bookmarks, 300 px for tree, 400 px for file grid)
         self.splitter.setSizes([150, 125, 400])
 
-        # Second tab: Saved Files
+        # Heartbeat for the stall watchdog; both start with the first paint
+        self.watchdog = EventLoopWatchdog(threshold_ms=self.STALL_THRESHOLD_MS, recorder=PERF)
+        self.heartbeat_timer = QTimer(self)
+        self.heartbeat_timer.setInterval(int(self.watchdog.interval * 1000))
+        self.heartbeat_timer.timeout.connect(self.watchdog.beat)
+
+        # Performance panel under the tabs, toggled with Ctrl+Shift+P
+        self.perf_panel = PerfPanel(PERF, self.watchdog)
+        self.perf_panel.setVisible(False)
+        self.perf_panel.setMaximumHeight(260)
+        self.layout.addWidget(self.perf_panel)
+        self.perf_shortcut = QShortcut(QKeySequence("Ctrl+Shift+P"), self)
+        self.perf_shortcut.activated.connect(self.toggle_perf_panel)
+
+        # Second tab: Saved Files (widgets are built the first time it is shown)
         self.tab2 = QWidget()
-        self.setup_saved_files_tab()
+        self.saved_tab_built = False
         self.tabs.addTab(self.tab2, "Saved Files")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+
+        # Icons come straight from the provider; a QFileSystemModel rooted at ""
+        # would start watching the whole filesystem before the window appears
+        self.icon_provider = QFileIconProvider()
+
+        # Reopen the last session's folder if a snapshot of it survived, else Documents
+        self.file_stats = {}  # path -> (mtime, ctime, atime) restored from the snapshot
+        self.saved_row_stats = {}
+        self.snapshot_revalidator = None
+        self.catalog_query_thread = None
+        self.lists_by_id = {}  # List id -> (name, folder), from sections.txt
+        self.catalog_query_results = None  # same_path -> index row while a structured query filters the table
+        self.snapshot = read_session_snapshot(self.session_snapshot_path())
+        if self.snapshot and os.path.isdir(self.snapshot.get("directory") or ""):
+            self.current_directory = self.snapshot["directory"]
+        else:
+            self.snapshot = None
+            self.current_directory = self.startup_directory()
+        self.all_files = []
+        self.update_breadcrumb(self.current_directory)
 
-        # QFileSystemModel for file icons
-        self.file_model = QFileSystemModel()
-        self.file_model.setRootPath("")
+        # Everything else loads after the first paint, most visible first
+        self.catalog_loaded = False
+        self.startup_started = False
+        self.first_paint_reported = False
+        if self.snapshot:
+            self.startup_steps = [
+                self.restore_snapshot_directory,
+                self.load_startup_tree,
+                self.load_startup_catalog,
+                self.restore_snapshot_tab,
+                self.start_snapshot_revalidation,
+            ]
+        else:
+            self.startup_steps = [
+                self.load_startup_directory,
+                self.load_startup_tree,
+                self.load_startup_catalog,
+            ]
+        QTimer.singleShot(500, self.begin_deferred_startup)  # In case no paint event arrives
+
+
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_reported:
+            self.first_paint_reported = True
+            elapsed_ms = (time.perf_counter() - APP_START_TIME) * 1000
+            PERF.record("startup_first_paint", elapsed_ms)
+            print(f"[PERF] Time to first paint: {elapsed_ms:.0f} ms")
+            self.heartbeat_timer.start()
+            self.watchdog.start()
+            QTimer.singleShot(0, self.begin_deferred_startup)
+
+    def begin_deferred_startup(self):
+        if self.startup_started:
+            return
+        self.startup_started = True
+        self.run_next_startup_step()
+
+    def run_next_startup_step(self):
+        """Run one deferred startup step, then yield to the event loop before the next."""
+        if not self.startup_steps:
+            elapsed_ms = (time.perf_counter() - APP_START_TIME) * 1000
+            PERF.record("startup_finished", elapsed_ms)
+            print(f"[PERF] Startup finished: {elapsed_ms:.0f} ms")
+            return
+        step = self.startup_steps.pop(0)
+        try:
+            with PERF.span("startup_step", step=step.__name__):
+                step()
+        except Exception as e:
+            print(f"[ERROR] Startup step {step.__name__} failed: {e}")
+        QTimer.singleShot(0, self.run_next_startup_step)
 
-        # Current directory and file storage
-        self.current_directory = None
+    @staticmethod
+    def startup_directory():
+        return str(Path.home() / "Documents")
 
+    def load_startup_directory(self):
+        # The folder opened at startup lists everything in it, folders included
+        self.load_thread = FileLoaderThread(self.current_directory, all_entries=True)
+        self.load_thread.files_loaded.connect(self.on_files_loaded)
+        self.load_thread.start()
 
-        # Set default directory to user's Documents
-        self.current_directory = str(Path.home() / "Documents")
+    def load_startup_tree(self):
+        if self.snapshot:
+            self.populate_tree(self.snapshot.get("tree_root") or self.current_directory)
+            self.restore_tree_expansion(self.snapshot.get("expanded", []))
+        else:
+            self.populate_tree(self.current_directory)
 
-        # Load that directory into the UI
-        self.update_breadcrumb(self.current_directory)
-        self.populate_tree(self.current_directory)
+    def load_startup_catalog(self):
+        if self.catalog_loaded:
+            return
+        self.catalog_loaded = True
+        self.load_notes()
+        self.load_sections(load_notes=False)  # don't reload notes again here
+        if self.snapshot and self.snapshot.get("explorer_section"):
+            self.section_combo_file_explorer.setCurrentText(self.snapshot["explorer_section"])
 
-        # Safely list files
-        try:
-            self.all_files = [os.path.join(self.current_directory, f) for f in os.listdir(self.current_directory)]
-        except Exception as e:
-            print(f"[ERROR] Could not list files in default directory: {e}")
+    def session_snapshot_path(self):
+        return os.path.join(self.BASE_DIR, self.SESSION_SNAPSHOT_FILE)
+
+    def catalog_files(self):
+        return [self.SAVED_FILES_FILE, self.NOTES_FILE, "sections.txt", self.TAGS_FILE]
+
+    def restore_snapshot_directory(self):
+        """Show the snapshot's listing as-is; revalidation reloads it if the folder changed."""
+        listing = self.snapshot.get("listing", [])
+        self.file_stats = {path: tuple(times) for path, times in listing if times}
+        self.all_files = [path for path, _ in listing]
+        self.all_files_full = list(self.all_files)
         self.display_files()
-        #self.all_files = []
 
-        #self.load_bookmarks()
-        self.load_notes()  # ✅ load notes early
-        self.load_sections(load_notes=False)  # don't reload notes again here
-        self.update_files_table()  # now safe
+    def restore_snapshot_tab(self):
+        if self.snapshot.get("tab") == self.tabs.indexOf(self.tab2):
+            self.tabs.setCurrentWidget(self.tab2)
+
+    def start_snapshot_revalidation(self):
+        self.snapshot_revalidator = SnapshotRevalidator(self.snapshot, self)
+        self.snapshot_revalidator.directory_stale.connect(self.on_snapshot_directory_stale)
+        self.snapshot_revalidator.row_stats_changed.connect(self.on_snapshot_row_stats_changed)
+        self.snapshot_revalidator.start()
+
+    def on_snapshot_directory_stale(self, directory):
+        if os.path.normpath(directory) != os.path.normpath(self.current_directory or ""):
+            return  # The user has already moved on
+        all_entries = os.path.normpath(directory) == os.path.normpath(self.startup_directory())
+        self.load_thread = FileLoaderThread(directory, all_entries=all_entries)
+        self.load_thread.files_loaded.connect(self.on_files_loaded)
+        self.load_thread.start()
 
+    def on_snapshot_row_stats_changed(self, changed):
+        """Refresh timestamps of saved files that changed since the snapshot was taken."""
+        for row in self.snapshot.get("table") or []:
+            if row[0] in changed:
+                row[2] = changed[row[0]]  # Tab not built yet: it will restore corrected rows
+        if not self.saved_tab_built:
+            return
+        self.files_table.blockSignals(True)
+        self.files_table.setSortingEnabled(False)
+        for row in range(self.files_table.rowCount()):
+            file_item = self.files_table.item(row, 0)
+            if file_item is None or file_item.text() not in changed:
+                continue
+            times = changed[file_item.text()]
+            if times is None:
+                self.saved_row_stats.pop(file_item.text(), None)
+            else:
+                self.saved_row_stats[file_item.text()] = times
+            for column, value in zip((2, 3, 4), times or (None, None, None)):
+                self.files_table.setItem(row, column, date_item(value))
+        self.files_table.setSortingEnabled(True)
+        self.files_table.blockSignals(False)
 
+    def restore_snapshot_table(self, rows):
+        """Fill the Saved Files table from snapshot rows without touching the catalog files."""
+        self.files_table.blockSignals(True)
+        self.files_table.setSortingEnabled(False)
+        self.files_table.setRowCount(0)
+        with PERF.span("populate_table", source="snapshot", rows=len(rows)):
+            tags = self.file_tags([row[0] for row in rows])
+            for file_path, section_name, times, *rest in rows:
+                self._insert_saved_file_row(file_path, section_name, times=tuple(times) if times else None,
+                                            mode=rest[0] if rest else "copy", tags=tags.get(file_path),
+                                            size=rest[1] if len(rest) > 1 else None)
+        self.files_table.setSortingEnabled(True)
+        self.files_table.blockSignals(False)
+
+    def expanded_tree_paths(self):
+        paths = []
+        pending = [self.tree_widget.topLevelItem(i) for i in range(self.tree_widget.topLevelItemCount())]
+        while pending:
+            item = pending.pop()
+            for i in range(item.childCount()):
+                child = item.child(i)
+                if child.isExpanded() and child.data(0, Qt.ItemDataRole.UserRole):
+                    paths.append(child.data(0, Qt.ItemDataRole.UserRole))
+                    pending.append(child)
+        return paths
+
+    def restore_tree_expansion(self, paths):
+        """Expand saved folders again, parents first so each lazy load finds its item."""
+        root = self.tree_widget.topLevelItem(0)
+        if root is None:
+            return
+        for path in sorted(paths, key=len):
+            item = root
+            while item is not None and item.data(0, Qt.ItemDataRole.UserRole) != path:
+                next_item = None
+                for i in range(item.childCount()):
+                    child = item.child(i)
+                    child_path = child.data(0, Qt.ItemDataRole.UserRole)
+                    if child_path and (path == child_path or path.startswith(child_path.rstrip(os.sep) + os.sep)):
+                        next_item = child
+                        break
+                item = next_item
+            if item is not None and item is not root:
+                item.setExpanded(True)
+
+    def build_session_snapshot(self):
+        """Capture what the next launch needs to redraw this session without rescanning."""
+        try:
+            directory_mtime_ns = os.stat(self.current_directory).st_mtime_ns
+        except (OSError, TypeError):
+            directory_mtime_ns = None
+        root = self.tree_widget.topLevelItem(0)
+        snapshot = {
+            "directory": self.current_directory,
+            "directory_mtime_ns": directory_mtime_ns,
+            "listing": [[path, self.file_stats.get(path) or stat_times(path)] for path in self.all_files],
+            "tree_root": root.data(0, Qt.ItemDataRole.UserRole) if root is not None else None,
+            "expanded": self.expanded_tree_paths(),
+            "explorer_section": self.section_combo_file_explorer.currentText(),
+            "tab": self.tabs.currentIndex(),
+        }
+        if self.saved_tab_built:
+            rows = []
+            for row in range(self.files_table.rowCount()):
+                file_item = self.files_table.item(row, 0)
+                section_item = self.files_table.item(row, 1)
+                storage_item = self.files_table.item(row, 6)
+                size_cell = self.files_table.item(row, 8)
+                if file_item and section_item:
+                    size = getattr(size_cell, "sort_key", None)
+                    rows.append([file_item.text(), section_item.data(Qt.ItemDataRole.UserRole),
+                                 self.saved_row_stats.get(file_item.text()),
+                                 storage_item.text() if storage_item else "copy",
+                                 size if isinstance(size, int) else None])
+            snapshot.update({
+                "section": self.section_combo.currentText(),
+                "show_all": self.show_all_sections_checkbox.isChecked(),
+                "table": rows,
+                "catalog": catalog_signature(self.catalog_files()),
+            })
+        elif self.snapshot and "table" in self.snapshot:
+            for key in ("section", "show_all", "table", "catalog"):
+                snapshot[key] = self.snapshot.get(key)
+        return snapshot
+
+    def toggle_perf_panel(self):
+        self.perf_panel.setVisible(not self.perf_panel.isVisible())
+
+    def on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.tab2:
+            self.ensure_saved_files_tab()
+
+    def ensure_saved_files_tab(self):
+        """Build the Saved Files tab on first visit and fill it from the catalog."""
+        if self.saved_tab_built:
+            return
+        self.load_startup_catalog()
+        self.setup_saved_files_tab()
+        self.saved_tab_built = True
+        self.section_combo.blockSignals(True)
+        for i in range(self.section_combo_file_explorer.count()):
+            self.section_combo.addItem(self.section_combo_file_explorer.itemText(i),
+                                       self.section_combo_file_explorer.itemData(i))
+        snapshot = self.snapshot
+        if snapshot and snapshot.get("table") is not None:
+            self.section_combo.setCurrentText(snapshot.get("section") or "")
+            self.show_all_sections_checkbox.blockSignals(True)
+            self.show_all_sections_checkbox.setChecked(bool(snapshot.get("show_all")))
+            self.show_all_sections_checkbox.blockSignals(False)
+        self.section_combo.blockSignals(False)
+        self.sync_storage_mode_combo()
+
+        # The snapshot's rows are only trusted while the catalog files are unchanged
+        if snapshot and snapshot.get("table") is not None and snapshot.get("catalog") == catalog_signature(self.catalog_files()):
+            self.restore_snapshot_table(snapshot["table"])
+        else:
+            self.update_files_table()
 
     
+    def closeEvent(self, event):
+        """Save the session snapshot and finish background writes before the window goes away."""
+        # Shutdown waits on worker threads; that is not a stall worth reporting
+        self.heartbeat_timer.stop()
+        self.watchdog.stop()
+
+        # Taken before pending writes land, so a catalog they change invalidates the rows
+        snapshot = self.build_session_snapshot()
+        if self.saved_tab_built:
+            self.dragged_text_writer.stop()
+        for import_thread in list(self.import_threads):
+            if hasattr(import_thread, "stop"):
+                import_thread.stop()  # The others finish their batch, whose catalog write must land
+            import_thread.wait()
+        if self.snapshot_revalidator:
+            self.snapshot_revalidator.wait()
+        if self.catalog_query_thread:
+            self.catalog_query_thread.wait()
+        try:
+            write_session_snapshot(self.session_snapshot_path(), snapshot)
+        except OSError as e:
+            print(f"[ERROR] Could not save session snapshot: {e}")
+        if self.catalog_events:
+            self.catalog_events.disconnected.disconnect()
+            self.organizer.client.close()
+        super().closeEvent(event)
+
+    def on_catalog_changed(self, files):
+        """Another window or script (or this one) changed the catalog through the daemon."""
+        if "sections" in files:
+            self.reload_sections()  # Keeps the selected lists even if another window renamed them
+        if "notes" in files:
+            self.load_notes()
+        if files:
+            self.update_files_table()
+
+    def on_daemon_disconnected(self):
+        print("[INFO] Catalog daemon went away; working on the catalog files directly")
+        self.catalog_events = None
+        self.organizer = organizer_core.Organizer(
+            catalog_file=self.SAVED_FILES_FILE, notes_file=self.NOTES_FILE, lists_dir=self.LISTS_DIR)
+        if self.saved_tab_built:
+            self.dragged_text_writer.organizer = self.organizer
+
     def setup_file_explorer_tab(self):
         layout = QVBoxLayout()
         layout.setContentsMargins(5, 5, 5, 5)
@@ -417,6 +2207,14 @@ class FileExplorerApp(QWidget):
         """)
         button_layout.addWidget(self.section_combo)
 
+        # How files added to this list are stored; zero-copy modes avoid duplicating large files
+        self.storage_mode_combo = QComboBox()
+        for label, mode in self.STORAGE_MODE_LABELS:
+            self.storage_mode_combo.addItem(label, mode)
+        self.storage_mode_combo.setToolTip("How files added to this list are stored")
+        self.storage_mode_combo.currentIndexChanged.connect(self.on_storage_mode_changed)
+        button_layout.addWidget(self.storage_mode_combo)
+
         self.show_all_sections_checkbox = QCheckBox("Show all lists")
         self.show_all_sections_checkbox.setChecked(False)
         self.show_all_sections_checkbox.stateChanged.connect(self.update_files_table)
@@ -438,7 +2236,7 @@ class FileExplorerApp(QWidget):
         self.search_box_saved.setPlaceholderText("Search files...")
         self.search_box_saved.textChanged.connect(self.filter_saved_files)
         button_layout.addWidget(self.search_box_saved)
-        
+
         self.skip_prompt_checkbox = QCheckBox("Don't prompt for source name when saving dragged text")
         self.skip_prompt_checkbox.setChecked(False)  # Optional: set default state
         button_layout.addWidget(self.skip_prompt_checkbox)
@@ -454,12 +2252,34 @@ class FileExplorerApp(QWidget):
         button_layout.addWidget(self.remove_saved_file_button)
 
         layout.addLayout(button_layout)
+        query_layout = QHBoxLayout()
+
+        # 🏷️ Tag query over all tagged files, e.g. thesis AND sources NOT archived
+        self.tag_query_box = QLineEdit()
+        self.tag_query_box.setPlaceholderText("Tags: a AND b NOT c (Enter)")
+        self.tag_query_box.setToolTip("Show files whose tags match; AND, OR, NOT, parentheses and \"quoted tags\"")
+        self.tag_query_box.returnPressed.connect(self.update_files_table)
+        self.tag_query_box.textChanged.connect(lambda text: None if text.strip() else self.update_files_table())
+        query_layout.addWidget(self.tag_query_box)
+
+        # 🔎 Size/date/type query answered by the catalog index, e.g. modified>2025-01-01 size>10MB ext:pdf
+        self.catalog_query_box = QLineEdit()
+        self.catalog_query_box.setPlaceholderText("Query: modified>2025-01-01 size>10MB ext:pdf missing:true sort:-size (Enter)")
+        self.catalog_query_box.setToolTip(catalog_index.__doc__.split("\n\n", 1)[1].strip())
+        self.catalog_query_box.returnPressed.connect(self.run_catalog_query)
+        self.catalog_query_box.textChanged.connect(lambda text: None if text.strip() else self.run_catalog_query())
+        query_layout.addWidget(self.catalog_query_box, 2)
+        refresh_index_button = QPushButton("Refresh Sizes/Dates")
+        refresh_index_button.setToolTip("Re-read sizes and dates from disk; otherwise they are only re-read when the catalog changes")
+        refresh_index_button.clicked.connect(lambda: self.run_catalog_query(refresh=True))
+        query_layout.addWidget(refresh_index_button)
+        layout.addLayout(query_layout)
 
         # Table widget to display all sections and their files
         self.files_table = QTableWidget()
-        self.files_table.setColumnCount(6)
+        self.files_table.setColumnCount(9)
         self.files_table.setHorizontalHeaderLabels([
-            "Files", "Lists", "Date Modified", "Date Created", "Date Accessed", "Notes"
+            "Files", "Lists", "Date Modified", "Date Created", "Date Accessed", "Notes", "Storage", "Tags", "Size"
         ])
         self.files_table.setColumnWidth(0, 580)
         self.files_table.setColumnWidth(1, 100)
@@ -467,6 +2287,9 @@ class FileExplorerApp(QWidget):
         self.files_table.setColumnWidth(3, 120)
         self.files_table.setColumnWidth(4, 120)
         self.files_table.setColumnWidth(5, 600)
+        self.files_table.setColumnWidth(6, 90)
+        self.files_table.setColumnWidth(7, 200)
+        self.files_table.setColumnWidth(8, 90)
 
         # Enable horizontal scroll for column overflow
         self.files_table.setWordWrap(False)
@@ -478,6 +2301,10 @@ class FileExplorerApp(QWidget):
 
         self.files_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.files_table.itemChanged.connect(self.on_note_edited)
+
+        # Enable context menu for copying
+        self.files_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.files_table.customContextMenuRequested.connect(self.show_table_context_menu)
         # Vertical splitter for table and preview
         # Create the preview panel
         self.preview_browser = QTextBrowser()
@@ -492,10 +2319,53 @@ class FileExplorerApp(QWidget):
             }
         """)
 
+        self.preview_browser.verticalScrollBar().valueChanged.connect(self.on_preview_scrolled)
+
+        # Page navigation for long previews (hidden unless a PDF or text window is shown)
+        self.preview_pager = QWidget()
+        pager_layout = QHBoxLayout(self.preview_pager)
+        pager_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.preview_prev_button = QPushButton("Previous")
+        self.preview_prev_button.clicked.connect(self.show_previous_preview_pages)
+        pager_layout.addWidget(self.preview_prev_button)
+
+        pager_layout.addWidget(QLabel("Page:"))
+        self.preview_page_spin = QSpinBox()
+        self.preview_page_spin.setMinimum(1)
+        self.preview_page_spin.editingFinished.connect(self.jump_to_preview_page)
+        pager_layout.addWidget(self.preview_page_spin)
+
+        self.preview_page_label = QLabel()
+        pager_layout.addWidget(self.preview_page_label)
+
+        self.preview_next_button = QPushButton("Next")
+        self.preview_next_button.clicked.connect(self.show_next_preview_pages)
+        pager_layout.addWidget(self.preview_next_button)
+
+        self.preview_end_button = QPushButton("End")
+        self.preview_end_button.clicked.connect(self.show_last_preview_pages)
+        pager_layout.addWidget(self.preview_end_button)
+        pager_layout.addStretch()
+        self.preview_pager.setVisible(False)
+
+        self.preview_panel = QWidget()
+        preview_layout = QVBoxLayout(self.preview_panel)
+        preview_layout.setContentsMargins(0, 0, 0, 0)
+        preview_layout.addWidget(self.preview_pager)
+        preview_layout.addWidget(self.preview_browser)
+
+        # Previews are extracted off the UI thread; only the latest selection renders
+        self.paged_preview_state = None
+        self.preview_controller = PreviewController(self)
+        self.preview_controller.preview_ready.connect(self.show_preview)
+        self.preview_prefetcher = PreviewPrefetcher(self)
+        self._prefetch_after_preview = False
+
         # Create vertical splitter to allow resizing
         self.saved_splitter = QSplitter(Qt.Orientation.Vertical)
         self.saved_splitter.addWidget(self.files_table)
-        self.saved_splitter.addWidget(self.preview_browser)
+        self.saved_splitter.addWidget(self.preview_panel)
         self.saved_splitter.setStretchFactor(0, 1)  # File table
         self.saved_splitter.setStretchFactor(1, 1)  # Preview browser
 
@@ -519,6 +2389,11 @@ class FileExplorerApp(QWidget):
         self.files_table.dragEnterEvent = self.dragEnterEvent
         self.files_table.dragMoveEvent = self.dragMoveEvent
         self.files_table.dropEvent = self.dropEvent_saved_files
+
+        # Dropped text is saved off the UI thread; rows are added when the batch lands
+        self.dragged_text_writer = DraggedTextWriter(self.organizer, self)
+        self.dragged_text_writer.files_saved.connect(self.on_dragged_text_saved)
+        self.dragged_text_writer.save_failed.connect(lambda message: print(f"[ERROR] {message}"))
         self.files_table.mousePressEvent = self.saved_files_mouse_press_event
         self.files_table.mouseMoveEvent = self.saved_files_mouse_move_event
         self._drag_start_position = None
@@ -536,26 +2411,204 @@ class FileExplorerApp(QWidget):
         if not file_item:
             return
 
-        file_path = file_item.text().strip()
-        if not os.path.exists(file_path):
-            self.preview_browser.setText("[File does not exist]")
-            
+        self.request_preview(file_item.text().strip())
+
+    def request_preview(self, file_path):
+        """Queue a preview of file_path, sized for the pane as it is now."""
+        viewport = self.preview_browser.viewport().size()
+        self.preview_controller.image_size = (max(viewport.width() - 40, 64), max(viewport.height() - 40, 64))
+        self.preview_prefetcher.on_selection(file_path)
+        self.preview_controller.request(file_path)
+        self._prefetch_after_preview = True
+
+    def schedule_preview_prefetch(self):
+        """Plan a prefetch of the visible rows just above and below the current row."""
+        row = self.files_table.currentRow()
+        if row < 0:
             return
 
-        ext = os.path.splitext(file_path)[1].lower()
+        def visible_rows(step, limit):
+            found = []
+            candidate = row + step
+            while 0 <= candidate < self.files_table.rowCount() and len(found) < limit:
+                if not self.files_table.isRowHidden(candidate):
+                    found.append(candidate)
+                candidate += step
+            return found
+
+        # Rows below come first: they are the next rows in the current sort order
+        rows = visible_rows(1, PreviewPrefetcher.MAX_FILES - 1) + visible_rows(-1, 1)
+        file_paths = []
+        for neighbour in rows:
+            item = self.files_table.item(neighbour, 0)
+            if item:
+                file_paths.append(item.text().strip())
+        self.preview_prefetcher.schedule(file_paths, self.preview_controller.image_size)
+
+    def show_preview(self, kind, payload):
+        """Render a finished preview job in the preview pane."""
+        if self._prefetch_after_preview:
+            self._prefetch_after_preview = False
+            self.schedule_preview_prefetch()
+        if kind == "pdf":
+            self.show_pdf_pages(payload)
+            return
+        if kind == "text_window":
+            self.show_text_window(payload)
+            return
+        if kind == "text_index":
+            self.on_text_line_index_ready(payload)
+            return
+        if kind == "text_stream":
+            self.show_text_stream(payload)
+            return
 
-        if ext == ".docx":
-            self.preview_docx_file(file_path)
-        elif ext == ".txt":
-            self.preview_txt_file(file_path)
-        elif ext == ".pdf":
-            self.preview_pdf_file(file_path)
-        elif ext in [".png", ".jpg", ".jpeg", ".gif"]:
-            self.preview_image_file(file_path)
-    
+        self.paged_preview_state = None
+        self.preview_pager.setVisible(False)
+        if kind == "image":
+            self.preview_browser.clear()
+            cursor = QTextCursor(self.preview_browser.document())
+            block_format = QTextBlockFormat()
+            block_format.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            cursor.setBlockFormat(block_format)
+            cursor.insertImage(payload["image"])
         else:
-            self.preview_browser.setText(f"[Preview not available for file type: {ext}]")
-            
+            self.preview_browser.setText(payload)
+
+    def show_text_stream(self, payload):
+        """Show document text as it is parsed: the first chunk replaces, later ones append."""
+        if payload["first"]:
+            self.paged_preview_state = None
+            self.preview_pager.setVisible(False)
+            self.preview_browser.setPlainText(payload["text"])
+        elif payload["text"]:
+            cursor = QTextCursor(self.preview_browser.document())
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText("\n\n" + payload["text"])
+
+    def _show_preview_chunk(self, kind, payload, text, start, end, total):
+        """Append text when it continues the preview on screen, otherwise replace it.
+
+        Returns the paged preview state, with positions in pages for PDFs and
+        bytes for text files.
+        """
+        state = self.paged_preview_state
+        if (state and state["kind"] == kind and state["path"] == payload["path"]
+                and state["append"] and start == state["loaded_until"]):
+            # Continuation while scrolling: append without moving the view
+            cursor = QTextCursor(self.preview_browser.document())
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText(text)
+            state["chunks"] += 1
+        else:
+            self.preview_browser.setPlainText(text)
+            state = {"kind": kind, "path": payload["path"], "first": start, "chunks": 1, "line_count": None}
+            self.paged_preview_state = state
+
+        state["loaded_until"] = end
+        state["total"] = total
+        state["loading"] = False
+        state["append"] = False
+
+        self.preview_prev_button.setEnabled(state["first"] > 0)
+        self.preview_next_button.setEnabled(end < total)
+        self.preview_end_button.setEnabled(end < total)
+        self.preview_pager.setVisible(True)
+        return state
+
+    def show_pdf_pages(self, payload):
+        """Show a chunk of PDF pages."""
+        text = format_pdf_pages(payload["pages"], payload["page_count"])
+        end = payload["start"] + len(payload["pages"])
+        self._show_preview_chunk("pdf", payload, text, payload["start"], end, payload["page_count"])
+
+        self.preview_page_spin.setEnabled(True)
+        self.preview_page_spin.setMaximum(max(payload["page_count"], 1))
+        self.preview_page_spin.setValue(payload["start"] + 1)
+        self.preview_page_label.setText(f"of {payload['page_count']}")
+
+    def show_text_window(self, payload):
+        """Show one decoded window of a memory-mapped text file."""
+        previous = self.paged_preview_state
+        state = self._show_preview_chunk(
+            "text", payload, payload["text"], payload["start"], payload["end"], payload["size"])
+        if previous and previous is not state and previous["kind"] == "text" and previous["path"] == payload["path"]:
+            # Paging within the same file keeps the index (or the job building it)
+            state["line_count"] = previous["line_count"]
+            state["indexing"] = previous.get("indexing", False)
+        if payload["line_count"] is not None:
+            state["line_count"] = payload["line_count"]
+        self._update_text_pager(payload["line"])
+
+        # Index lines lazily, once per file, only when there is more than one window
+        if payload["size"] > TEXT_PREVIEW_WINDOW and state["line_count"] is None and not state.get("indexing"):
+            state["indexing"] = True
+            self.preview_controller.request_text_line_index(payload["path"])
+
+    def on_text_line_index_ready(self, payload):
+        state = self.paged_preview_state
+        if state and state["kind"] == "text" and state["path"] == payload["path"]:
+            state["line_count"] = payload["line_count"]
+            state["indexing"] = False
+            self._update_text_pager(None)
+
+    def _update_text_pager(self, line):
+        state = self.paged_preview_state
+        self.preview_page_spin.setEnabled(state["line_count"] is not None)
+        if state["line_count"] is None:
+            self.preview_page_label.setText("(indexing lines...)" if state["total"] > TEXT_PREVIEW_WINDOW else "")
+            return
+        self.preview_page_spin.setMaximum(max(state["line_count"], 1))
+        if line is not None:
+            self.preview_page_spin.setValue(line + 1)
+        self.preview_page_label.setText(f"of {state['line_count']:,} lines")
+
+    def load_preview_chunk(self, start, append=False, line=None):
+        """Request the pages or text window at start; append continues the text on screen."""
+        state = self.paged_preview_state
+        if not state or state["loading"]:
+            return
+        start = max(0, min(start, state["total"] - 1))
+        state["loading"] = True
+        state["append"] = append
+        if state["kind"] == "pdf":
+            self.preview_controller.request_pdf_pages(state["path"], start)
+        else:
+            self.preview_controller.request_text_window(state["path"], offset=start, line=line)
+
+    def on_preview_scrolled(self, value):
+        """Fetch the next chunk when a paged preview is scrolled to the bottom."""
+        state = self.paged_preview_state
+        if not state or state["loading"] or state["loaded_until"] >= state["total"]:
+            return
+        if state["kind"] == "text" and state["chunks"] >= TEXT_PREVIEW_MAX_WINDOWS:
+            return  # Keep memory bounded; Next pages on from here
+        if value >= self.preview_browser.verticalScrollBar().maximum() - 20:
+            self.load_preview_chunk(state["loaded_until"], append=True)
+
+    def _preview_chunk_size(self):
+        return PDF_PREVIEW_PAGES if self.paged_preview_state["kind"] == "pdf" else TEXT_PREVIEW_WINDOW
+
+    def jump_to_preview_page(self):
+        state = self.paged_preview_state
+        if not state:
+            return
+        if state["kind"] == "pdf":
+            self.load_preview_chunk(self.preview_page_spin.value() - 1)
+        elif state["line_count"] is not None:
+            self.load_preview_chunk(0, line=self.preview_page_spin.value() - 1)
+
+    def show_previous_preview_pages(self):
+        if self.paged_preview_state:
+            self.load_preview_chunk(self.paged_preview_state["first"] - self._preview_chunk_size())
+
+    def show_next_preview_pages(self):
+        if self.paged_preview_state:
+            self.load_preview_chunk(self.paged_preview_state["loaded_until"])
+
+    def show_last_preview_pages(self):
+        if self.paged_preview_state:
+            self.load_preview_chunk(self.paged_preview_state["total"] - self._preview_chunk_size())
 
     def handle_saved_file_double_click(self, row, column):
         file_item = self.files_table.item(row, 0)
@@ -569,7 +2622,7 @@ class FileExplorerApp(QWidget):
 
         # Optional: show preview for .docx, open others
         if file_path.lower().endswith(".docx"):
-            self.preview_docx_file(file_path)
+            self.request_preview(file_path)
             
         else:
             self.open_file(file_path)
@@ -584,77 +2637,8 @@ class FileExplorerApp(QWidget):
         if not file_item:
             return
 
-        file_path = file_item.text().strip()
-        if not os.path.exists(file_path):
-            self.preview_browser.setText("[File does not exist]")
-            
-            return
-
-        ext = os.path.splitext(file_path)[1].lower()
-
-        if ext == ".docx":
-            self.preview_docx_file(file_path)
-        elif ext == ".txt":
-            self.preview_txt_file(file_path)
-        elif ext == ".pdf":
-            self.preview_pdf_file(file_path)
-        elif ext in [".png", ".jpg", ".jpeg", ".gif"]:
-            self.preview_image_file(file_path)
-    
-        else:
-            self.preview_browser.setText(f"[Preview not available for file type: {ext}]")
-        
-        
-    def preview_txt_file(self, file_path):
-        try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-            self.preview_browser.setText(content or "[File is empty]")
-            
-        except Exception as e:
-            self.preview_browser.setText(f"[Failed to read text file: {e}]")
-            
-            
-    def preview_image_file(self, file_path):
-        try:
-            if not os.path.exists(file_path):
-                raise FileNotFoundError("Image file does not exist")
-
-            from PIL import Image
-
-            # Get original image dimensions
-            with Image.open(file_path) as img:
-                width, height = img.size
-
-            # Calculate scaled dimensions (70%)
-            scaled_width = int(width * 0.7)
-            scaled_height = int(height * 0.7)
-
-            # Generate HTML with fixed dimensions
-            img_html = f'''
-                <div align="center">
-                    <img src="file:///{file_path}" width="{scaled_width}" height="{scaled_height}" />
-                </div>
-            '''
-            self.preview_browser.setHtml(img_html)
-            
-
-        except Exception as e:
-            self.preview_browser.setText(f"[Failed to preview image: {e}]")
-            
+        self.request_preview(file_item.text().strip())
 
-    def preview_pdf_file(self, file_path):
-        try:
-            import fitz  # PyMuPDF
-            doc = fitz.open(file_path)
-            content = ""
-            for page in doc:
-                content += page.get_text()
-            self.preview_browser.setText(content.strip() or "[PDF is empty]")
-            
-        except Exception as e:
-            self.preview_browser.setText(f"[Failed to load PDF: {e}]")
-            
 
     def open_saved_file_external(self, row, column):
         file_item = self.files_table.item(row, 0)
@@ -704,14 +2688,14 @@ class FileExplorerApp(QWidget):
 
     def record_saved_file(self, file_path, section_name):
         """Add an entry to the saved file list for a moved file."""
-        with open(self.SAVED_FILES_FILE, "a", encoding="utf-8") as file:
-            file.write(f"{file_path}|||{section_name}\n")
+        with PERF.span("catalog_write", source="record", lines=1):
+            self.organizer.record([(file_path, section_name)])
             
             
     def dropEvent_saved_files(self, event):
         """Handle drop events in the Saved Files tab."""
         mime = event.mimeData()
-        section_name = self.section_combo.currentText()
+        section_name = self.current_list_id()
 
         if not section_name:
             QMessageBox.warning(self, "No list Selected", "Please select a list to drop files/text into.")
@@ -719,16 +2703,12 @@ class FileExplorerApp(QWidget):
 
         if mime.hasUrls():
             event.acceptProposedAction()
-            move_files = not self.copy_files_checkbox.isChecked()
-            for url in mime.urls():
-                file_path = url.toLocalFile()
-                if os.path.exists(file_path):
-                    if move_files:
-                        # Implement file move logic if needed
-                        pass
-                    else:
-                        self.add_file_to_section(file_path, section_name)
-            self.update_files_table()
+            file_paths = [url.toLocalFile() for url in mime.urls()]
+            file_paths = [path for path in file_paths if path and os.path.exists(path)]
+            if not self.copy_files_checkbox.isChecked():
+                self.start_list_move(file_paths, section_name)
+                return
+            self.start_list_save(file_paths, section_name)
 
         elif (mime.hasText() or 
               mime.hasFormat("text/plain") or 
@@ -751,15 +2731,9 @@ class FileExplorerApp(QWidget):
                 return
 
             try:
-                import re
                 import unicodedata
-                from datetime import datetime
-                from docx import Document
-                from urllib.parse import urlparse
 
-                os.makedirs("lists", exist_ok=True)
-                section_folder = os.path.join(self.LISTS_DIR, section_name)
-                os.makedirs(section_folder, exist_ok=True)
+                section_folder = self.list_folder(section_name)
 
                 # Build timestamp
                 now = datetime.now()
@@ -777,8 +2751,9 @@ class FileExplorerApp(QWidget):
                 first_words = re.findall(r'\w+', normalized_text, re.UNICODE)
                 short_title = "_".join(first_words[:7]) if first_words else "untitled"
                 short_title = re.sub(r'[\\/*?:"<>|]', '', short_title)
-                
-                self.debug_clipboard_contents()
+
+                if self.DEBUG_CLIPBOARD:
+                    self.debug_clipboard_contents()
 
 
                 source_hint = self.get_source_from_clipboard_or_prompt(text)
@@ -793,13 +2768,7 @@ class FileExplorerApp(QWidget):
                 filename = f"dragged_text&{source_hint}&{short_title}&{timestamp}.docx"
                 file_path = os.path.abspath(os.path.join(section_folder, filename))
 
-                doc = Document()
-                doc.add_paragraph(text)
-                doc.save(file_path)
-
-                self.record_saved_file(file_path, section_name)
-                self.update_files_table()
-                print(f"[INFO] dragged text saved to: {file_path}")
+                self.dragged_text_writer.enqueue(text, file_path, section_name)
 
             except Exception as e:
                 print(f"[ERROR] Saving dragged text failed: {e}")
@@ -812,25 +2781,31 @@ class FileExplorerApp(QWidget):
 
 
 
+    def on_dragged_text_saved(self, saved):
+        """Add rows for a batch of saved dragged text without rebuilding the table."""
+        if self.show_all_sections_checkbox.isChecked():
+            visible = saved
+        else:
+            current_section = self.current_list_id()
+            visible = [entry for entry in saved if entry[1] == current_section]
+
+        if visible:
+            self.files_table.blockSignals(True)
+            self.files_table.setSortingEnabled(False)
+            for file_path, section_name in visible:
+                self._insert_saved_file_row(file_path, section_name)
+            self.files_table.setSortingEnabled(True)
+            self.files_table.blockSignals(False)
+
+        for file_path, _ in saved:
+            print(f"[INFO] dragged text saved to: {file_path}")
+
     def get_drag_drop_action(self):
         """Return appropriate Qt drop action based on checkbox state."""
         if hasattr(self, "copy_files_checkbox") and self.copy_files_checkbox.isChecked():
             return Qt.DropAction.CopyAction
         return Qt.DropAction.MoveAction
 
-    def get_file_date(self, file_path, date_type):
-        """Get the requested date attribute for a file."""
-        try:
-            if date_type == "created":
-                return os.path.getctime(file_path)  # Creation time
-            elif date_type == "modified":
-                return os.path.getmtime(file_path)  # Last modified time
-            elif date_type == "accessed":
-                return os.path.getatime(file_path)  # Last accessed time
-        except Exception:
-            return 0  # Return 0 if the file doesn't exist or date retrieval fails
-
-
     def sort_explorer_files(self):
         """Sort files in the File Explorer by selected date type."""
         if not self.current_directory:
@@ -847,7 +2822,7 @@ class FileExplorerApp(QWidget):
         date_type = date_type_mapping.get(selected_sort, "modified")  # Default to 'modified' if not found
 
         # Sort files based on the selected date type
-        self.all_files.sort(key=lambda f: self.get_file_date(f, date_type), reverse=True)
+        organizer_core.sort_by_date(self.all_files, date_type, self.file_stats)
 
         # Refresh the file grid layout with sorted files
         self.refresh_file_grid()
@@ -894,30 +2869,17 @@ class FileExplorerApp(QWidget):
             QMessageBox.warning(self, "Missing File", f"The file '{file_path}' no longer exists.")
             return
 
-        if file_path.lower().endswith(".docx"):
-            self.preview_docx_file(file_path)
-        else:
-            self.preview_browser.setText(f"[Preview not available for file type: {os.path.splitext(file_path)[1]}]")
-
-
-    def preview_docx_file(self, file_path):
-        """Load and display the text content of a .docx file in the preview pane."""
-        try:
-            from docx import Document
-            doc = Document(file_path)
-            content = "\n\n".join(paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip())
-            self.preview_browser.setText(content or "[Document is empty]")
-        except Exception as e:
-            self.preview_browser.setText(f"[Failed to preview document: {e}]")
+        self.request_preview(file_path)
 
 
     def on_note_edited(self, item):
         """Handle note editing in the table."""
         if item.column() == 5:  # Only process the Note column
             file_path = os.path.normpath(self.files_table.item(item.row(), 0).text().strip())
-            section_name = self.files_table.item(item.row(), 1).text().strip()
+            section_name = self.row_list_id(item.row())
             self.notes[(file_path, section_name)] = item.text().strip()
-            self.save_notes()
+            # Only this note is written, so notes other windows changed meanwhile are kept
+            self.organizer.set_notes({(file_path, section_name): self.notes[(file_path, section_name)]})
 
 
 
@@ -928,13 +2890,14 @@ class FileExplorerApp(QWidget):
         section_name = self.section_combo.currentText().strip()
         if section_name:
             if section_name not in [self.section_combo.itemText(i) for i in range(self.section_combo.count())]:
-                self.section_combo.addItem(section_name)
-                self.section_combo_file_explorer.addItem(section_name)  # Update both combo boxes
-
-                self.save_sections()  # Persist changes
+                try:
+                    self.organizer.add_lists([section_name])  # Persist changes
+                except (OSError, ValueError) as e:
+                    QMessageBox.warning(self, "Add list", f"Could not add the list: {e}")
+                    return
+                self.reload_sections(select=section_name)
 
                 # Set new section as selected and refresh UI
-                self.section_combo.setCurrentText(section_name)
                 self.section_combo_file_explorer.setCurrentText(section_name)
                 self.update_files_table()  
             else:
@@ -945,145 +2908,320 @@ class FileExplorerApp(QWidget):
 
     def rename_list(self):
         current_section = self.section_combo.currentText()
-        if not current_section:
+        list_id = self.current_list_id()
+        if not list_id:
             QMessageBox.warning(self, "No list Selected", "Please select a list to rename.")
             return
 
         new_section_name, ok = QInputDialog.getText(self, "Rename list", "Enter new list name:", text=current_section)
-        if ok and new_section_name:
+        new_section_name = new_section_name.strip()
+        if ok and new_section_name and new_section_name != current_section:
             if new_section_name in [self.section_combo.itemText(i) for i in range(self.section_combo.count())]:
                 QMessageBox.warning(self, "Duplicate list", f"The section '{new_section_name}' already exists.")
                 return
 
-            # Rename the section in the combo box
-            index = self.section_combo.findText(current_section)
-            self.section_combo.setItemText(index, new_section_name)
-
-
-            self.save_sections()  # Save the updated list of sections
-            self.update_files_table()  # Refresh the table widget
+            # Only the name changes: entries, notes and the folder are keyed by the list's id
+            try:
+                self.organizer.rename_list(list_id, new_section_name)
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(self, "Rename list", f"Could not rename the list: {e}")
+                return
+            self.reload_sections(select=new_section_name)
+            self.update_files_table()  # Refresh the Lists column
 
     def remove_list(self):
         current_section = self.section_combo.currentText()
-        if not current_section:
+        list_id = self.current_list_id()
+        if not list_id:
             QMessageBox.warning(self, "No Section Selected", "Please select a section to remove.")
             return
 
         confirm = QMessageBox.question(self, "Remove Section", f"Are you sure you want to remove the section '{current_section}' and all its files?",
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if confirm == QMessageBox.StandardButton.Yes:
-            # Remove the section from the combo box
-            index = self.section_combo.findText(current_section)
-            self.section_combo.removeItem(index)
-
-            # Delete the section file
-            if os.path.exists(f"saved_files_{current_section}.txt"):
-                os.remove(f"saved_files_{current_section}.txt")
+            # Entries go at once; the list's folder is deleted in the background
+            removal_thread = ListRemovalThread(self.organizer, list_id)
+            removal_thread.progress.connect(
+                lambda done, total: self.setWindowTitle(f"File Organizer - deleting {done:,} of {total:,} files"))
+            removal_thread.removal_finished.connect(
+                lambda removed, deleted, failures: self.on_list_removed(removal_thread, current_section,
+                                                                        removed, deleted, failures))
+            self.import_threads.add(removal_thread)
+            removal_thread.start()
+
+    def on_list_removed(self, removal_thread, section_name, removed, deleted, failures):
+        self.import_threads.discard(removal_thread)
+        removal_thread.deleteLater()
+        if not self.import_threads:
+            self.setWindowTitle("File Organizer")
+        for path, error in failures:
+            print(f"[ERROR] Failed to delete list file: {path} ({error})")
+        self.load_notes()
+        self.reload_sections()
+        self.update_files_table()
 
-            self.save_sections()  # Save the updated list of sections
-            self.update_files_table()  # Refresh the table widget
+        message = f"Removed list '{section_name}': {removed:,} entries, {deleted:,} file(s) deleted"
+        if failures:
+            message += f", {len(failures):,} not deleted"
+        self.show_temporary_popup(message)
 
     def load_sections(self, load_notes=True):
-        """Load sections from the sections.txt file into both combo boxes."""
-        self.section_combo.clear()
-        self.section_combo_file_explorer.clear()
-
-        if os.path.exists("sections.txt"):
-            with open("sections.txt", "r", encoding="utf-8") as file:
-                for line in file:
-                    section_name = line.strip()
-                    if section_name:
-                        self.section_combo.addItem(section_name)
-                        self.section_combo_file_explorer.addItem(section_name)
+        """Load lists (name shown, id as item data) into both combo boxes."""
+        combos = [self.section_combo_file_explorer]
+        if self.saved_tab_built:
+            combos.append(self.section_combo)
+        for combo in combos:
+            combo.clear()
+
+        try:
+            lists = self.organizer.lists()
+        except Exception as e:
+            print(f"[ERROR] Could not read lists: {e}")
+            lists = []
+        self.lists_by_id = {list_id: (name, folder) for list_id, name, folder in lists}
+        for list_id, name, _ in lists:
+            for combo in combos:
+                combo.addItem(name, list_id)
 
         if load_notes:
             self.load_notes()
 
-
-
-    def save_sections(self):
-        with open("sections.txt", "w", encoding="utf-8") as file:
-            for i in range(self.section_combo.count()):
-                file.write(self.section_combo.itemText(i) + "\n")
+    def reload_sections(self, select=None):
+        """Reload the combo boxes keeping (or changing) the selected lists without firing their handlers."""
+        combos = [self.section_combo_file_explorer] + ([self.section_combo] if self.saved_tab_built else [])
+        current = [combo.currentData() for combo in combos]
+        for combo in combos:
+            combo.blockSignals(True)
+        self.load_sections(load_notes=False)
+        for combo, list_id in zip(combos, current):
+            index = combo.findData(list_id)
+            if index >= 0:
+                combo.setCurrentIndex(index)
+        if select is not None and self.saved_tab_built:
+            self.section_combo.setCurrentText(select)
+        for combo in combos:
+            combo.blockSignals(False)
+        if self.saved_tab_built:
+            self.sync_storage_mode_combo()
+
+    def current_list_id(self, combo=None):
+        """Id of the list a combo box shows, or None if its text names no list."""
+        combo = combo or self.section_combo
+        index = combo.findText(combo.currentText())
+        return combo.itemData(index) if index >= 0 else None
+
+    def list_name(self, list_id):
+        return self.lists_by_id.get(list_id, (list_id, list_id))[0]
+
+    def list_folder(self, list_id):
+        return os.path.join(self.LISTS_DIR, self.lists_by_id.get(list_id, (list_id, list_id))[1])
+
+    def row_list_id(self, row):
+        section_item = self.files_table.item(row, 1)
+        return section_item.data(Qt.ItemDataRole.UserRole) if section_item else None
 
     def update_files_table(self):
+        if not self.saved_tab_built:
+            return  # Filled from the catalog when the tab is first opened
+        tag_query = self.tag_query_box.text().strip()
+        rows = self.tag_query_rows(tag_query) if tag_query else None
         self.files_table.blockSignals(True)
         self.files_table.setSortingEnabled(False)  # 🔻 Disable sorting before changes
         self.files_table.setRowCount(0)
 
-        if self.show_all_sections_checkbox.isChecked():
-            for i in range(self.section_combo.count()):
-                section_name = self.section_combo.itemText(i)
-                self._add_files_from_section(section_name)
-        else:
-            section_name = self.section_combo.currentText()
-            if section_name:
-                self._add_files_from_section(section_name)
+        with PERF.span("populate_table", source="tags" if tag_query else "catalog") as span:
+            if rows is None:
+                if self.show_all_sections_checkbox.isChecked():
+                    section_names = [self.section_combo.itemData(i) for i in range(self.section_combo.count())]
+                else:
+                    section_names = [list_id for list_id in [self.current_list_id()] if list_id]
+                rows = self.organizer.entries(section_names, with_modes=True)  # The daemon's cache when it runs
+            found = self.catalog_query_results
+            if found is not None:
+                rows = [row for row in rows if organizer_core.same_path(row[0]) in found]
+            tags = self.file_tags([file_path for file_path, _, _ in rows])
+            for file_path, section_name, mode in rows:
+                stats = found.get(organizer_core.same_path(file_path)) if found is not None else None
+                if stats and not stats[5]:  # Stats the query just read; no need to stat() again
+                    self._insert_saved_file_row(file_path, section_name, times=stats[2:5], mode=mode,
+                                                tags=tags.get(file_path), size=stats[1])
+                else:
+                    self._insert_saved_file_row(file_path, section_name, mode=mode, tags=tags.get(file_path))
+            span.set("rows", self.files_table.rowCount())
+            span.set("syscalls", self.files_table.rowCount() if found is None else 0)  # One stat per row
 
         self.files_table.setSortingEnabled(True)  # 🔺 Re-enable sorting after populating
+        self.files_table.blockSignals(False)
 
-        # Enable context menu for copying
-        self.files_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.files_table.customContextMenuRequested.connect(self.show_table_context_menu)
+    def run_catalog_query(self, refresh=False):
+        """Filter the table by the query bar; the catalog index is searched off the UI thread."""
+        query = self.catalog_query_box.text().strip()
+        if not query:
+            if self.catalog_query_results is not None:
+                self.catalog_query_results = None
+                self.update_files_table()
+            return
+        try:
+            catalog_index.parse_query(query)
+        except ValueError as e:
+            QMessageBox.warning(self, "Query", str(e))
+            return
+        self.catalog_query_thread = CatalogQueryThread(self.organizer, query, refresh, self)
+        self.catalog_query_thread.query_finished.connect(self.on_catalog_query_finished)
+        self.catalog_query_thread.query_failed.connect(self.on_catalog_query_failed)
+        self.catalog_query_thread.start()
+
+    def on_catalog_query_finished(self, query, rows):
+        if query != self.catalog_query_box.text().strip():
+            return  # Superseded by a newer query
+        self.catalog_query_results = {organizer_core.same_path(row[0]): row for row in rows}
+        self.update_files_table()
+        # sort:... in the query picks the table column to sort by its true values
+        order = catalog_index.parse_query(query)[2].split(",")[0].split()
+        column = self.QUERY_SORT_COLUMNS.get(order[0])
+        if column is not None and len(order) > 1:
+            self.files_table.sortItems(column, Qt.SortOrder.DescendingOrder if order[1] == "DESC"
+                                       else Qt.SortOrder.AscendingOrder)
+
+    def on_catalog_query_failed(self, query, error):
+        if query == self.catalog_query_box.text().strip():
+            QMessageBox.warning(self, "Query", f"Could not run the query: {error}")
 
-        self.files_table.blockSignals(False)
 
+    def tag_query_rows(self, query):
+        """(path, list, storage mode) rows for the files matching a tag query.
 
-    def _add_files_from_section(self, section_name):
-        if os.path.exists(self.SAVED_FILES_FILE):
-            with open(self.SAVED_FILES_FILE, "r", encoding="utf-8") as file:
-                for line in file:
-                    if "|||" in line:
-                        file_path, section = line.strip().split("|||", 1)
-                        if section == section_name:
-                            row_position = self.files_table.rowCount()
-                            self.files_table.insertRow(row_position)
-                            full_path = os.path.abspath(file_path.strip())
-
-                            # Column 0 - File Path (Fixed width, tooltip, scrollable)
-                            file_item = QTableWidgetItem(full_path)
-                            file_item.setToolTip(full_path)  # Show full path on hover
-                            file_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-                            # file_item.setFlags(file_item.flags() ^ Qt.ItemFlag.ItemIsEditable)  # Disabled edit restriction for File Path
-                            self.files_table.setItem(row_position, 0, file_item)
-
-                            # Column 1 - Section name
-                            section_item = QTableWidgetItem(section_name)
-                            section_item.setFlags(section_item.flags() ^ Qt.ItemFlag.ItemIsEditable)
-                            self.files_table.setItem(row_position, 1, section_item)
-
-                            # Column 5 - Notes
-                            normalized_path = os.path.normpath(full_path)
-                            note_text = self.notes.get((normalized_path, section_name), "")
-                            note_item = QTableWidgetItem(note_text)
-                            note_item.setFlags(note_item.flags() | Qt.ItemFlag.ItemIsEditable)
-                            self.files_table.setItem(row_position, 5, note_item)
-
-                            # Columns 2–4 - Timestamps
-                            try:
-                                mtime = os.path.getmtime(file_path)
-                                ctime = os.path.getctime(file_path)
-                                atime = os.path.getatime(file_path)
-
-                                self.files_table.setItem(row_position, 2, QTableWidgetItem(
-                                    time.strftime('%m-%d-%Y %H:%M:%S', time.localtime(mtime))
-                                ))
-                                self.files_table.setItem(row_position, 3, QTableWidgetItem(
-                                    time.strftime('%m-%d-%Y %H:%M:%S', time.localtime(ctime))
-                                ))
-                                self.files_table.setItem(row_position, 4, QTableWidgetItem(
-                                    time.strftime('%m-%d-%Y %H:%M:%S', time.localtime(atime))
-                                ))
-                            except Exception as e:
-                                print(f"[ERROR] Could not read timestamps: {file_path} ({e})")
+        A file in several lists gets a row per list; a tagged file in no list
+        gets one row with an empty list.
+        """
+        try:
+            with PERF.span("tag_query"):
+                paths = self.organizer.tag_query(query)
+        except Exception as e:
+            QMessageBox.warning(self, "Tag Query", f"Could not run the tag query: {e}")
+            return []
+        by_path = {}
+        for file_path, section_name, mode in self.organizer.entries(with_modes=True):
+            by_path.setdefault(organizer_core.same_path(file_path), []).append((file_path, section_name, mode))
+        rows = []
+        for file_path in paths:
+            rows.extend(by_path.get(organizer_core.same_path(file_path)) or [(file_path, "", "")])
+        return rows
+
+    def file_tags(self, paths):
+        """{path: [tags]} for table rows; empty while nothing has been tagged."""
+        if not paths or not os.path.exists(self.TAGS_FILE):
+            return {}
+        try:
+            return self.organizer.tags_of(paths)
+        except Exception as e:
+            print(f"[ERROR] Could not read tags: {e}")
+            return {}
+
+    def selected_saved_paths(self):
+        rows = sorted({index.row() for index in self.files_table.selectedIndexes()})
+        return [self.files_table.item(row, 0).text() for row in rows if self.files_table.item(row, 0)]
+
+    def edit_selected_tags(self, remove=False):
+        """Add tags to (or remove them from) the selected files, without copying anything."""
+        paths = self.selected_saved_paths()
+        if not paths:
+            QMessageBox.warning(self, "No Selection", "Please select files to tag.")
+            return
+        title = "Remove Tags" if remove else "Add Tags"
+        text, ok = QInputDialog.getText(self, title, f"Tags for {len(paths)} file(s), separated by commas:")
+        tags = [tag.strip() for tag in text.split(",") if tag.strip()] if ok else []
+        if not tags:
+            return
+        try:
+            with PERF.span("tag_write", files=len(paths), tags=len(tags)):
+                if remove:
+                    self.organizer.untag(paths, tags)
+                else:
+                    self.organizer.tag(paths, tags)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not save tags: {e}")
+            return
+        self.update_files_table()
+
+    def _insert_saved_file_row(self, file_path, section_name, times=None, mode="copy", tags=None, size=None):
+        """Append one catalog entry to the Saved Files table."""
+        row_position = self.files_table.rowCount()
+        self.files_table.insertRow(row_position)
+        full_path = os.path.abspath(file_path)
+
+        # Column 0 - File Path (Fixed width, tooltip, scrollable)
+        file_item = QTableWidgetItem(full_path)
+        file_item.setToolTip(full_path)  # Show full path on hover
+        file_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+        # file_item.setFlags(file_item.flags() ^ Qt.ItemFlag.ItemIsEditable)  # Disabled edit restriction for File Path
+        self.files_table.setItem(row_position, 0, file_item)
+
+        # Column 1 - List name; the id entries are keyed by rides along
+        section_item = QTableWidgetItem(self.list_name(section_name))
+        section_item.setData(Qt.ItemDataRole.UserRole, section_name)
+        section_item.setFlags(section_item.flags() ^ Qt.ItemFlag.ItemIsEditable)
+        self.files_table.setItem(row_position, 1, section_item)
+
+        # Column 5 - Notes
+        normalized_path = os.path.normpath(full_path)
+        note_text = self.notes.get((normalized_path, section_name), "")
+        note_item = QTableWidgetItem(note_text)
+        note_item.setFlags(note_item.flags() | Qt.ItemFlag.ItemIsEditable)
+        self.files_table.setItem(row_position, 5, note_item)
+
+        # Column 6 - How the list holds the file
+        storage_item = QTableWidgetItem(mode)
+        storage_item.setFlags(storage_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        self.files_table.setItem(row_position, 6, storage_item)
+
+        # Column 7 - Tags (edited through the context menu)
+        tags_item = QTableWidgetItem(", ".join(tags or []))
+        tags_item.setFlags(tags_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        self.files_table.setItem(row_position, 7, tags_item)
+
+        # Columns 2–4 and 8 - Timestamps and size, sorting by their values rather than their text
+        try:
+            if times:
+                mtime, ctime, atime = times
+            else:
+                st = os.stat(file_path)
+                mtime, ctime, atime, size = st.st_mtime, st.st_ctime, st.st_atime, st.st_size
+            self.saved_row_stats[full_path] = (mtime, ctime, atime)
+
+            self.files_table.setItem(row_position, 2, date_item(mtime))
+            self.files_table.setItem(row_position, 3, date_item(ctime))
+            self.files_table.setItem(row_position, 4, date_item(atime))
+        except Exception as e:
+            print(f"[ERROR] Could not read timestamps: {file_path} ({e})")
+        self.files_table.setItem(row_position, 8, size_item(size))
 
 
 
 
 
     def load_files_for_section(self, section_name):
+        self.sync_storage_mode_combo()
         self.update_files_table()
 
+    def sync_storage_mode_combo(self):
+        """Show the storage mode of the current list."""
+        list_id = self.current_list_id()
+        mode = self.organizer.storage_mode(list_id) if list_id else "copy"
+        index = self.storage_mode_combo.findData(mode)
+        self.storage_mode_combo.blockSignals(True)
+        self.storage_mode_combo.setCurrentIndex(max(index, 0))
+        self.storage_mode_combo.blockSignals(False)
+
+    def on_storage_mode_changed(self, index):
+        section_name = self.current_list_id()
+        if not section_name:
+            return
+        try:
+            self.organizer.set_storage_mode(section_name, self.storage_mode_combo.itemData(index))
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Could not save the storage mode: {e}")
+
     def move_files_to_list(self):
         selected_items = self.files_table.selectedItems()
         if not selected_items:
@@ -1091,111 +3229,54 @@ class FileExplorerApp(QWidget):
             return
 
         # Get the target section
-        target_section, ok = QInputDialog.getItem(self, "Move Files", "Select target section:", 
+        target_name, ok = QInputDialog.getItem(self, "Move Files", "Select target section:", 
                                                  [self.section_combo.itemText(i) for i in range(self.section_combo.count())], 0, False)
-        if not ok or not target_section:
+        if not ok or not target_name:
             return
+        target_section = self.section_combo.itemData(self.section_combo.findText(target_name))
 
-        # Move selected files to the target section
-        for item in selected_items:
-            if item.column() == 0:  # Only process the file column
-                file_path = item.text()
-                source_section = self.files_table.item(item.row(), 1).text()
-
-                # Remove the file from the source section
-                self.remove_file_from_section(file_path, source_section)
-
-                # Add the file to the target section
-                self.add_file_to_section(file_path, target_section)
+        # Move selected files to the target section in one batch
+        entries = [(item.text(), self.row_list_id(item.row()))
+                   for item in selected_items if item.column() == 0]  # Only process the file column
+        with PERF.span("move_to_list", files=len(entries)):
+            _, failures = self.organizer.move(entries, target_section)
+        for file_path, error in failures:
+            print(f"[ERROR] Could not move {file_path}: {error}")
+        self.load_notes()
 
         self.update_files_table()  # Refresh the table widget
 
-    def remove_file_from_section(self, file_path, section_name):
-        if os.path.exists(self.SAVED_FILES_FILE):
-            with open(self.SAVED_FILES_FILE, "r", encoding="utf-8") as file:
-                lines = file.readlines()
-
-            # Normalize for better matching
-            normalized_target = os.path.normcase(os.path.abspath(file_path))
-
-            with open(self.SAVED_FILES_FILE, "w", encoding="utf-8") as file:
-                for line in lines:
-                    if "|||" not in line:
-                        continue
-                    saved_path, saved_section = line.strip().split("|||", 1)
-                    normalized_saved = os.path.normcase(os.path.abspath(saved_path))
-
-                    if not (normalized_saved == normalized_target and saved_section == section_name):
-                        file.write(line)
-
-
-
-    
-
-    def add_file_to_section(self, file_path, section_name):
-        """Copy file into a section folder and record the entry."""
-        if not os.path.exists(file_path) or os.path.isdir(file_path):
-            print(f"[SKIP] Not a regular file: {file_path}")
-            return
-
-
-        already_saved = False
-        if os.path.exists(self.SAVED_FILES_FILE):
-            with open(self.SAVED_FILES_FILE, "r", encoding="utf-8") as file:
-                for line in file:
-                    saved_path, saved_section = line.strip().split("|||", 1)
-                    # Use normalized absolute path for comparison
-                    if saved_section == section_name and os.path.basename(saved_path) == os.path.basename(file_path):
-                        already_saved = True
-                        break
-
-        if already_saved:
-            print(f"[INFO] Skipping duplicate: '{file_path}' already saved in list '{section_name}'")
-            return
-
-        # Make section folder if it doesn't exist
-        section_folder = os.path.join(self.LISTS_DIR, section_name)
-        os.makedirs(section_folder, exist_ok=True)
-
-        # Destination path (avoid name collision)
-        base_name = os.path.basename(file_path)
-        dest_path = os.path.join(section_folder, base_name)
-        if os.path.exists(dest_path):
-            name, ext = os.path.splitext(base_name)
-            dest_path = os.path.join(section_folder, f"{name}_{int(time.time())}{ext}")
-
-        try:
-            shutil.copy2(file_path, dest_path)  # Preserve metadata
-        except Exception as e:
-            print(f"[ERROR] Copying file failed: {e}")
-            return
+    def start_list_save(self, sources, section_name):
+        """Copy files into a list in the background; the table refreshes once, when they are recorded."""
+        save_thread = ListSaveThread(self.organizer, sources, section_name)
+        save_thread.progress.connect(
+            lambda done, total: self.setWindowTitle(f"File Organizer - saving {done:,} of {total:,} files"))
+        save_thread.save_finished.connect(
+            lambda saved, skipped, failures: self.on_list_save_finished(save_thread, saved, skipped, failures))
+        self.import_threads.add(save_thread)
+        save_thread.start()
+
+    def on_list_save_finished(self, save_thread, saved, skipped, failures):
+        self.import_threads.discard(save_thread)
+        save_thread.deleteLater()
+        if not self.import_threads:
+            self.setWindowTitle("File Organizer")
+        for source, error in failures:
+            print(f"[ERROR] Could not save {source}: {error}")
+        self.update_files_table()
 
-        # Record the original source path (not the destination path)
-        with open(self.SAVED_FILES_FILE, "a", encoding="utf-8") as file:
-            file.write(f"{dest_path}|||{section_name}\n")
+        message = f"Saved {saved:,} file(s) into '{self.list_name(save_thread.section_name)}'"
+        if skipped:
+            message += f", {skipped:,} already in it"
+        if failures:
+            message += f", {len(failures):,} failed"
+        self.show_temporary_popup(message)
 
 
 
 
     def load_notes(self):
-        self.notes = {}
-        if os.path.exists(self.NOTES_FILE):
-            with open(self.NOTES_FILE, "r", encoding="utf-8") as file:
-                for line in file:
-                    try:
-                        file_path, section, note = line.split("|||", 2)
-                        file_path = os.path.normpath(file_path.strip())
-                        section = section.strip()
-                        self.notes[(file_path, section)] = note.strip()
-
-                    except ValueError:
-                        print(f"[Invalid note line]: {line}")
-
-
-    def save_notes(self):
-        with open(self.NOTES_FILE, "w", encoding="utf-8") as file:
-            for (file_path, section), note in self.notes.items():
-                file.write(f"{file_path}|||{section}|||{note}\n")
+        self.notes = organizer_core.load_notes(self.NOTES_FILE)
 
 
 
@@ -1280,26 +3361,29 @@ class FileExplorerApp(QWidget):
         self.tree_widget.clear()
         root_item = QTreeWidgetItem(self.tree_widget, [os.path.basename(root_path)])
         root_item.setData(0, Qt.ItemDataRole.UserRole, root_path)
-        root_item.setIcon(0, self.file_model.fileIcon(self.file_model.index(root_path)))
+        root_item.setIcon(0, self.icon_provider.icon(QFileInfo(root_path)))
         self.tree_widget.addTopLevelItem(root_item)
         self.populate_subitems(root_item, root_path)
         self.tree_widget.expandToDepth(0)
 
     def populate_subitems(self, parent_item, path):
-        try:
-            for entry in os.scandir(path):
-                if entry.is_dir():
-                    item = QTreeWidgetItem([entry.name])
-                    item.setData(0, Qt.ItemDataRole.UserRole, entry.path)
-                    item.setIcon(0, self.file_model.fileIcon(self.file_model.index(entry.path)))
+        with PERF.span("scan_tree", path=path, syscalls=1) as span:
+            try:
+                for entry in os.scandir(path):
+                    span.add("entries")
+                    if entry.is_dir():
+                        span.add("folders")
+                        item = QTreeWidgetItem([entry.name])
+                        item.setData(0, Qt.ItemDataRole.UserRole, entry.path)
+                        item.setIcon(0, self.icon_provider.icon(QFileInfo(entry.path)))
 
-                    # Add dummy child to indicate expandable folder
-                    dummy = QTreeWidgetItem(["Loading..."])
-                    item.addChild(dummy)
+                        # Add dummy child to indicate expandable folder
+                        dummy = QTreeWidgetItem(["Loading..."])
+                        item.addChild(dummy)
 
-                    parent_item.addChild(item)
-        except PermissionError:
-            pass
+                        parent_item.addChild(item)
+            except PermissionError:
+                pass
 
 
 
@@ -1348,8 +3432,8 @@ class FileExplorerApp(QWidget):
 
     def on_files_loaded(self, files):
         """Handle completion of background file loading."""
-        print(f"[ERROR] Background loaded {len(files)} files.")
         self.all_files_full = files
+        self.file_stats = {}  # A fresh listing is sorted on fresh stats
         self.loaded_file_count = 500
         self.all_files = files[:self.loaded_file_count]
         self.display_files()
@@ -1372,23 +3456,20 @@ class FileExplorerApp(QWidget):
         date_type = date_type_mapping.get(selected_sort, "modified")
 
         # Sort files based on date
-        self.all_files.sort(
-            key=lambda f: self.get_file_date(f, date_type) if os.path.exists(f) else 0, 
-            reverse=True
-        )
-
-        # ERROR: Check if files are present
-        #print(f"Displaying {len(self.all_files)} files in {self.current_directory}")
+        uncached = sum(1 for f in self.all_files if f not in self.file_stats)
+        with PERF.span("sort_listing", entries=len(self.all_files), syscalls=uncached):
+            organizer_core.sort_by_date(self.all_files, date_type, self.file_stats)
 
         # Get the selected view mode
         view_mode = self.view_mode_combo.currentText()
 
-        if view_mode == "Icon View":
-            self.display_icon_view()
-        elif view_mode == "List View":
-            self.display_list_view()
-        elif view_mode == "Detailed View":
-            self.display_detailed_view()
+        with PERF.span("build_view", view=view_mode, entries=len(self.all_files)):
+            if view_mode == "Icon View":
+                self.display_icon_view()
+            elif view_mode == "List View":
+                self.display_list_view()
+            elif view_mode == "Detailed View":
+                self.display_detailed_view()
 
 
 
@@ -1408,35 +3489,38 @@ class FileExplorerApp(QWidget):
     def display_list_view(self):
         for file_path in self.all_files:
             if os.path.isdir(file_path): continue
-            file_frame = QFrame()
-            file_frame.setStyleSheet("border: 2px solid transparent;")
-            file_layout = QHBoxLayout()
+            self._add_list_row(file_path)
 
-            # File icon
-            file_icon = self.file_model.fileIcon(self.file_model.index(file_path))
-            icon_label = QLabel()
-            icon_label.setPixmap(file_icon.pixmap(24, 24))
+    def _add_list_row(self, file_path):
+        file_frame = QFrame()
+        file_frame.setStyleSheet("border: 2px solid transparent;")
+        file_layout = QHBoxLayout()
 
-            # File name label (clickable)
-            file_name = os.path.basename(file_path)
-            file_name_label = QLabel(f"<a href='{file_path}'>{file_name}</a>")
-            file_name_label.setOpenExternalLinks(False)
-            file_name_label.setStyleSheet("color: blue; text-decoration: underline; cursor: pointer;")
-            file_name_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            file_name_label.mousePressEvent = lambda event, path=file_path: self.open_file(path)
+        # File icon
+        file_icon = self.icon_provider.icon(QFileInfo(file_path))
+        icon_label = QLabel()
+        icon_label.setPixmap(file_icon.pixmap(24, 24))
 
-            # ✅ Make frame toggle selection on click
-            file_frame.mousePressEvent = lambda event, path=file_path, frame=file_frame: self.toggle_file_selection(path, frame)
+        # File name label (clickable)
+        file_name = os.path.basename(file_path)
+        file_name_label = QLabel(f"<a href='{file_path}'>{file_name}</a>")
+        file_name_label.setOpenExternalLinks(False)
+        file_name_label.setStyleSheet("color: blue; text-decoration: underline; cursor: pointer;")
+        file_name_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        file_name_label.mousePressEvent = lambda event, path=file_path: self.open_file(path)
 
-            # ✅ Apply highlight if already selected
-            if file_path in self.selected_files:
-                file_frame.setStyleSheet("border: 2px solid blue;")
+        # ✅ Make frame toggle selection on click
+        file_frame.mousePressEvent = lambda event, path=file_path, frame=file_frame: self.toggle_file_selection(path, frame)
 
-            file_layout.addWidget(icon_label)
-            file_layout.addWidget(file_name_label)
-            file_frame.setLayout(file_layout)
+        # ✅ Apply highlight if already selected
+        if file_path in self.selected_files:
+            file_frame.setStyleSheet("border: 2px solid blue;")
+
+        file_layout.addWidget(icon_label)
+        file_layout.addWidget(file_name_label)
+        file_frame.setLayout(file_layout)
 
-            self.grid_layout.addWidget(file_frame)
+        self.grid_layout.addWidget(file_frame)
 
 
 
@@ -1461,39 +3545,7 @@ class FileExplorerApp(QWidget):
             for file_path in self.all_files:
                 if os.path.isdir(file_path):
                     continue
-                try:
-                    file_name = os.path.basename(file_path)
-                    file_size = os.path.getsize(file_path)
-                    last_modified = os.path.getmtime(file_path)
-                    date_created = os.path.getctime(file_path)
-                    date_accessed = os.path.getatime(file_path)
-
-                    row_position = table.rowCount()
-                    table.insertRow(row_position)
-
-                    # File name
-                    table.setItem(row_position, 0, QTableWidgetItem(file_name))
-
-                    # File size (KB or MB)
-                    if file_size < 1024 * 1024:
-                        size_display = f"{round(file_size / 1024, 2)} KB"
-                    else:
-                        size_display = f"{round(file_size / (1024 * 1024), 2)} MB"
-                    table.setItem(row_position, 1, QTableWidgetItem(size_display))
-
-                    # File timestamps
-                    table.setItem(row_position, 2, QTableWidgetItem(
-                        time.strftime('%m-%d-%Y %H:%M:%S', time.localtime(last_modified))))
-                    table.setItem(row_position, 3, QTableWidgetItem(
-                        time.strftime('%m-%d-%Y %H:%M:%S', time.localtime(date_created))))
-                    table.setItem(row_position, 4, QTableWidgetItem(
-                        time.strftime('%m-%d-%Y %H:%M:%S', time.localtime(date_accessed))))
-
-                    # Store file path
-                    table.item(row_position, 0).setData(Qt.ItemDataRole.UserRole, file_path)
-
-                except (OSError, IOError) as e:
-                    print(f"[Warning] Skipping unreadable file: {file_path} ({e})")
+                self._add_detailed_row(table, file_path)
 
             table.itemSelectionChanged.connect(
                 lambda: self.update_selected_files_from_table(table))
@@ -1506,8 +3558,56 @@ class FileExplorerApp(QWidget):
             QMessageBox.critical(
                 self, "Memory Error", "Not enough memory to render detailed file view.")
 
+    def _add_detailed_row(self, table, file_path):
+        try:
+            file_name = os.path.basename(file_path)
+            file_size = os.path.getsize(file_path)
+            last_modified = os.path.getmtime(file_path)
+            date_created = os.path.getctime(file_path)
+            date_accessed = os.path.getatime(file_path)
+
+            row_position = table.rowCount()
+            table.insertRow(row_position)
+
+            # File name
+            table.setItem(row_position, 0, QTableWidgetItem(file_name))
+
+            # File size (KB or MB) and timestamps, sorting by their values
+            table.setItem(row_position, 1, size_item(file_size))
+            table.setItem(row_position, 2, date_item(last_modified))
+            table.setItem(row_position, 3, date_item(date_created))
+            table.setItem(row_position, 4, date_item(date_accessed))
+
+            # Store file path
+            table.item(row_position, 0).setData(Qt.ItemDataRole.UserRole, file_path)
+
+        except (OSError, IOError) as e:
+            print(f"[Warning] Skipping unreadable file: {file_path} ({e})")
 
+    def append_files_to_view(self, file_paths):
+        """Add newly arrived files to the current view without rebuilding it."""
+        self.all_files.extend(file_paths)
+        view_mode = self.view_mode_combo.currentText()
+
+        if view_mode == "Detailed View":
+            item = self.grid_layout.itemAt(0)
+            table = item.widget() if item else None
+            if not isinstance(table, QTableWidget):
+                return
+            table.setSortingEnabled(False)
+            for file_path in file_paths:
+                self._add_detailed_row(table, file_path)
+            table.setSortingEnabled(True)
+        elif view_mode == "Icon View":
+            for file_path in file_paths:
+                row, col = divmod(self.grid_layout.count(), 8)
+                self.add_file_to_grid(file_path, row, col)
+        else:
+            for file_path in file_paths:
+                self._add_list_row(file_path)
 
+        if self.search_box_explorer.text().strip():
+            self.filter_explorer_files()
 
 
     def on_table_file_double_click(self, row, column):
@@ -1561,7 +3661,7 @@ class FileExplorerApp(QWidget):
         file_frame.setStyleSheet("border: 2px solid transparent;")
 
         # File icon
-        file_icon = self.file_model.fileIcon(self.file_model.index(file_path))
+        file_icon = self.icon_provider.icon(QFileInfo(file_path))
         icon_label = QLabel()
         icon_label.setPixmap(file_icon.pixmap(24, 24))
         icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -1652,23 +3752,11 @@ class FileExplorerApp(QWidget):
             if isinstance(table, QTableWidget):
                 self.update_selected_files_from_table(table)
 
-        section_name = self.section_combo_file_explorer.currentText()
+        section_name = self.current_list_id(self.section_combo_file_explorer)
         if section_name:
-            for file_path in self.selected_files:
-                already_saved = False
-                if os.path.exists(self.SAVED_FILES_FILE):
-                    with open(self.SAVED_FILES_FILE, "r", encoding="utf-8") as f:
-                        for line in f:
-                            saved_path, saved_section = line.strip().split("|||", 1)
-                            if saved_section == section_name and os.path.basename(saved_path) == os.path.basename(file_path):
-                                already_saved = True
-                                break
-                if not already_saved:
-                    self.add_file_to_section(file_path, section_name)
-
+            self.start_list_save(list(self.selected_files), section_name)
             self.selected_files.clear()
             self.clear_file_highlights()
-            self.update_files_table()
         else:
             QMessageBox.warning(self, "No Section Selected", "Please select or create a section to save files.")
 
@@ -1696,33 +3784,15 @@ class FileExplorerApp(QWidget):
     def remove_selected_saved_file(self):
         selected_items = self.files_table.selectedItems()
         if selected_items:
-            for item in selected_items:
-                # Inside the for item in selected_items loop...
-                if item.column() == 0:  # Only process the file column
-                    original_file_path = item.text()
-                    section_name = self.files_table.item(item.row(), 1).text()
-
-                    # Construct the actual saved file path in the "lists/<section>/" folder
-                    saved_folder = os.path.join("lists", section_name)
-                    saved_file_path = os.path.join(saved_folder, os.path.basename(original_file_path))
-
-                    # If the saved file exists, remove it
-                    if os.path.exists(saved_file_path):
-                        try:
-                            os.remove(saved_file_path)
-                        except Exception as e:
-                            print(f"[ERROR] Failed to delete saved file: {saved_file_path} - {e}")
-
-                    # Remove entry from the text file and memory
-                    self.remove_file_from_section(original_file_path, section_name)
-
-                    note_key = (original_file_path, section_name)
-                    if note_key in self.notes:
-                        del self.notes[note_key]
+            entries = [(item.text(), self.row_list_id(item.row()))
+                       for item in selected_items if item.column() == 0]  # Only process the file column
 
+            # Entries, their notes and the copies in lists/<section>/ go in one batch
+            with PERF.span("remove_from_list", files=len(entries)):
+                self.organizer.remove(entries, delete_copies=True)
+            self.load_notes()
 
             self.update_files_table()
-            self.save_notes()
 
 
     def add_bookmark(self):
@@ -1871,28 +3941,85 @@ class FileExplorerApp(QWidget):
             event.setDropAction(Qt.DropAction.CopyAction)
             event.accept()
 
-            for url in event.mimeData().urls():
-                src_path = url.toLocalFile()
-                if os.path.isfile(src_path):
-                    file_name = os.path.basename(src_path)
-                    dest_path = os.path.join(self.current_directory, file_name)
-
-                    # Avoid overwriting existing files
-                    if os.path.exists(dest_path):
-                        name, ext = os.path.splitext(file_name)
-                        dest_path = os.path.join(self.current_directory, f"{name}_{int(time.time())}{ext}")
-
-                    try:
-                        shutil.copy2(src_path, dest_path)
-                        print(f"[INFO] File copied to: {dest_path}")
-                        self.all_files.append(dest_path)
-                    except Exception as e:
-                        print(f"[ERROR] Failed to copy file: {e}")
-
-            self.display_files()  # Refresh grid
+            sources = [url.toLocalFile() for url in event.mimeData().urls()]
+            sources = [path for path in sources if path and os.path.exists(path)]
+            if sources and self.current_directory:
+                self.start_bulk_import(sources, self.current_directory)
         else:
             event.ignore()
+
+    def start_bulk_import(self, sources, target_directory):
+        """Copy dropped files and folders in the background, streaming new files into the view."""
+        import_thread = BulkImportThread(sources, target_directory)
+        import_thread.files_imported.connect(
+            lambda paths: self.on_bulk_files_imported(target_directory, paths))
+        import_thread.progress.connect(self.on_bulk_import_progress)
+        import_thread.import_finished.connect(
+            lambda copied, failures: self.on_bulk_import_finished(import_thread, copied, failures))
+        self.import_threads.add(import_thread)
+        import_thread.start()
+
+    def on_bulk_files_imported(self, target_directory, paths):
+        # The user may have browsed elsewhere while the copy was running
+        if target_directory == self.current_directory:
+            self.append_files_to_view(paths)
+
+    def on_bulk_import_progress(self, done, total):
+        self.setWindowTitle(f"File Organizer - importing {done:,} of {total:,} files")
+
+    def on_bulk_import_finished(self, import_thread, copied, failures):
+        self.import_threads.discard(import_thread)
+        import_thread.deleteLater()
+        if not self.import_threads:
+            self.setWindowTitle("File Organizer")
+        for source, error in failures:
+            print(f"[ERROR] Failed to copy file: {source} ({error})")
+        if import_thread.created_folders and import_thread.target_directory == self.current_directory:
+            self.populate_tree(self.current_directory)
+
+        message = f"Imported {copied:,} file(s)"
+        if failures:
+            message += f", {len(failures):,} failed"
+        self.show_temporary_popup(message)
             
+    def start_list_move(self, sources, section_name):
+        """Move dropped files into a list in the background, adding rows as they land."""
+        move_thread = ListMoveThread(self.organizer, sources, section_name, self.list_folder(section_name))
+        move_thread.files_moved.connect(self.on_list_files_moved)
+        move_thread.progress.connect(
+            lambda done, total: self.setWindowTitle(f"File Organizer - moving {done:,} of {total:,} files"))
+        move_thread.move_finished.connect(
+            lambda moved, failures: self.on_list_move_finished(move_thread, moved, failures))
+        self.import_threads.add(move_thread)
+        move_thread.start()
+
+    def on_list_files_moved(self, entries):
+        if not self.saved_tab_built:
+            return
+        shown = self.show_all_sections_checkbox.isChecked()
+        current = self.current_list_id()
+        self.files_table.blockSignals(True)
+        self.files_table.setSortingEnabled(False)
+        for file_path, section_name in entries:
+            if shown or section_name == current:
+                self._insert_saved_file_row(file_path, section_name)
+        self.files_table.setSortingEnabled(True)
+        self.files_table.blockSignals(False)
+
+    def on_list_move_finished(self, move_thread, moved, failures):
+        self.import_threads.discard(move_thread)
+        move_thread.deleteLater()
+        if not self.import_threads:
+            self.setWindowTitle("File Organizer")
+        for source, error in failures:
+            print(f"[ERROR] Failed to move file: {source} ({error})")
+        self.update_files_table()  # Picks up entries of other lists that pointed at moved files
+
+        message = f"Moved {moved:,} file(s) into '{self.list_name(move_thread.section_name)}'"
+        if failures:
+            message += f", {len(failures):,} not moved"
+        self.show_temporary_popup(message)
+
     def get_source_from_clipboard_or_prompt(self, dragged_text):
         from urllib.parse import urlparse
         import re
@@ -1986,6 +4113,19 @@ class FileExplorerApp(QWidget):
         rename_action.triggered.connect(self.rename_selected_file)
         menu.addAction(rename_action)
 
+        batch_rename_action = QAction("Batch Rename...", self)
+        batch_rename_action.triggered.connect(self.batch_rename_selected_files)
+        menu.addAction(batch_rename_action)
+
+        menu.addSeparator()
+        add_tags_action = QAction("Add Tags...", self)
+        add_tags_action.triggered.connect(lambda: self.edit_selected_tags())
+        menu.addAction(add_tags_action)
+
+        remove_tags_action = QAction("Remove Tags...", self)
+        remove_tags_action.triggered.connect(lambda: self.edit_selected_tags(remove=True))
+        menu.addAction(remove_tags_action)
+
         # Show non-blocking context menu
         global_pos = self.files_table.viewport().mapToGlobal(position)
         menu.popup(global_pos)
@@ -2059,6 +4199,9 @@ class FileExplorerApp(QWidget):
         if not selected_ranges:
             QMessageBox.warning(self, "No Selection", "Please select a file to rename.")
             return
+        if len(set(self.selected_saved_paths())) > 1:
+            self.batch_rename_selected_files()
+            return
 
         first_row = selected_ranges[0].topRow()
         file_item = self.files_table.item(first_row, 0)
@@ -2067,7 +4210,7 @@ class FileExplorerApp(QWidget):
             return
 
         old_path = file_item.text().strip()
-        section_name = section_item.text().strip()
+        section_name = section_item.data(Qt.ItemDataRole.UserRole)
 
         # Use resizable QInputDialog
         dialog = QInputDialog(self)
@@ -2088,21 +4231,13 @@ class FileExplorerApp(QWidget):
                 return
 
             try:
-                os.rename(old_path, new_path)
-                file_item.setText(new_path)
-                self.notes[(os.path.normpath(new_path), section_name)] = self.notes.pop((os.path.normpath(old_path), section_name), "")
-                self.save_notes()
-
-                # Update saved_files_all.txt
-                if os.path.exists(self.SAVED_FILES_FILE):
-                    with open(self.SAVED_FILES_FILE, "r", encoding="utf-8") as f:
-                        lines = f.readlines()
-                    with open(self.SAVED_FILES_FILE, "w", encoding="utf-8") as f:
-                        for line in lines:
-                            if line.startswith(old_path + "|||"):
-                                f.write(f"{new_path}|||{section_name}\n")
-                            else:
-                                f.write(line)
+                # Renames the file and updates saved_files_all.txt, notes.txt and tags.txt together
+                with PERF.span("catalog_write", source="rename"):
+                    _, failures = self.organizer.rename([(old_path, new_name, section_name)])
+                if failures:
+                    raise OSError(failures[0][1])
+                self.load_notes()
+                self.update_files_table()  # Its rows in every list follow the file
 
                 QMessageBox.information(self, "Success", f"File renamed to '{new_name}'.")
             except Exception as e:
@@ -2110,6 +4245,48 @@ class FileExplorerApp(QWidget):
 
 
 
+    def batch_rename_selected_files(self):
+        """Rename the selected files from a pattern; the catalog is committed once for all of them."""
+        rows = sorted({index.row() for index in self.files_table.selectedIndexes()})
+        lists = {}
+        for row in rows:
+            file_item = self.files_table.item(row, 0)
+            if file_item:
+                lists.setdefault(file_item.text().strip(), self.list_name(self.row_list_id(row)))
+        if not lists:
+            QMessageBox.warning(self, "No Selection", "Please select files to rename.")
+            return
+
+        dialog = BatchRenameDialog(list(lists), lists, self)
+        renames = dialog.renames() if dialog.exec() else []
+        dialog.deleteLater()
+        if not renames:
+            return
+        rename_thread = BatchRenameThread(self.organizer, renames)
+        rename_thread.rename_finished.connect(
+            lambda done, failures: self.on_batch_renamed(rename_thread, done, failures))
+        self.import_threads.add(rename_thread)
+        self.setWindowTitle(f"File Organizer - renaming {len(renames):,} files")
+        rename_thread.start()
+
+    def on_batch_renamed(self, rename_thread, done, failures):
+        self.import_threads.discard(rename_thread)
+        rename_thread.deleteLater()
+        if not self.import_threads:
+            self.setWindowTitle("File Organizer")
+        for path, error in failures:
+            print(f"[ERROR] Could not rename {path}: {error}")
+        self.load_notes()
+        self.update_files_table()
+
+        message = f"Renamed {len(done):,} file(s)"
+        if failures:
+            message += f", {len(failures):,} failed"
+            QMessageBox.warning(self, "Batch Rename", message + ":\n" + "\n".join(
+                f"{os.path.basename(path)}: {error}" for path, error in failures[:20]))
+        else:
+            self.show_temporary_popup(message)
+
     def open_selected_file_from_table(self):
         selected_ranges = self.files_table.selectedRanges()
         if not selected_ranges:
@@ -2169,10 +4346,35 @@ class FileExplorerApp(QWidget):
     
 
 
+# Spans timed across the app, shown in the perf panel; in memory only until start_services()
+PERF = PerfRecorder()
+
+# Text extracted from documents, shared by previews and anything else that needs it
+TEXT_STORE = None
+
+# Document parsing runs in worker processes so a bad file can be killed, not wedge the UI
+EXTRACTION_POOL = None
+
+
+def start_services(base_dir):
+    """Build the perf log, text store and extraction pool that keep their files in base_dir.
+
+    Called from the __main__ block rather than at import: spawned extraction
+    workers re-import this file, and must not build stores or pools of their own.
+    """
+    global PERF, TEXT_STORE, EXTRACTION_POOL
+    PERF = PerfRecorder(os.path.join(base_dir, FileExplorerApp.PERF_LOG_FILE))
+    TEXT_STORE = ExtractedTextStore(os.path.join(base_dir, FileExplorerApp.EXTRACTED_TEXT_FILE))
+    EXTRACTION_POOL = ExtractionPool(TEXT_STORE.db_path, timeout=20.0)
+
+
 if __name__ == "__main__":
+    start_services(FileExplorerApp.BASE_DIR)
     app = QApplication(sys.argv)
     window = FileExplorerApp()
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    EXTRACTION_POOL.shutdown()
+    sys.exit(exit_code)
 
     
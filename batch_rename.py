@@ -0,0 +1,205 @@
+"""Batch renames from a pattern, planned before anything on disk changes.
+
+A pattern builds each new name from tokens:
+
+    {name}            the old name without extension (after find/replace)
+    {ext}             the extension, with its dot
+    {n} {n:3}         a counter, optionally zero-padded to a width
+    {date} {date:%Y%m%d}        the file's modified date (strftime format)
+    {created:...} {today:...}   its created date, or today's
+    {list} {parent}   the file's list, or the folder it is in
+    {{ }}             literal braces
+
+so "{date:%Y-%m-%d}_{name}{ext}" or "Scan {n:3}{ext}". Find/replace runs on
+the old name first, as plain text or as a regular expression (with \\1
+group references). plan() reports collisions without touching the disk;
+rename_files() then renames, routing through temporary names when files
+swap or shift names within the batch.
+"""
+import os
+import re
+import time
+import uuid
+from datetime import datetime
+
+from organizer_core import same_path
+
+TOKEN = re.compile(r"\{\{|\}\}|\{(\w+)(?::([^{}]*))?\}|[{}]")
+DEFAULT_DATE_FORMAT = "%Y-%m-%d"
+INVALID_NAME_CHARS = re.compile(r'[\\/\x00]' if os.name != "nt" else r'[\\/:*?"<>|\x00-\x1f]')
+UNCHANGED = "unchanged"
+
+
+class RenamePatternError(ValueError):
+    """A pattern, or find expression, that cannot be used."""
+
+
+def compile_pattern(pattern):
+    """Pattern as a list of literal strings and (token, format) pairs."""
+    parts = []
+    position = 0
+    for match in TOKEN.finditer(pattern):
+        parts.append(pattern[position:match.start()])
+        position = match.end()
+        text = match.group(0)
+        if text in ("{{", "}}"):
+            parts.append(text[0])
+        elif match.group(1) is None:
+            raise RenamePatternError(f"Unmatched '{text}' at {match.start() + 1} (write {text * 2} for a brace)")
+        else:
+            token, spec = match.group(1), match.group(2)
+            if token not in ("name", "ext", "n", "date", "created", "today", "list", "parent"):
+                raise RenamePatternError(f"Unknown token {{{token}}}")
+            if token == "n" and spec and not spec.isdigit():
+                raise RenamePatternError("{n:WIDTH} takes a number, e.g. {n:3}")
+            parts.append((token, spec))
+    parts.append(pattern[position:])
+    return [part for part in parts if part != ""]
+
+
+def compile_find(find, regex):
+    if not find:
+        return None
+    if not regex:
+        return find
+    try:
+        return re.compile(find)
+    except re.error as e:
+        raise RenamePatternError(f"Invalid regular expression: {e}")
+
+
+def expand(parts, path, stem, counter, now, list_name=""):
+    values = []
+    stat = None
+    for part in parts:
+        if isinstance(part, str):
+            values.append(part)
+            continue
+        token, spec = part
+        if token == "name":
+            values.append(stem)
+        elif token == "ext":
+            values.append(os.path.splitext(path)[1])
+        elif token == "n":
+            values.append(str(counter).zfill(int(spec)) if spec else str(counter))
+        elif token == "list":
+            values.append(list_name)
+        elif token == "parent":
+            values.append(os.path.basename(os.path.dirname(os.path.abspath(path))))
+        else:
+            if token == "today":
+                timestamp = now
+            else:
+                stat = stat or os.stat(path)
+                timestamp = stat.st_mtime if token == "date" else stat.st_ctime
+            values.append(datetime.fromtimestamp(timestamp).strftime(spec or DEFAULT_DATE_FORMAT))
+    return "".join(values)
+
+
+def plan(paths, pattern="{name}{ext}", find="", replace="", regex=False, start=1, step=1, lists=None, now=None):
+    """[(old path, new path, problem)] for each path, in order.
+
+    problem is None for a rename that can go ahead, UNCHANGED when the name
+    stays the same, or why the file cannot take its new name. lists maps
+    paths to the list name {list} stands for. Raises RenamePatternError for
+    a pattern or find expression that cannot be used.
+    """
+    parts = compile_pattern(pattern or "{name}{ext}")
+    finder = compile_find(find, regex)
+    now = time.time() if now is None else now
+    paths = list(dict.fromkeys(paths))
+    sources = {same_path(path) for path in paths}
+
+    planned = []
+    for index, path in enumerate(paths):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if finder is not None:
+            try:
+                stem = finder.sub(replace, stem) if regex else stem.replace(finder, replace)
+            except (re.error, IndexError) as e:
+                raise RenamePatternError(f"Invalid replacement: {e}")
+        try:
+            new_name = expand(parts, path, stem, start + index * step, now, (lists or {}).get(path, "")).strip()
+        except OSError as e:
+            planned.append((path, path, f"Cannot read the file: {e.strerror or e}"))
+            continue
+        except ValueError as e:
+            raise RenamePatternError(f"Invalid date format: {e}")
+        new_path = os.path.join(os.path.dirname(path), new_name)
+        if not new_name or new_name in (".", ".."):
+            planned.append((path, new_path, "Empty name"))
+        elif INVALID_NAME_CHARS.search(new_name):
+            planned.append((path, new_path, "Name has characters a file name cannot hold"))
+        else:
+            planned.append((path, new_path, UNCHANGED if new_path == path else None))
+
+    # Two files may not end up with one name, nor take the name of a file outside the batch
+    targets = {}
+    for old_path, new_path, problem in planned:
+        if problem is None:
+            targets.setdefault(same_path(new_path), []).append(old_path)
+    result = []
+    for old_path, new_path, problem in planned:
+        if problem is None:
+            key = same_path(new_path)
+            if len(targets[key]) > 1:
+                problem = f"Same new name as {len(targets[key]) - 1} other file(s)"
+            elif key not in sources and os.path.lexists(new_path) and not is_same_file(old_path, new_path):
+                problem = "A file with that name already exists"
+        result.append((old_path, new_path, problem))
+
+    # A name held by a file staying put is taken too
+    staying = {same_path(old) for old, _, problem in result if problem is not None}
+    return [(old, new, "A file in the batch keeps that name" if problem is None and same_path(new) in staying
+             and same_path(new) != same_path(old) else problem) for old, new, problem in result]
+
+
+def is_same_file(path, other):
+    """Whether two names are one file (a case-only rename on a case-insensitive drive)."""
+    try:
+        return os.path.samefile(path, other)
+    except OSError:
+        return False
+
+
+def rename_files(moves):
+    """Rename (old, new) pairs on disk; returns ([(old, where it is now), ...], [(old, error), ...]).
+
+    Files whose new name is another file's old name are first moved to a
+    temporary name, so swaps and shifted numbering work. A file that cannot
+    reach its new name is put back; if even that fails it is reported where
+    it ended up, so the catalog can follow it.
+    """
+    sources = {same_path(old) for old, _ in moves}
+    done, failures, staged = [], [], []
+    for old_path, new_path in moves:
+        target = same_path(new_path)
+        if target in sources and target != same_path(old_path):
+            temp_path = os.path.join(os.path.dirname(old_path), f".renaming-{uuid.uuid4().hex[:8]}-{os.path.basename(old_path)}")
+            try:
+                os.rename(old_path, temp_path)
+                staged.append((old_path, temp_path, new_path))
+            except OSError as e:
+                failures.append((old_path, str(e)))
+            continue
+        try:
+            if os.path.lexists(new_path) and not is_same_file(old_path, new_path):
+                raise OSError(f"'{new_path}' already exists")
+            os.rename(old_path, new_path)
+            done.append((old_path, new_path))
+        except OSError as e:
+            failures.append((old_path, str(e)))
+
+    for old_path, temp_path, new_path in staged:
+        try:
+            if os.path.lexists(new_path):
+                raise OSError(f"'{new_path}' already exists")  # Its old owner failed to move away
+            os.rename(temp_path, new_path)
+            done.append((old_path, new_path))
+        except OSError as e:
+            failures.append((old_path, str(e)))
+            try:
+                os.rename(temp_path, old_path)
+            except OSError:
+                done.append((old_path, temp_path))
+    return done, failures
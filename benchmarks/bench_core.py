@@ -0,0 +1,198 @@
+"""Benchmarks for listing, sorting and list operations over synthetic data.
+
+    python benchmarks/bench_core.py --sizes 1000,100000 --shapes wide,deep
+    python benchmarks/compare.py old.json new.json
+
+Each benchmark runs --repeat times on freshly prepared data and the raw run
+times go into a JSON file, named after the current commit by default.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import organizer_core  # noqa: E402
+from extraction import ExtractedTextStore, extract_docx_text, extract_pdf_pages, join_pages  # noqa: E402
+from synthetic import generate_catalog, generate_tree  # noqa: E402
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class Suite:
+    """Runs benchmarks and keeps their raw timings."""
+
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = []
+
+    def run(self, name, fn, setup=None, **params):
+        """Time fn() repeat times; setup() runs untimed before each run."""
+        runs = []
+        for _ in range(self.repeat):
+            state = setup() if setup else None
+            start = time.perf_counter()
+            fn(state) if setup else fn()
+            runs.append(time.perf_counter() - start)
+        result = {
+            "name": name,
+            "params": params,
+            "runs": runs,
+            "min": min(runs),
+            "median": statistics.median(runs),
+            "mean": statistics.fmean(runs),
+        }
+        self.results.append(result)
+        label = " ".join(f"{key}={value}" for key, value in params.items())
+        print(f"{name:<24} {label:<40} median {result['median'] * 1000:10.2f} ms")
+        return result
+
+
+def bench_tree(suite, workdir, files, shape, args):
+    tree_root = os.path.join(workdir, f"tree_{shape}_{files}")
+    started = time.perf_counter()
+    folders, paths = generate_tree(tree_root, files, shape=shape, depth=args.depth, fanout=args.fanout, seed=args.seed)
+    print(f"-- generated {files} files ({shape}, {len(folders)} folders) in {time.perf_counter() - started:.1f}s")
+    largest = max(folders, key=lambda folder: sum(1 for _ in os.scandir(folder)))
+
+    suite.run("directory_load", lambda: organizer_core.scan_directory(largest), files=files, shape=shape,
+              limit=organizer_core.MAX_LISTED_FILES)
+    suite.run("directory_load_full", lambda: organizer_core.scan_directory(largest, limit=None), files=files,
+              shape=shape)
+    suite.run("tree_load", lambda: [organizer_core.scan_directory(folder, limit=None) for folder in folders],
+              files=files, shape=shape, folders=len(folders))
+    suite.run("sort", lambda state: organizer_core.sort_by_date(state, "modified"), setup=lambda: list(paths),
+              files=files, shape=shape)
+    suite.run("filter", lambda: organizer_core.filter_paths(paths, "file_00001"), files=files, shape=shape)
+    return paths
+
+
+def bench_catalog(suite, workdir, paths, args):
+    catalog_root = os.path.join(workdir, "catalog")
+    os.makedirs(catalog_root, exist_ok=True)
+    catalog_file, notes_file, sections = generate_catalog(catalog_root, args.sections, args.entries,
+                                                          args.notes, files=paths, seed=args.seed)
+    params = {"sections": args.sections, "entries": args.entries, "notes": args.notes}
+    lists_dir = os.path.join(catalog_root, "lists")
+    organizer = organizer_core.Organizer(base_dir=catalog_root, lists_dir=lists_dir)
+    pristine = {path: path + ".pristine" for path in (catalog_file, notes_file, organizer.sections_file)}
+    for path, copy in pristine.items():
+        shutil.copyfile(path, copy)
+    sources = paths[:args.ops]
+    target = sections[0]
+
+    def fresh_catalog():
+        for path, copy in pristine.items():
+            shutil.copyfile(copy, path)
+        if os.path.exists(organizer.tags_file):
+            os.remove(organizer.tags_file)
+        shutil.rmtree(lists_dir, ignore_errors=True)
+        return organizer_core.read_catalog(catalog_file)[:args.ops]
+
+    suite.run("catalog_load_section", lambda: organizer_core.section_entries(catalog_file, [target]), **params)
+    suite.run("catalog_load_all", lambda: organizer_core.section_entries(catalog_file, sections), **params)
+    # The batch calls the app makes: one catalog read and one write per operation
+    suite.run("save_to_list", lambda _: organizer.save_to_list(sources, "Benchmark"), setup=fresh_catalog,
+              ops=len(sources), **params)
+    suite.run("move", lambda entries: organizer.move(entries, target), setup=fresh_catalog, ops=args.ops, **params)
+    suite.run("remove", lambda entries: organizer.remove(entries), setup=fresh_catalog, ops=args.ops, **params)
+    suite.run("rename", lambda entries: organizer.relocate([(path, path + ".renamed") for path, _ in entries]),
+              setup=fresh_catalog, ops=args.ops, **params)
+
+    notes = organizer_core.load_notes(notes_file)
+    suite.run("notes_load", lambda: organizer_core.load_notes(notes_file), notes_count=len(notes), **params)
+    suite.run("notes_save", lambda: organizer_core.save_notes(notes_file, notes), notes_count=len(notes), **params)
+
+
+def have_pymupdf():
+    try:
+        import fitz  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def bench_previews(suite, workdir, paths):
+    # The first .docx/.pdf files generated are the ones with real content
+    docx_files = [path for path in paths if path.endswith(".docx")][:5]
+    pdf_files = [path for path in paths if path.endswith(".pdf")][:5] if have_pymupdf() else []
+    if docx_files:
+        suite.run("preview_docx", lambda: [extract_docx_text(path) for path in docx_files], documents=len(docx_files))
+    if pdf_files:
+        suite.run("preview_pdf", lambda: [extract_pdf_pages(path) for path in pdf_files], documents=len(pdf_files))
+    else:
+        print("-- preview_pdf skipped (PyMuPDF not installed)")
+
+    documents = docx_files + pdf_files
+    if documents:
+        store = ExtractedTextStore(os.path.join(workdir, "extracted_text.db"))
+        for path in documents:
+            store.get_or_extract(path)
+        suite.run("preview_cached", lambda: [store.get(path) for path in documents], documents=len(documents))
+        text, offsets = join_pages(["page text " * 500] * 50)
+        suite.run("text_store_put", lambda: store.put(documents[0], text, offsets), chars=len(text))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated file counts (up to 1000000)")
+    parser.add_argument("--shapes", default="wide,deep,balanced", help="tree shapes: wide, deep, balanced")
+    parser.add_argument("--depth", type=int, default=12, help="levels in the deep tree")
+    parser.add_argument("--fanout", type=int, default=10, help="children per folder in the balanced tree")
+    parser.add_argument("--sections", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=500, help="catalog entries per section")
+    parser.add_argument("--notes", type=float, default=0.3, help="fraction of entries with a note")
+    parser.add_argument("--ops", type=int, default=100, help="operations per save/move/remove/rename run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="where to generate data (default: a temporary directory)")
+    parser.add_argument("--keep", action="store_true", help="keep generated data")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    workdir = args.workdir or tempfile.mkdtemp(prefix="fileorganizer-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    suite = Suite(args.repeat)
+    try:
+        paths = []
+        for files in (int(size) for size in args.sizes.split(",")):
+            for shape in args.shapes.split(","):
+                paths = bench_tree(suite, workdir, files, shape.strip(), args)
+        bench_catalog(suite, workdir, paths, args)
+        bench_previews(suite, workdir, paths)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit,
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "results": suite.results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Headless UI performance harness: drives a real FileExplorerApp offscreen.
+
+    python benchmarks/bench_ui.py --files 700 --sections 20 --entries 500
+    python benchmarks/bench_ui.py --budgets benchmarks/ui_budgets.json --output ui.json
+
+Synthetic data is generated in a temporary home directory (its Documents
+folder is what the app opens), then startup, view switches, sort changes,
+search keystrokes and list switches are timed including the event
+processing and painting they cause. Peak RSS is sampled per scenario. The
+exit status is 1 when a result exceeds its budget.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_core import git_commit  # noqa: E402
+from synthetic import generate_catalog, generate_tree  # noqa: E402
+
+VIEW_MODES = ["Icon View", "List View", "Detailed View"]
+SORT_MODES = ["Sort by Date Created", "Sort by Date Modified", "Sort by Date Accessed"]
+SEARCH_QUERY = "file_0001"
+
+
+def reset_peak_rss():
+    """Start a new peak-RSS window (Linux); elsewhere the process-wide peak is reported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb():
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class UiHarness:
+    """Times UI actions on one app window, letting Qt finish the work each one queues."""
+
+    def __init__(self, app, repeat):
+        self.app = app
+        self.repeat = repeat
+        self.results = []
+
+    def settle(self):
+        self.app.processEvents()
+
+    def wait_for(self, predicate, timeout=60.0):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                raise TimeoutError("UI did not reach the expected state in time")
+            self.app.processEvents()
+            time.sleep(0.001)
+
+    def measure(self, name, action, setup=None, samples=None, **params):
+        """Time action(run) plus the events it causes, repeat times.
+
+        samples, if given, replaces the per-run timing: action returns a list
+        of durations (e.g. one per keystroke) that become the runs.
+        """
+        runs = []
+        peak = 0.0
+        for run in range(self.repeat):
+            if setup:
+                setup(run)
+                self.settle()
+            reset_peak_rss()
+            start = time.perf_counter()
+            measured = action(run)
+            self.settle()
+            elapsed = time.perf_counter() - start
+            peak = max(peak, peak_rss_mb())
+            runs.extend(measured if samples else [elapsed])
+        result = {
+            "name": name,
+            "params": params,
+            "runs": runs,
+            "min": min(runs),
+            "median": statistics.median(runs),
+            "mean": statistics.fmean(runs),
+            "max": max(runs),
+            "peak_rss_mb": round(peak, 1),
+        }
+        self.results.append(result)
+        label = " ".join(f"{key}={value}" for key, value in params.items())
+        print(f"{name:<18} {label:<32} median {result['median'] * 1000:9.2f} ms  "
+              f"max {result['max'] * 1000:9.2f} ms  peak {result['peak_rss_mb']:7.1f} MB")
+        return result
+
+
+def select_silently(combo, text):
+    """Change a combo box without firing its handlers (used to set up the next timed switch)."""
+    combo.blockSignals(True)
+    combo.setCurrentText(text)
+    combo.blockSignals(False)
+
+
+def type_query(harness, box, query):
+    """Type query one character at a time; returns the time each keystroke took."""
+    durations = []
+    for length in range(1, len(query) + 1):
+        start = time.perf_counter()
+        box.setText(query[:length])
+        harness.settle()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def clear_search(box):
+    box.setText("")
+
+
+def run_scenarios(harness, FileExplorerApp, args):
+    windows = []
+
+    def start_window(_):
+        window = FileExplorerApp()
+        window.show()
+        harness.wait_for(lambda: window.startup_started and not window.startup_steps and window.all_files)
+        windows.append(window)
+
+    def close_windows(_):
+        while windows:
+            windows.pop().close()  # Writes the session snapshot
+
+    def cold_start(run):
+        close_windows(run)
+        snapshot = FileExplorerApp.SESSION_SNAPSHOT_FILE
+        if os.path.exists(snapshot):
+            os.remove(snapshot)
+
+    harness.measure("startup", start_window, setup=cold_start, start="cold", files=args.files)
+    harness.measure("startup", start_window, setup=close_windows, start="warm", files=args.files)
+    window = windows[-1]
+    count = len(window.all_files)
+
+    for view in VIEW_MODES:
+        other = next(mode for mode in VIEW_MODES if mode != view)
+        harness.measure("view_switch", lambda _, v=view: window.view_mode_combo.setCurrentText(v),
+                        setup=lambda _, o=other: select_silently(window.view_mode_combo, o), view=view, files=count)
+
+    for view in ("Icon View", "Detailed View"):
+        select_silently(window.view_mode_combo, view)
+        window.display_files()
+        for sort in SORT_MODES:
+            other = next(mode for mode in SORT_MODES if mode != sort)
+            harness.measure("sort_change", lambda _, s=sort: window.sort_combo_explorer.setCurrentText(s),
+                            setup=lambda _, o=other: select_silently(window.sort_combo_explorer, o),
+                            view=view, sort=sort, files=count)
+
+        harness.measure("search_keystroke", lambda _: type_query(harness, window.search_box_explorer, SEARCH_QUERY),
+                        setup=lambda _: clear_search(window.search_box_explorer), samples=True,
+                        view=view, files=count)
+        clear_search(window.search_box_explorer)
+
+    window.tabs.setCurrentWidget(window.tab2)
+    harness.settle()
+    sections = [window.section_combo.itemText(i) for i in range(window.section_combo.count())]
+    if len(sections) > 1:
+        harness.measure("section_switch",
+                        lambda run: window.section_combo.setCurrentText(sections[(run + 1) % len(sections)]),
+                        setup=lambda run: select_silently(window.section_combo, sections[run % len(sections)]),
+                        sections=len(sections), entries=args.entries)
+
+        def show_all_off(_):
+            window.show_all_sections_checkbox.setChecked(False)
+
+        harness.measure("show_all_lists", lambda _: window.show_all_sections_checkbox.setChecked(True),
+                        setup=show_all_off, sections=len(sections), entries=args.entries)
+        harness.measure("search_keystroke",
+                        lambda _: type_query(harness, window.search_box_saved, SEARCH_QUERY),
+                        setup=lambda _: clear_search(window.search_box_saved), samples=True,
+                        view="Saved Files", rows=window.files_table.rowCount())
+        window.show_all_sections_checkbox.setChecked(False)
+
+    window.close()
+
+
+def check_budgets(results, budgets):
+    """Failures as readable strings; budgets map scenario name -> {ms, max_ms, peak_mb}."""
+    failures = []
+    for result in results:
+        budget = budgets.get(result["name"])
+        if not budget:
+            continue
+        label = f"{result['name']} {result['params']}"
+        measured = {
+            "ms": result["median"] * 1000,
+            "max_ms": result["max"] * 1000,
+            "peak_mb": result["peak_rss_mb"],
+        }
+        for key, limit in budget.items():
+            if key in measured and measured[key] > limit:
+                failures.append(f"{label}: {key} {measured[key]:.1f} > budget {limit}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=700, help="files in the opened folder")
+    parser.add_argument("--sections", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=500, help="catalog entries per list")
+    parser.add_argument("--notes", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budgets", default=os.path.join(ROOT, "benchmarks", "ui_budgets.json"),
+                        help="JSON budgets per scenario; pass '' to skip the check")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>-ui.json)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="fileorganizer-ui-bench-")
+    original_cwd = os.getcwd()
+    try:
+        documents = os.path.join(workdir, "Documents")
+        _, paths = generate_tree(documents, args.files, shape="wide", seed=args.seed)
+        generate_catalog(workdir, args.sections, args.entries, args.notes, files=paths, seed=args.seed)
+
+        # The app opens ~/Documents and keeps its catalog in the working directory
+        os.environ["HOME"] = workdir
+        os.chdir(workdir)
+
+        from PyQt6.QtWidgets import QApplication
+        import FileOrganizer
+        from perf import PerfRecorder
+
+        # Everything the app keeps next to itself goes to the workdir instead of the checkout
+        app_class = FileOrganizer.FileExplorerApp
+        app_class.BASE_DIR = workdir
+        app_class.LISTS_DIR = os.path.join(workdir, "lists")
+        FileOrganizer.start_services(workdir)
+        FileOrganizer.PERF = PerfRecorder()  # Spans in memory only; no perf.log
+
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+        harness = UiHarness(app, args.repeat)
+        run_scenarios(harness, app_class, args)
+        FileOrganizer.EXTRACTION_POOL.shutdown()
+    finally:
+        os.chdir(original_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    commit = git_commit()
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{commit}-ui.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit,
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qt_platform": os.environ.get("QT_QPA_PLATFORM"),
+            "repeat": args.repeat,
+            "results": harness.results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.budgets:
+        with open(args.budgets, "r", encoding="utf-8") as f:
+            budgets = json.load(f)
+        failures = check_budgets(harness.results, budgets)
+        for failure in failures:
+            print(f"[BUDGET] {failure}")
+        if failures:
+            sys.exit(1)
+        print("All scenarios within budget.")
+
+
+if __name__ == "__main__":
+    main()
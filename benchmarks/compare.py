@@ -0,0 +1,54 @@
+"""Compare two benchmark result files and flag regressions.
+
+    python benchmarks/compare.py baseline.json candidate.json --threshold 0.10
+
+Benchmarks are matched by name and parameters; the exit status is 1 if any
+median got slower than the threshold allows.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    results = {}
+    for result in data["results"]:
+        key = (result["name"], json.dumps(result["params"], sort_keys=True))
+        results[key] = result
+    return data, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown of the median (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    base_data, base = load(args.baseline)
+    new_data, new = load(args.candidate)
+    print(f"baseline {base_data.get('commit')}  vs  candidate {new_data.get('commit')}")
+
+    regressions = 0
+    for key in sorted(base.keys() & new.keys()):
+        name, params = key
+        before = base[key]["median"]
+        after = new[key]["median"]
+        ratio = after / before if before else float("inf")
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 - args.threshold:
+            flag = "  faster"
+        print(f"{name:<24} {before * 1000:10.2f} ms -> {after * 1000:10.2f} ms  x{ratio:5.2f}  {params}{flag}")
+
+    for key in sorted(base.keys() - new.keys()):
+        print(f"{key[0]:<24} missing from candidate  {key[1]}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import os
+import random
+import zipfile
+
+
+# Extension mix of generated files, weighted roughly like a Documents folder
+FILE_TYPES = [(".txt", 35), (".docx", 15), (".pdf", 10), (".png", 15), (".jpg", 10), (".md", 10), (".csv", 5)]
+SAMPLE_DOCUMENTS = 20  # .docx/.pdf files that get real content for preview benchmarks
+WORDS = ("alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima mike "
+         "november oscar papa quebec romeo sierra tango uniform victor whiskey xray yankee zulu").split()
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/></Relationships>'
+)
+
+
+def sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def make_docx(path, paragraphs, rng):
+    """Write a minimal but valid .docx without python-docx."""
+    body = "".join(f"<w:p><w:r><w:t>{sentence(rng)}</w:t></w:r></w:p>" for _ in range(paragraphs))
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{body}</w:body></w:document>')
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", DOCX_RELS)
+        archive.writestr("word/document.xml", document)
+
+
+def make_pdf(path, pages, rng):
+    """Write a text PDF with PyMuPDF; returns False if it is not installed."""
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        return False
+    with fitz.open() as doc:
+        for _ in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), "\n".join(sentence(rng) for _ in range(30)))
+        doc.save(path)
+    return True
+
+
+def folder_layout(root, files, shape, depth, fanout):
+    """Folders to spread files over: one folder, a chain depth deep, or a fanout-wide tree."""
+    if shape == "wide":
+        return [root]
+    if shape == "deep":
+        folders = [root]
+        for level in range(depth):
+            folders.append(os.path.join(folders[-1], f"level_{level:02d}"))
+        return folders
+    if shape == "balanced":
+        folders = [root]
+        frontier = [root]
+        while len(folders) * 100 < files and frontier:
+            parent = frontier.pop(0)
+            for index in range(fanout):
+                child = os.path.join(parent, f"dir_{index:02d}")
+                folders.append(child)
+                frontier.append(child)
+        return folders
+    raise ValueError(f"Unknown tree shape: {shape}")
+
+
+def generate_tree(root, files, shape="wide", depth=8, fanout=10, seed=0, content_bytes=256):
+    """Create files mixed-type files under root; returns (folders, file paths).
+
+    Modification times are spread over the last year so date sorts do real
+    work. Only the first SAMPLE_DOCUMENTS .docx/.pdf files get parseable
+    content; the rest just carry the extension.
+    """
+    rng = random.Random(seed)
+    folders = folder_layout(root, files, shape, depth, fanout)
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
+
+    extensions = [ext for ext, _ in FILE_TYPES]
+    weights = [weight for _, weight in FILE_TYPES]
+    filler = os.urandom(content_bytes)
+    now = 1_700_000_000
+    paths = []
+    samples = {".docx": 0, ".pdf": 0}
+    for index in range(files):
+        ext = rng.choices(extensions, weights)[0]
+        folder = folders[index % len(folders)]
+        path = os.path.join(folder, f"file_{index:07d}_{rng.choice(WORDS)}{ext}")
+        if ext in samples and samples[ext] < SAMPLE_DOCUMENTS:
+            samples[ext] += 1
+            if ext == ".docx":
+                make_docx(path, 200, rng)
+            elif not make_pdf(path, 10, rng):
+                open(path, "wb").close()
+        elif ext in (".txt", ".md", ".csv"):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(sentence(rng, max(1, content_bytes // 6)))
+        else:
+            with open(path, "wb") as f:
+                f.write(filler)
+        stamp = now - rng.randrange(365 * 24 * 3600)
+        os.utime(path, (stamp, stamp))
+        paths.append(path)
+    return folders, paths
+
+
+def generate_catalog(root, sections, entries, notes_ratio=0.3, files=None, seed=0):
+    """Write sections.txt, saved_files_all.txt and notes.txt under root.
+
+    Entries point at files when given (cycling through them), otherwise at
+    made-up paths. Returns (catalog file, notes file, section names).
+    """
+    rng = random.Random(seed)
+    section_names = [f"List {index:03d}" for index in range(sections)]
+    catalog_file = os.path.join(root, "saved_files_all.txt")
+    notes_file = os.path.join(root, "notes.txt")
+    with open(os.path.join(root, "sections.txt"), "w", encoding="utf-8") as f:
+        f.writelines(f"{name}\n" for name in section_names)
+
+    counter = 0
+    with open(catalog_file, "w", encoding="utf-8") as catalog, open(notes_file, "w", encoding="utf-8") as notes:
+        for name in section_names:
+            for _ in range(entries):
+                if files:
+                    path = files[counter % len(files)]
+                else:
+                    path = os.path.join(root, "lists", name, f"saved_{counter:07d}.txt")
+                counter += 1
+                catalog.write(f"{path}|||{name}\n")
+                if rng.random() < notes_ratio:
+                    notes.write(f"{os.path.normpath(path)}|||{name}|||{sentence(rng, 8)}\n")
+    return catalog_file, notes_file, section_names
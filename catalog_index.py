@@ -0,0 +1,264 @@
+"""Structured queries over the saved catalog, answered from indexed columns.
+
+The size and times of every file in the catalog are kept in an SQLite table
+next to the catalog files, with an index per column, so a query such as
+
+    modified>2025-01-01 size>10MB ext:pdf missing:false
+    type:image created=2024-06-03 "tax return" sort:-size
+
+is answered by the indexes instead of by stat()ing and comparing every row.
+Predicates are field OP value with OP one of > >= < <= = or :, and are
+ANDed; other words must appear in the path (quote them if they hold spaces
+or look like a predicate).
+
+    size      bytes, or with a unit: 200KB, 10MB, 1.5GB (powers of 1024)
+    modified  2025-01-01, 2025-01-01T14:30, today, or an age: 7d, 12h, 2w
+    created   (a day compared with = covers the whole day)
+    accessed
+    ext       pdf, .pdf or pdf,docx
+    type      document, image, video, audio, archive, code or text
+    missing   true/false (yes/no)
+    sort      size, modified, ... or -size for largest first
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from organizer_core import same_path
+
+# Index columns and the query fields that name them
+COLUMNS = {"size": "size", "modified": "mtime", "created": "ctime", "accessed": "atime", "name": "name"}
+FIELD_ALIASES = {"mtime": "modified", "date": "modified", "ctime": "created", "atime": "accessed",
+                 "extension": "ext", "kind": "type"}
+DATE_FIELDS = ("modified", "created", "accessed")
+SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "kb": 1024, "m": 1024 ** 2, "mb": 1024 ** 2,
+              "g": 1024 ** 3, "gb": 1024 ** 3, "t": 1024 ** 4, "tb": 1024 ** 4}
+AGE_UNITS = {"m": 60, "min": 60, "h": 3600, "d": 86400, "w": 7 * 86400, "y": 365 * 86400}
+TYPE_EXTENSIONS = {
+    "document": (".doc", ".docx", ".pdf", ".odt", ".rtf", ".txt", ".md", ".xls", ".xlsx", ".ppt", ".pptx"),
+    "image": (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tif", ".tiff", ".webp", ".heic", ".svg"),
+    "video": (".mp4", ".mov", ".avi", ".mkv", ".wmv", ".webm", ".m4v"),
+    "audio": (".mp3", ".wav", ".flac", ".aac", ".ogg", ".m4a"),
+    "archive": (".zip", ".tar", ".gz", ".bz2", ".xz", ".7z", ".rar"),
+    "code": (".py", ".js", ".ts", ".c", ".h", ".cpp", ".java", ".go", ".rs", ".sh", ".html", ".css"),
+    "text": (".txt", ".md", ".csv", ".json", ".xml", ".log", ".ini", ".yaml", ".yml"),
+}
+BOOLEAN_WORDS = {"true": 1, "yes": 1, "1": 1, "false": 0, "no": 0, "0": 0}
+QUERY_TOKEN = re.compile(r'\s*(?:"([^"]*)"|(\S+))')
+PREDICATE = re.compile(r"^([a-zA-Z]+)(>=|<=|>|<|=|:)(.+)$")
+STAT_CHUNK = 2048  # Paths stat()ed per pool task
+SELECT_COLUMNS = "path, size, mtime, ctime, atime, missing"
+
+
+class CatalogQueryError(ValueError):
+    """A catalog query that cannot be parsed."""
+
+
+def parse_size(text):
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([a-zA-Z]*)", text.strip())
+    if not match or match.group(2).lower() not in SIZE_UNITS:
+        raise CatalogQueryError(f"Not a size: {text!r} (try 500KB or 10MB)")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).lower()])
+
+
+def parse_time(text, now=None):
+    """(start, end) timestamps of a date, minute or age; a bare day spans the whole day."""
+    now = time.time() if now is None else now
+    text = text.strip().lower()
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)(min|m|h|d|w|y)", text)
+    if match:
+        moment = now - float(match.group(1)) * AGE_UNITS[match.group(2)]
+        return moment, moment
+    if text in ("today", "yesterday"):
+        day = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        if text == "yesterday":
+            day -= timedelta(days=1)
+        return day.timestamp(), (day + timedelta(days=1)).timestamp()
+    for layout, span in (("%Y-%m-%d", timedelta(days=1)), ("%Y-%m-%dT%H:%M", timedelta(minutes=1)),
+                         ("%Y-%m-%dT%H:%M:%S", timedelta(seconds=1)), ("%Y-%m", None), ("%Y", None)):
+        try:
+            start = datetime.strptime(text, layout)
+        except ValueError:
+            continue
+        if span is None:  # A whole month or year
+            end = start.replace(year=start.year + 1) if layout == "%Y" else (
+                start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1))
+        else:
+            end = start + span
+        return start.timestamp(), end.timestamp()
+    raise CatalogQueryError(f"Not a date: {text!r} (try 2025-01-01, today or 7d)")
+
+
+def parse_query(expression, now=None):
+    """Turn a query into (SQL condition, parameters, ORDER BY clause)."""
+    conditions, parameters, order = [], [], "path"
+    for match in QUERY_TOKEN.finditer(expression.strip()):
+        quoted, word = match.groups()
+        predicate = PREDICATE.match(word) if word else None
+        if predicate is None:
+            text = quoted if quoted is not None else word
+            conditions.append("path LIKE ? ESCAPE '\\'")
+            parameters.append(like_pattern(text))
+            continue
+        field, operator, value = predicate.groups()
+        field = FIELD_ALIASES.get(field.lower(), field.lower())
+        if operator == ":":
+            operator = "="
+        if field == "sort":
+            descending = value.startswith("-")
+            name = FIELD_ALIASES.get(value.lstrip("-+").lower(), value.lstrip("-+").lower())
+            if name not in COLUMNS:
+                raise CatalogQueryError(f"Cannot sort by {value!r}; use one of {', '.join(COLUMNS)}")
+            order = f"{COLUMNS[name]} {'DESC' if descending else 'ASC'}, path"
+        elif field == "size":
+            conditions.append(f"size {operator} ?")
+            parameters.append(parse_size(value))
+        elif field in DATE_FIELDS:
+            column = COLUMNS[field]
+            start, end = parse_time(value, now)
+            if operator == "=":
+                conditions.append(f"{column} >= ? AND {column} < ?")
+                parameters.extend([start, end])
+            else:
+                # After a day means from its end on; up to a day includes all of it
+                comparison, bound = {">": (">=", end), ">=": (">=", start), "<": ("<", start), "<=": ("<", end)}[operator]
+                conditions.append(f"{column} {comparison} ?")
+                parameters.append(bound)
+        elif field in ("ext", "type"):
+            if operator != "=":
+                raise CatalogQueryError(f"Use {field}:value, not {field}{operator}")
+            if field == "ext":
+                extensions = ["." + name.strip().lstrip(".").lower() for name in value.split(",") if name.strip()]
+            else:
+                extensions = []
+                for name in value.lower().split(","):
+                    if name not in TYPE_EXTENSIONS:
+                        raise CatalogQueryError(f"Unknown type {name!r}; use one of {', '.join(TYPE_EXTENSIONS)}")
+                    extensions.extend(TYPE_EXTENSIONS[name])
+            if not extensions:
+                raise CatalogQueryError(f"Give {field}:value a value")
+            conditions.append(f"ext IN ({', '.join('?' * len(extensions))})")
+            parameters.extend(extensions)
+        elif field == "missing":
+            if operator != "=" or value.lower() not in BOOLEAN_WORDS:
+                raise CatalogQueryError("Use missing:true or missing:false")
+            conditions.append("missing = ?")
+            parameters.append(BOOLEAN_WORDS[value.lower()])
+        elif field == "name":
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            parameters.append(like_pattern(value))
+        else:
+            raise CatalogQueryError(f"Unknown field {field!r}")
+    return " AND ".join(conditions) or "1", parameters, order
+
+
+def like_pattern(text):
+    """LIKE pattern for text anywhere in a value (SQLite's LIKE ignores ASCII case)."""
+    return "%" + re.sub(r"([%_\\])", r"\\\1", text) + "%"
+
+
+def stat_rows(paths):
+    """(size, mtime, ctime, atime, missing) of each path."""
+    rows = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            rows.append((None, None, None, None, 1))
+            continue
+        rows.append((st.st_size, st.st_mtime, st.st_ctime, st.st_atime, 0))
+    return rows
+
+
+class CatalogIndex:
+    """Size, times and type of the catalog's files in indexed SQLite columns.
+
+    sync() brings the table in line with the catalog (stat()ing the files on
+    a thread pool and writing only rows that changed); query() then answers
+    structured queries from the indexes alone. Paths are stored as same_path keys,
+    next to the path as the catalog wrote it.
+    """
+
+    def __init__(self, db_path, workers=8):
+        self.db_path = db_path
+        self.workers = workers
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                connection.execute("""
+                    CREATE TABLE IF NOT EXISTS files (
+                        key TEXT PRIMARY KEY,
+                        path TEXT NOT NULL,
+                        name TEXT NOT NULL,
+                        ext TEXT NOT NULL,
+                        size INTEGER,
+                        mtime REAL,
+                        ctime REAL,
+                        atime REAL,
+                        missing INTEGER NOT NULL
+                    )
+                """)
+                for column in ("size", "mtime", "ctime", "atime", "ext", "missing"):
+                    connection.execute(f"CREATE INDEX IF NOT EXISTS files_{column} ON files ({column})")
+                connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._local.connection = connection
+        return connection
+
+    def signature(self):
+        """The catalog signature passed to the last sync(), or None."""
+        row = self._connection().execute("SELECT value FROM meta WHERE key = 'catalog'").fetchone()
+        return row[0] if row else None
+
+    def sync(self, paths, signature=None):
+        """Index exactly these paths with their current stats; returns (changed, removed) counts.
+
+        signature (e.g. the catalog file's mtime and size) is stored with the
+        rows, so later callers can tell whether the index is still current.
+        """
+        wanted = {}
+        for path in paths:
+            wanted.setdefault(same_path(path), path)
+        connection = self._connection()
+        known = {row[0]: row[1:] for row in connection.execute(
+            "SELECT key, path, size, mtime, ctime, atime, missing FROM files")}
+        keys = list(wanted)
+        chunks = [[wanted[key] for key in keys[start:start + STAT_CHUNK]] for start in range(0, len(keys), STAT_CHUNK)]
+        stats = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for chunk in pool.map(stat_rows, chunks):  # Threads only pay off on slow (network) drives
+                stats.extend(chunk)
+        changed = []
+        for key, stat in zip(keys, stats):
+            path = wanted[key]
+            if known.get(key) != (path,) + stat:
+                name = os.path.basename(path)
+                changed.append((key, path, name.lower(), os.path.splitext(name)[1].lower()) + stat)
+        removed = [(key,) for key in known.keys() - wanted.keys()]
+        if changed or removed or signature is not None:
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", changed)
+                connection.executemany("DELETE FROM files WHERE key = ?", removed)
+                if signature is not None:
+                    connection.execute("INSERT OR REPLACE INTO meta VALUES ('catalog', ?)", (signature,))
+        return len(changed), len(removed)
+
+    def query(self, expression, now=None):
+        """(path, size, mtime, ctime, atime, missing) of the files matching a query, in its sort order."""
+        condition, parameters, order = parse_query(expression, now)
+        return self._connection().execute(
+            f"SELECT {SELECT_COLUMNS} FROM files WHERE {condition} ORDER BY {order}", parameters).fetchall()
+
+    def explain(self, expression):
+        """SQLite's plan for a query, to check that it uses the indexes."""
+        condition, parameters, order = parse_query(expression)
+        return [row[-1] for row in self._connection().execute(
+            f"EXPLAIN QUERY PLAN SELECT {SELECT_COLUMNS} FROM files WHERE {condition} ORDER BY {order}", parameters)]
@@ -0,0 +1,486 @@
+import os
+import multiprocessing
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import zipfile
+import zlib
+from array import array
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError, as_completed
+from xml.etree.ElementTree import iterparse
+
+
+class ExtractionCancelled(Exception):
+    """Raised inside an extraction job once it is no longer wanted."""
+
+
+def check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ExtractionCancelled()
+
+
+def file_signature(file_path):
+    """(size, mtime_ns) identifying one version of a file."""
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MARKUP_COMPATIBILITY_NS = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+
+def iter_docx_paragraphs(file_path, cancel_event=None):
+    """Yield the text of each paragraph of a .docx file as word/document.xml is parsed.
+
+    The XML is streamed out of the zip and elements are discarded as soon as
+    their paragraph is done, so memory does not grow with the document and
+    the first paragraphs are available before parsing finishes. Unlike
+    python-docx's doc.paragraphs this includes table cells and text boxes.
+    """
+    paragraph_tag = WORD_NS + "p"
+    text_tag = WORD_NS + "t"
+    tab_tag = WORD_NS + "tab"
+    break_tags = (WORD_NS + "br", WORD_NS + "cr")
+    body_tag = WORD_NS + "body"
+    fallback_tag = MARKUP_COMPATIBILITY_NS + "Fallback"
+
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as stream:
+        body = None
+        depth = 0
+        fallback_depth = 0  # mc:Fallback repeats the content of mc:Choice
+        paragraphs = []  # Stack of open paragraphs; text boxes nest them
+
+        for event, element in iterparse(stream, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                depth += 1
+                if tag == paragraph_tag:
+                    paragraphs.append([])
+                elif tag == fallback_tag:
+                    fallback_depth += 1
+                elif tag == body_tag:
+                    body = element
+                continue
+
+            depth -= 1
+            if tag == fallback_tag:
+                fallback_depth -= 1
+            elif paragraphs and not fallback_depth:
+                if tag == text_tag:
+                    paragraphs[-1].append(element.text or "")
+                elif tag == tab_tag:
+                    paragraphs[-1].append("\t")
+                elif tag in break_tags:
+                    paragraphs[-1].append("\n")
+
+            if tag == paragraph_tag:
+                check_cancelled(cancel_event)
+                parts = paragraphs.pop()
+                if not fallback_depth:
+                    yield "".join(parts)
+                element.clear()
+
+            # Drop finished top-level blocks so the tree never holds the whole body
+            if depth == 2 and body is not None:
+                body.clear()
+
+
+def extract_docx_text(file_path, cancel_event=None):
+    """Return the non-empty paragraphs of a .docx file joined by blank lines."""
+    return "\n\n".join(
+        paragraph for paragraph in iter_docx_paragraphs(file_path, cancel_event) if paragraph.strip())
+
+
+def extract_pdf_pages(file_path, cancel_event=None):
+    """Return the text of every page of a PDF as a list."""
+    import fitz  # PyMuPDF
+    pages = []
+    with fitz.open(file_path) as doc:
+        for page in doc:
+            check_cancelled(cancel_event)
+            pages.append(page.get_text())
+    return pages
+
+
+def join_pages(pages):
+    """Join page texts, returning (text, offsets) where offsets[i] is where page i starts."""
+    offsets = array("Q")
+    position = 0
+    for page in pages:
+        offsets.append(position)
+        position += len(page)
+    return "".join(pages), offsets
+
+
+def split_pages(text, offsets):
+    """Inverse of join_pages."""
+    bounds = list(offsets) + [len(text)]
+    return [text[bounds[i]:bounds[i + 1]] for i in range(len(offsets))]
+
+
+EXTRACTORS = {
+    ".docx": lambda file_path, cancel_event: (extract_docx_text(file_path, cancel_event), None),
+    ".pdf": lambda file_path, cancel_event: join_pages(extract_pdf_pages(file_path, cancel_event)),
+}
+
+
+class ExtractedTextStore:
+    """Persistent, compressed store of text extracted from documents.
+
+    Rows are keyed by normalized path and validated against (size, mtime_ns),
+    so each version of a file is parsed at most once and an edited file is
+    parsed again on next use. Paged formats keep the character offset of each
+    page, so a single page can be served without splitting the whole text.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS extracted_text (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    page_offsets BLOB,
+                    text BLOB NOT NULL
+                )
+            """)
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def get(self, file_path, signature=None):
+        """Return (text, page_offsets) for the current version of file_path, or None."""
+        if signature is None:
+            signature = file_signature(file_path)
+        row = self._connection().execute(
+            "SELECT size, mtime_ns, page_offsets, text FROM extracted_text WHERE path = ?",
+            (self._key(file_path),)).fetchone()
+        if row is None or (row[0], row[1]) != signature:
+            return None
+        offsets = None
+        if row[2] is not None:
+            offsets = array("Q")
+            offsets.frombytes(row[2])
+        return zlib.decompress(row[3]).decode("utf-8"), offsets
+
+    def put(self, file_path, text, page_offsets=None, signature=None):
+        """Store text for a version of file_path.
+
+        Pass the signature taken before extraction started, so a file edited
+        mid-extraction is not stored under its new version.
+        """
+        if signature is None:
+            signature = file_signature(file_path)
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO extracted_text (path, size, mtime_ns, page_offsets, text) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self._key(file_path), signature[0], signature[1],
+                 page_offsets.tobytes() if page_offsets is not None else None,
+                 zlib.compress(text.encode("utf-8"), 6)))
+
+    def get_or_extract(self, file_path, cancel_event=None):
+        """Return (text, page_offsets), parsing the file only if this version is not stored."""
+        signature = file_signature(file_path)
+        stored = self.get(file_path, signature)
+        if stored is not None:
+            return stored
+
+        extractor = EXTRACTORS.get(os.path.splitext(file_path)[1].lower())
+        if extractor is None:
+            raise ValueError(f"No text extractor for {file_path}")
+        text, offsets = extractor(file_path, cancel_event)
+        self.put(file_path, text, offsets, signature)
+        return text, offsets
+
+    def prune(self):
+        """Drop rows for files that no longer exist; returns the number removed."""
+        connection = self._connection()
+        missing = [(path,) for (path,) in connection.execute("SELECT path FROM extracted_text")
+                   if not os.path.exists(path)]
+        with connection:
+            connection.executemany("DELETE FROM extracted_text WHERE path = ?", missing)
+        return len(missing)
+
+
+class ExtractionTimeout(Exception):
+    """An extraction job ran past its time limit; its worker process was killed."""
+
+
+class ExtractionFailed(Exception):
+    """An extraction job raised inside its worker process, or the worker died."""
+
+
+DOCX_PARAGRAPH_BATCH = 200  # Paragraphs per partial message from a worker
+
+_worker_stores = {}
+_worker_pdf = None  # (path, signature, open fitz document) reused across page jobs
+
+
+def _worker_store(db_path):
+    store = _worker_stores.get(db_path)
+    if store is None:
+        store = _worker_stores[db_path] = ExtractedTextStore(db_path)
+    return store
+
+
+def _job_extract_text(file_path, db_path, on_partial):
+    text, offsets = _worker_store(db_path).get_or_extract(file_path)
+    return text, offsets.tobytes() if offsets is not None else None
+
+
+def _job_index(file_path, db_path, on_partial):
+    text, _ = _worker_store(db_path).get_or_extract(file_path)
+    return len(text)
+
+
+def _job_docx_paragraphs(file_path, on_partial):
+    batch = []
+    for paragraph in iter_docx_paragraphs(file_path):
+        batch.append(paragraph)
+        if len(batch) >= DOCX_PARAGRAPH_BATCH:
+            on_partial(batch)
+            batch = []
+    return batch
+
+
+def _job_pdf_pages(file_path, start, count, on_partial):
+    global _worker_pdf
+    import fitz  # PyMuPDF
+    signature = file_signature(file_path)
+    if _worker_pdf is None or _worker_pdf[:2] != (file_path, signature):
+        if _worker_pdf is not None:
+            _worker_pdf[2].close()
+            _worker_pdf = None
+        _worker_pdf = (file_path, signature, fitz.open(file_path))
+    doc = _worker_pdf[2]
+    end = min(start + count, doc.page_count)
+    return doc.page_count, [doc.load_page(index).get_text() for index in range(max(start, 0), end)]
+
+
+WORKER_JOBS = {
+    "extract_text": _job_extract_text,
+    "index": _job_index,
+    "docx_paragraphs": _job_docx_paragraphs,
+    "pdf_pages": _job_pdf_pages,
+}
+
+
+def _limit_memory_windows(memory_limit):
+    """Put this process in a job object whose commit limit makes allocations past it fail."""
+    import ctypes
+    from ctypes import wintypes
+
+    class BasicLimits(ctypes.Structure):  # JOBOBJECT_BASIC_LIMIT_INFORMATION
+        _fields_ = [("PerProcessUserTimeLimit", ctypes.c_int64), ("PerJobUserTimeLimit", ctypes.c_int64),
+                    ("LimitFlags", wintypes.DWORD), ("MinimumWorkingSetSize", ctypes.c_size_t),
+                    ("MaximumWorkingSetSize", ctypes.c_size_t), ("ActiveProcessLimit", wintypes.DWORD),
+                    ("Affinity", ctypes.c_size_t), ("PriorityClass", wintypes.DWORD),
+                    ("SchedulingClass", wintypes.DWORD)]
+
+    class ExtendedLimits(ctypes.Structure):  # JOBOBJECT_EXTENDED_LIMIT_INFORMATION
+        _fields_ = [("BasicLimitInformation", BasicLimits), ("IoInfo", ctypes.c_uint64 * 6),
+                    ("ProcessMemoryLimit", ctypes.c_size_t), ("JobMemoryLimit", ctypes.c_size_t),
+                    ("PeakProcessMemoryUsed", ctypes.c_size_t), ("PeakJobMemoryUsed", ctypes.c_size_t)]
+
+    job_object_extended_limit_information = 9
+    job_object_limit_process_memory = 0x100
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    kernel32.CreateJobObjectW.argtypes = (ctypes.c_void_p, wintypes.LPCWSTR)
+    kernel32.SetInformationJobObject.argtypes = (wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, wintypes.DWORD)
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    kernel32.AssignProcessToJobObject.argtypes = (wintypes.HANDLE, wintypes.HANDLE)
+
+    job = kernel32.CreateJobObjectW(None, None)  # Left open: closing the last handle would drop the limit
+    if not job:
+        raise ctypes.WinError(ctypes.get_last_error())
+    limits = ExtendedLimits()
+    limits.BasicLimitInformation.LimitFlags = job_object_limit_process_memory
+    limits.ProcessMemoryLimit = memory_limit
+    if not kernel32.SetInformationJobObject(job, job_object_extended_limit_information,
+                                            ctypes.byref(limits), ctypes.sizeof(limits)):
+        raise ctypes.WinError(ctypes.get_last_error())
+    if not kernel32.AssignProcessToJobObject(job, kernel32.GetCurrentProcess()):
+        raise ctypes.WinError(ctypes.get_last_error())
+
+
+def limit_memory(memory_limit):
+    """Cap this process's memory, so a parser that balloons gets MemoryError instead of swapping the machine."""
+    if sys.platform == "win32":
+        _limit_memory_windows(memory_limit)
+    else:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+
+def _worker_main(connection, memory_limit):
+    """Entry point of an extraction worker process: run jobs from the pipe until it closes."""
+    if memory_limit:
+        try:
+            limit_memory(memory_limit)
+        except (ImportError, ValueError, OSError) as e:
+            print(f"[ERROR] Extraction worker runs without a memory cap, only the timeout applies: {e}")
+
+    def on_partial(payload):
+        connection.send(("partial", payload))
+
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+
+        job_name, args = message
+        try:
+            result = WORKER_JOBS[job_name](*args, on_partial)
+            connection.send(("ok", result))
+        except BaseException as e:
+            connection.send(("error", f"{type(e).__name__}: {e}"))
+            if isinstance(e, MemoryError):
+                return  # Start afresh rather than limp on after hitting the cap
+
+
+class ExtractionPool:
+    """Runs document extraction in worker processes with hard per-job limits.
+
+    A parser that hangs or balloons on a corrupt file is killed when its job
+    times out or hits the memory cap, and the worker is replaced, so one bad
+    file cannot take the app down. Each slot thread owns one worker process;
+    workers are started the first time their slot gets a job.
+    """
+
+    def __init__(self, db_path, workers=None, timeout=30.0, memory_limit=1024 * 1024 * 1024):
+        self.db_path = db_path
+        self.workers = workers or os.cpu_count() or 2
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self._jobs = queue.Queue()
+        self._slots = []
+        self._lock = threading.Lock()
+        self._context = multiprocessing.get_context("spawn")
+
+    def submit(self, job_name, *args, on_partial=None, timeout=None):
+        """Queue a job; returns a concurrent.futures.Future for its result."""
+        future = Future()
+        with self._lock:
+            if not self._slots:
+                for _ in range(self.workers):
+                    slot = threading.Thread(target=self._run_slot, daemon=True)
+                    slot.start()
+                    self._slots.append(slot)
+        self._jobs.put((future, job_name, args, on_partial, timeout or self.timeout))
+        return future
+
+    def call(self, job_name, *args, cancel_event=None, on_partial=None, timeout=None):
+        """Run a job and wait for it, giving up early if cancel_event is set.
+
+        A job abandoned this way still runs to completion (or its timeout) in
+        its worker; only its result is discarded.
+        """
+        future = self.submit(job_name, *args, on_partial=on_partial, timeout=timeout)
+        while True:
+            try:
+                return future.result(timeout=0.05)
+            except FutureTimeoutError:
+                if cancel_event is not None and cancel_event.is_set():
+                    future.cancel()
+                    raise ExtractionCancelled()
+
+    def index_files(self, file_paths):
+        """Extract many files into the text store across all workers.
+
+        Yields (file_path, characters, error) as each file finishes.
+        """
+        futures = {self.submit("index", file_path, self.db_path): file_path for file_path in file_paths}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+    def shutdown(self):
+        with self._lock:
+            for _ in self._slots:
+                self._jobs.put(None)
+            self._slots = []
+
+    def _spawn(self):
+        parent_connection, child_connection = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(child_connection, self.memory_limit), daemon=True)
+        process.start()
+        child_connection.close()
+        return process, parent_connection
+
+    @staticmethod
+    def _kill(process, connection):
+        connection.close()
+        if process.is_alive():
+            process.kill()
+        process.join(1)
+
+    def _run_slot(self):
+        process = connection = None
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            future, job_name, args, on_partial, timeout = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            if process is None or not process.is_alive():
+                if process is not None:
+                    self._kill(process, connection)
+                process, connection = self._spawn()
+
+            try:
+                connection.send((job_name, args))
+                deadline = time.monotonic() + timeout
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not connection.poll(remaining):
+                        raise ExtractionTimeout(f"Extraction timed out after {timeout:g}s: {args[0]}")
+                    status, payload = connection.recv()
+                    if status == "partial":
+                        if on_partial is not None:
+                            try:
+                                on_partial(payload)
+                            except Exception as e:
+                                print(f"[ERROR] Partial result handler failed: {e}")
+                    elif status == "ok":
+                        future.set_result(payload)
+                        break
+                    else:
+                        future.set_exception(ExtractionFailed(payload))
+                        break
+            except ExtractionTimeout as e:
+                self._kill(process, connection)
+                process = connection = None
+                future.set_exception(e)
+            except (EOFError, OSError) as e:
+                exit_code = process.exitcode if process is not None else None
+                self._kill(process, connection)
+                process = connection = None
+                future.set_exception(ExtractionFailed(f"Worker exited ({exit_code}) while extracting {args[0]}: {e}"))
+
+        if process is not None:
+            connection.send(None)
+            self._kill(process, connection)
@@ -0,0 +1,673 @@
+"""Command-line access to the lists, catalog and notes the app uses, without a display.
+
+    python organizer_cli.py import ~/Scans --list "Receipts" --mode hardlink
+    python organizer_cli.py lists --rename "Receipts" "Receipts 2025"
+    python organizer_cli.py storage auto --list "Videos"
+    python organizer_cli.py tag report.pdf --add thesis --add sources
+    python organizer_cli.py tag --query "thesis AND sources NOT archived"
+    python organizer_cli.py export --list "Receipts" --format csv --output receipts.csv
+    python organizer_cli.py search invoice --content
+    python organizer_cli.py find "modified>2025-01-01 size>10MB ext:pdf"
+    python organizer_cli.py rename "{date:%Y-%m-%d} {name}{ext}" --list "Receipts" --dry-run
+    python organizer_cli.py reindex
+    python organizer_cli.py verify --fix
+    python organizer_cli.py dedupe --list "Receipts" --remove
+
+The catalog files are read from the working directory, as the app does, and
+list copies and extracted text live next to the program. Progress goes to
+stderr; with --json every result is one JSON object per line on stdout, and
+the last line is a {"summary": ...} object. If organizer_daemon.py serves the
+catalog, list changes go through it. The exit status is 1 when
+something failed or a problem was found and left unfixed.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import organizer_core
+import organizer_daemon
+
+if getattr(sys, "frozen", False):
+    BASE_DIR = os.path.dirname(sys.executable)
+else:
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HASH_CHUNK = 1024 * 1024
+STORAGE_CHOICES = organizer_core.STORAGE_MODES + (organizer_core.AUTO_MODE,)
+
+
+class Progress:
+    """A progress line on stderr: rewritten in place on a terminal, a line every few seconds otherwise."""
+
+    def __init__(self, label, enabled=True):
+        self.label = label
+        self.enabled = enabled
+        self.interactive = sys.stderr.isatty()
+        self.interval = 0.1 if self.interactive else 5.0
+        self._last = 0.0
+        self._text = None
+
+    def update(self, done, total=None, force=False):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        text = f"{self.label}: {done}/{total}" if total else f"{self.label}: {done}"
+        if text == self._text:
+            return  # done() after a last update that already showed the same count
+        self._text = text
+        if self.interactive:
+            sys.stderr.write(f"\r{text}\033[K")
+        else:
+            sys.stderr.write(text + "\n")
+        sys.stderr.flush()
+
+    def done(self, done, total=None):
+        self.update(done, total, force=True)
+        if self.enabled and self.interactive:
+            sys.stderr.write("\n")
+
+
+class Output:
+    """Results as text lines, or as JSON lines with --json."""
+
+    def __init__(self, as_json):
+        self.as_json = as_json
+
+    def record(self, text, **fields):
+        if self.as_json:
+            print(json.dumps(fields, ensure_ascii=False))
+        else:
+            print(text)
+
+    def summary(self, **fields):
+        if self.as_json:
+            print(json.dumps({"summary": fields}, ensure_ascii=False))
+        else:
+            print(", ".join(f"{key.replace('_', ' ')}: {value}" for key, value in fields.items()))
+
+
+def make_organizer(args):
+    """The running daemon's catalog if there is one (so the app sees the changes), else the files directly."""
+    if not args.no_daemon:
+        organizer = organizer_daemon.connect(args.catalog_dir, lists_dir=args.lists_dir, workers=args.workers)
+        if organizer is not None:
+            return organizer
+    return organizer_core.Organizer(base_dir=args.catalog_dir, lists_dir=args.lists_dir, workers=args.workers)
+
+
+def selected_entries(organizer, lists, with_modes=False):
+    """Catalog entries of the named lists (all lists when none are named)."""
+    if not lists:
+        return organizer.entries(with_modes=with_modes)
+    return organizer.entries(list_ids(organizer, lists), with_modes=with_modes)
+
+
+def list_ids(organizer, names):
+    """Ids of lists given by name (or id); exits on unknown ones."""
+    ids = [organizer.list_id(name) for name in names]
+    unknown = [name for name, list_id in zip(names, ids) if list_id is None]
+    if unknown:
+        raise SystemExit(f"Unknown list: {', '.join(unknown)}")
+    return ids
+
+
+def file_stat(path):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+# --- Commands ---
+
+def cmd_import(args, out):
+    organizer = make_organizer(args)
+    progress = Progress("Scanning", not args.quiet)
+    files = []
+    for root in args.sources:
+        if os.path.isfile(root):
+            files.append(root)
+            continue
+        for path in organizer.scan([root], recursive=not args.no_recursive):
+            files.append(path)
+            progress.update(len(files))
+    progress.done(len(files))
+
+    list_id = organizer.list_id(args.list) or organizer.add_lists([args.list])[args.list.strip()]
+    mode = args.mode or organizer.storage_mode(list_id)
+    progress = Progress(f"Adding to '{args.list}' ({mode})", not args.quiet)
+    copied, failures = organizer.save_to_list(files, list_id, mode=mode, progress=progress.update)
+    progress.done(len(copied) + len(failures), len(copied) + len(failures))
+
+    for source, dest_path in copied:
+        out.record(f"added  {source} -> {dest_path}", status="added", source=source, path=dest_path,
+                   list=args.list, mode=mode)
+    for source, error in failures:
+        out.record(f"failed {source}: {error}", status="failed", source=source, error=error)
+    out.summary(found=len(files), added=len(copied), skipped=len(files) - len(copied) - len(failures),
+                failed=len(failures))
+    return 1 if failures else 0
+
+
+EXPORT_FIELDS = ["path", "list", "note", "exists", "size", "modified"]
+
+
+def cmd_export(args, out):
+    organizer = make_organizer(args)
+    entries = selected_entries(organizer, args.list)
+    notes = organizer.notes()
+    names = organizer.list_names()
+    rows = []
+    for path, section in entries:
+        stat = file_stat(path)
+        rows.append({
+            "path": path,
+            "list": names.get(section, section),
+            "note": notes.get((os.path.normpath(path), section), ""),
+            "exists": stat is not None,
+            "size": stat.st_size if stat else None,
+            "modified": stat.st_mtime if stat else None,
+        })
+
+    stream = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            writer = csv.DictWriter(stream, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+    finally:
+        if args.output:
+            stream.close()
+
+    failures = []
+    if args.copy_to:
+        jobs = [(row["path"], os.path.join(args.copy_to, row["list"], os.path.basename(row["path"])))
+                for row in rows if row["exists"]]
+        progress = Progress(f"Copying to {args.copy_to}", not args.quiet)
+        with ThreadPoolExecutor(max_workers=organizer.workers) as pool:
+            for done, (job, error) in enumerate(zip(jobs, pool.map(copy_out, jobs)), 1):
+                if error:
+                    failures.append((job[0], error))
+                progress.update(done, len(jobs))
+        progress.done(len(jobs), len(jobs))
+        for source, error in failures:
+            print(f"[ERROR] Failed to copy {source}: {error}", file=sys.stderr)
+
+    if args.output:
+        out.summary(exported=len(rows), output=args.output, copy_failures=len(failures))
+    return 1 if failures else 0
+
+
+def copy_out(job):
+    source, dest_path = job
+    try:
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        shutil.copy2(source, dest_path)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def cmd_search(args, out):
+    organizer = make_organizer(args)
+    store = text_store() if args.content else None
+    query = args.query.strip().lower()
+    matches = 0
+    notes = organizer.notes()
+    names = organizer.list_names()
+    for path, section in selected_entries(organizer, args.list):
+        note = notes.get((os.path.normpath(path), section), "")
+        where = None
+        if query in os.path.basename(path).lower():
+            where = "name"
+        elif query in note.lower():
+            where = "note"
+        elif store is not None and os.path.exists(path):
+            stored = store.get(path)
+            if stored is not None and query in stored[0].lower():
+                where = "content"
+        if where:
+            matches += 1
+            out.record(f"{names.get(section, section)}\t{path}" + (f"\t{note}" if note else ""),
+                       path=path, list=names.get(section, section), note=note, match=where)
+    if not out.as_json:
+        print(f"{matches} match(es)", file=sys.stderr)
+    else:
+        out.summary(matches=matches)
+    return 0
+
+
+def cmd_find(args, out):
+    organizer = make_organizer(args)
+    try:
+        rows = organizer.find(args.query, refresh=args.refresh)
+    except ValueError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    names = organizer.list_names()
+    lists = {}
+    for path, section in selected_entries(organizer, args.list):
+        lists.setdefault(organizer_core.same_path(path), []).append(names.get(section, section))
+    matches = 0
+    for path, size, mtime, ctime, atime, missing in rows:
+        for section in lists.get(organizer_core.same_path(path), []):
+            matches += 1
+            modified = time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime)) if mtime is not None else "missing"
+            out.record(f"{section}\t{path}\t{'' if size is None else size}\t{modified}",
+                       path=path, list=section, size=size, modified=mtime, created=ctime, accessed=atime,
+                       missing=bool(missing))
+    if not out.as_json:
+        print(f"{matches} match(es)", file=sys.stderr)
+    else:
+        out.summary(matches=matches)
+    return 0
+
+
+def text_store():
+    from extraction import ExtractedTextStore
+    return ExtractedTextStore(os.path.join(BASE_DIR, "extracted_text.db"))
+
+
+def cmd_reindex(args, out):
+    from extraction import EXTRACTORS, ExtractionPool
+
+    organizer = make_organizer(args)
+    paths = list(dict.fromkeys(path for path, _ in selected_entries(organizer, args.list)
+                               if os.path.splitext(path)[1].lower() in EXTRACTORS and os.path.exists(path)))
+    pool = ExtractionPool(os.path.join(BASE_DIR, "extracted_text.db"), workers=args.workers, timeout=args.timeout)
+    progress = Progress("Indexing", not args.quiet)
+    indexed = failed = 0
+    try:
+        for done, (path, characters, error) in enumerate(pool.index_files(paths), 1):
+            if error:
+                failed += 1
+                out.record(f"failed  {path}: {error}", status="failed", path=path, error=str(error))
+            else:
+                indexed += 1
+                if args.verbose or out.as_json:
+                    out.record(f"indexed {path} ({characters} chars)", status="indexed", path=path,
+                               characters=characters)
+            progress.update(done, len(paths))
+    finally:
+        pool.shutdown()
+    progress.done(len(paths), len(paths))
+
+    pruned = text_store().prune() if args.prune else 0
+    out.summary(documents=len(paths), indexed=indexed, failed=failed, pruned=pruned)
+    return 1 if failed else 0
+
+
+def cmd_verify(args, out):
+    organizer = make_organizer(args)
+    lists = organizer.lists()
+    sections = {list_id for list_id, _, _ in lists}
+    names = {list_id: name for list_id, name, _ in lists}
+    entries = organizer.entries()
+    problems = []
+
+    seen = set()
+    missing = []
+    progress = Progress("Checking entries", not args.quiet)
+    for done, (path, section) in enumerate(entries, 1):
+        key = (organizer_core.same_path(path), section)
+        if key in seen:
+            problems.append(("duplicate_entry", path, section))
+        seen.add(key)
+        if section not in sections:
+            problems.append(("unknown_list", path, section))
+        if not os.path.exists(path):
+            missing.append((path, section))
+            problems.append(("missing_file", path, section))
+        progress.update(done, len(entries))
+    progress.done(len(entries), len(entries))
+
+    stale_notes = [key for key in organizer.notes() if (organizer_core.same_path(key[0]), key[1]) not in seen]
+    problems.extend(("orphan_note", path, section) for path, section in stale_notes)
+
+    referenced = {organizer_core.same_path(path) for path, _ in entries}
+    for section, _, folder in lists:
+        folder = os.path.join(organizer.lists_dir, folder)
+        if os.path.isdir(folder):
+            for path in organizer_core.scan_directory(folder, limit=None):
+                if organizer_core.same_path(path) not in referenced:
+                    problems.append(("unlisted_copy", path, section))
+
+    # Folders of list removals that were interrupted before their files were deleted
+    leftovers = []
+    if os.path.isdir(organizer.lists_dir):
+        leftovers = [entry.path for entry in os.scandir(organizer.lists_dir)
+                     if entry.is_dir() and entry.name.startswith(organizer_core.REMOVING_PREFIX)]
+    problems.extend(("removed_list_files", path, "") for path in leftovers)
+
+    for kind, path, section in problems:
+        out.record(f"{kind:<18} {names.get(section, section)}\t{path}", problem=kind, path=path,
+                   list=names.get(section, section))
+
+    fixed = 0
+    if args.fix:
+        if missing:
+            fixed += organizer.remove(missing)  # Their notes go too
+        with organizer_core.CATALOG_LOCK:
+            catalog = organizer_core.read_catalog_entries(organizer.catalog_file)
+            unique = {}
+            for entry in catalog:
+                unique.setdefault((organizer_core.same_path(entry[0]), entry[1]), entry)
+            if len(unique) != len(catalog):
+                organizer_core.write_lines_atomically(
+                    organizer.catalog_file, [organizer_core.catalog_line(*entry) for entry in unique.values()])
+                fixed += len(catalog) - len(unique)
+        if stale_notes:
+            organizer.set_notes({key: "" for key in stale_notes})
+            fixed += len(stale_notes)
+        for folder in leftovers:
+            organizer._delete_tree(folder)
+            fixed += 1
+
+    counts = {}
+    for kind, _, _ in problems:
+        counts[kind] = counts.get(kind, 0) + 1
+    out.summary(entries=len(entries), problems=len(problems), fixed=fixed, **counts)
+    unfixable = sum(count for kind, count in counts.items() if kind in ("unknown_list", "unlisted_copy"))
+    return 0 if not problems or (args.fix and not unfixable) else 1
+
+
+def file_digest(path):
+    digest = hashlib.blake2b(digest_size=20)
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def cmd_dedupe(args, out):
+    organizer = make_organizer(args)
+    entries = selected_entries(organizer, args.list, with_modes=True)
+
+    # Only files that share a size can be identical, so most files are never read
+    by_size = {}
+    for path, section, mode in entries:
+        stat = file_stat(path)
+        if stat is not None and stat.st_size >= args.min_size:
+            by_size.setdefault(stat.st_size, []).append((path, section, mode))
+    candidates = [entry for group in by_size.values() if len(group) > 1 for entry in group]
+    unique_paths = list(dict.fromkeys(organizer_core.same_path(path) for path, _, _ in candidates))
+
+    progress = Progress("Hashing", not args.quiet)
+    digests = {}
+    with ThreadPoolExecutor(max_workers=organizer.workers) as pool:
+        for done, (path, digest) in enumerate(zip(unique_paths, pool.map(file_digest, unique_paths)), 1):
+            digests[path] = digest
+            progress.update(done, len(unique_paths))
+    progress.done(len(unique_paths), len(unique_paths))
+
+    groups = {}
+    for path, section, mode in candidates:
+        digest = digests.get(organizer_core.same_path(path))
+        if digest:
+            groups.setdefault(digest, []).append((path, section, mode))
+    groups = {digest: group for digest, group in groups.items() if len(group) > 1}
+
+    redundant = []
+    wasted = 0
+    names = organizer.list_names()
+    for digest, group in groups.items():
+        size = file_stat(group[0][0]).st_size
+        # Links and references share their original's bytes: they are listed but never counted or removed
+        copies = [(path, section) for path, section, mode in group if mode == "copy"]
+        wasted += size * max(len(copies) - 1, 0)
+        out.record(f"{digest[:12]}  {size} bytes  x{len(group)}\n" +
+                   "\n".join(f"    {names.get(section, section)}\t{path}" + ("" if mode == "copy" else f"\t({mode})")
+                             for path, section, mode in group),
+                   digest=digest, size=size,
+                   entries=[{"path": path, "list": names.get(section, section), "mode": mode}
+                            for path, section, mode in group])
+        # Within one list only the first copy is kept
+        kept_lists = set()
+        for path, section in copies:
+            if section in kept_lists:
+                redundant.append((path, section))
+            kept_lists.add(section)
+
+    removed = organizer.remove(redundant, delete_copies=args.delete_copies) if args.remove and redundant else 0
+    out.summary(groups=len(groups), duplicate_bytes=wasted, redundant_in_list=len(redundant), removed=removed)
+    return 0
+
+
+def add_common_options(parser, defaults=True):
+    """Options accepted both before and after the command name."""
+    default = (lambda value: value) if defaults else (lambda value: argparse.SUPPRESS)
+    parser.add_argument("--catalog-dir", default=default("."),
+                        help="folder holding saved_files_all.txt, notes.txt, sections.txt (default: working directory)")
+    parser.add_argument("--lists-dir", default=default(os.path.join(BASE_DIR, "lists")),
+                        help="folder of list copies")
+    parser.add_argument("--workers", type=int, default=default(None),
+                        help="parallel workers (default: depends on CPU count)")
+    parser.add_argument("--json", action="store_true", default=default(False),
+                        help="one JSON object per line on stdout")
+    parser.add_argument("-q", "--quiet", action="store_true", default=default(False), help="no progress on stderr")
+    parser.add_argument("--no-daemon", action="store_true", default=default(False),
+                        help="work on the catalog files even if organizer_daemon.py is running")
+
+
+def cmd_storage(args, out):
+    organizer = make_organizer(args)
+    if args.mode or args.clear:
+        organizer.set_storage_mode(list_ids(organizer, [args.list])[0] if args.list else None,
+                                   None if args.clear else args.mode)
+    modes = organizer.storage_modes()
+    default = modes.pop(organizer.DEFAULT_STORAGE_KEY, "copy")
+    out.record(f"(default)\t{default}", list=None, mode=default)
+    for list_id, name, _ in organizer.lists():
+        mode = modes.get(list_id)
+        out.record(f"{name}\t{mode or default}" + ("" if mode else " (default)"), list=name, mode=mode or default,
+                   inherited=not mode)
+    return 0
+
+
+def cmd_lists(args, out):
+    organizer = make_organizer(args)
+    if args.rename:
+        old_name, new_name = args.rename
+        try:
+            organizer.rename_list(list_ids(organizer, [old_name])[0], new_name)
+        except ValueError as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            return 1
+    if args.remove:
+        list_id = list_ids(organizer, [args.remove])[0]
+        progress = Progress(f"Deleting the files of '{args.remove}'", not args.quiet)
+        removed, deleted, failures = organizer.remove_list(list_id, delete_files=not args.keep_files,
+                                                           progress=progress.update)
+        progress.done(deleted + len(failures), deleted + len(failures))
+        for path, error in failures:
+            out.record(f"failed {path}: {error}", status="failed", path=path, error=error)
+        out.summary(removed_entries=removed, deleted_files=deleted, failed=len(failures))
+        return 1 if failures else 0
+    counts = {}
+    for _, section in organizer.entries():
+        counts[section] = counts.get(section, 0) + 1
+    for list_id, name, folder in organizer.lists():
+        out.record(f"{name}\t{counts.get(list_id, 0)} entries\tlists/{folder}", id=list_id, name=name,
+                   folder=os.path.join(organizer.lists_dir, folder), entries=counts.get(list_id, 0))
+    return 0
+
+
+def cmd_rename(args, out):
+    import batch_rename
+    organizer = make_organizer(args)
+    if not args.list and not args.file:
+        print("[ERROR] Give the files to rename with --list or --file", file=sys.stderr)
+        return 1
+    names = organizer.list_names()
+    lists = {}
+    for path, section in selected_entries(organizer, args.list) if args.list else []:
+        lists.setdefault(path, names.get(section, section))
+    for path in args.file or []:
+        lists.setdefault(os.path.abspath(path), "")
+    try:
+        planned = batch_rename.plan(list(lists), args.pattern, args.find or "", args.replace, args.regex,
+                                    args.start, args.step, lists)
+    except batch_rename.RenamePatternError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+
+    renames = [(old, new, None) for old, new, problem in planned if problem is None]
+    blocked = [(old, new, problem) for old, new, problem in planned
+               if problem is not None and problem != batch_rename.UNCHANGED]
+    failures = []
+    if not args.dry_run and renames:
+        done, failures = organizer.rename(renames)  # One catalog commit for the whole batch
+        renames = [(old, new, None) for old, new in done]
+    for old, new, _ in renames:
+        out.record(f"{old}\t->\t{os.path.basename(new)}", path=old, new_path=new, renamed=not args.dry_run)
+    for old, new, problem in blocked:
+        out.record(f"[SKIPPED] {old}\t{os.path.basename(new)}: {problem}", path=old, new_path=new, error=problem)
+    for old, error in failures:
+        out.record(f"[ERROR] {old}\t{error}", path=old, error=error)
+    out.summary(**{"would_rename" if args.dry_run else "renamed": len(renames),
+                   "unchanged": len(planned) - len(renames) - len(blocked) - len(failures),
+                   "skipped": len(blocked), "failed": len(failures)})
+    return 1 if blocked or failures else 0
+
+
+def cmd_tag(args, out):
+    organizer = make_organizer(args)
+    paths = [os.path.abspath(path) for path in args.paths]
+    if (args.add or args.remove) and not paths:
+        print("[ERROR] Give the files to tag", file=sys.stderr)
+        return 1
+    if args.add:
+        organizer.tag(paths, args.add)
+    if args.remove:
+        organizer.untag(paths, args.remove)
+    if args.query:
+        try:
+            matches = organizer.tag_query(args.query)
+        except ValueError as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            return 1
+        for path in matches:
+            out.record(path, path=path)
+        out.summary(matches=len(matches))
+    elif paths:
+        for path, tags in organizer.tags_of(paths).items():
+            out.record(f"{path}\t{', '.join(tags)}", path=path, tags=tags)
+    else:
+        for tag, count in organizer.tags().items():
+            out.record(f"{tag}\t{count}", tag=tag, files=count)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_options(parser)
+    common = argparse.ArgumentParser(add_help=False)
+    add_common_options(common, defaults=False)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("import", parents=[common], help="add the files of folders to a list")
+    command.add_argument("sources", nargs="+", help="files or folders")
+    command.add_argument("--list", required=True, help="list to add to (created if missing)")
+    command.add_argument("--mode", choices=STORAGE_CHOICES,
+                         help="how the list holds the files (default: the list's storage mode)")
+    command.add_argument("--no-recursive", action="store_true", help="only files directly in the folders")
+    command.set_defaults(handler=cmd_import)
+
+    command = commands.add_parser("lists", parents=[common], help="show, rename or remove lists")
+    command.add_argument("--rename", nargs=2, metavar=("NAME", "NEW_NAME"),
+                         help="rename a list (its entries, notes and folder stay as they are)")
+    command.add_argument("--remove", metavar="NAME", help="remove a list with its entries, notes and folder")
+    command.add_argument("--keep-files", action="store_true", help="with --remove, leave the list's folder on disk")
+    command.set_defaults(handler=cmd_lists)
+
+    command = commands.add_parser("storage", parents=[common],
+                                  help="show or set how lists hold their files (copies, clones, links, references)")
+    command.add_argument("mode", nargs="?", choices=STORAGE_CHOICES)
+    command.add_argument("--list", help="list to set (default: the default for lists without their own)")
+    command.add_argument("--clear", action="store_true", help="make the list use the default again")
+    command.set_defaults(handler=cmd_storage)
+
+    command = commands.add_parser("tag", parents=[common],
+                                  help="tag files, show their tags or find files by a tag query")
+    command.add_argument("paths", nargs="*", help="files to tag or show (default: list all tags with counts)")
+    command.add_argument("--add", action="append", metavar="TAG", help="tag to add (repeatable)")
+    command.add_argument("--remove", action="append", metavar="TAG", help="tag to remove (repeatable)")
+    command.add_argument("--query", metavar="EXPR", help='print the files matching e.g. "thesis AND sources NOT archived"')
+    command.set_defaults(handler=cmd_tag)
+
+    command = commands.add_parser("rename", parents=[common],
+                                  help="rename files from a pattern, updating the catalog once for the batch")
+    command.add_argument("pattern", help="new name, e.g. \"{date:%%Y-%%m-%%d}_{name}{ext}\" or \"Scan {n:3}{ext}\"")
+    command.add_argument("--list", action="append", help="rename the files of this list (repeatable)")
+    command.add_argument("--file", action="append", help="rename this file (repeatable)")
+    command.add_argument("--find", help="text to replace in the old name first")
+    command.add_argument("--replace", default="", help="replacement for --find")
+    command.add_argument("--regex", action="store_true", help="--find is a regular expression (\\1 in --replace for groups)")
+    command.add_argument("--start", type=int, default=1, help="first value of {n}")
+    command.add_argument("--step", type=int, default=1, help="increment of {n}")
+    command.add_argument("--dry-run", action="store_true", help="only show the new names")
+    command.set_defaults(handler=cmd_rename)
+
+    command = commands.add_parser("export", parents=[common], help="write list entries with notes as JSON lines or CSV")
+    command.add_argument("--list", action="append", help="list to export (repeatable; default: all)")
+    command.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    command.add_argument("--output", help="file to write (default: stdout)")
+    command.add_argument("--copy-to", help="also copy the files into <folder>/<list>/")
+    command.set_defaults(handler=cmd_export)
+
+    command = commands.add_parser("search", parents=[common], help="find entries by file name, note or extracted text")
+    command.add_argument("query")
+    command.add_argument("--list", action="append", help="list to search (repeatable; default: all)")
+    command.add_argument("--content", action="store_true", help="also search text indexed by 'reindex'")
+    command.set_defaults(handler=cmd_search)
+
+    command = commands.add_parser("find", parents=[common], help="find entries by size, dates, type or missing files")
+    command.add_argument("query", help='e.g. "modified>2025-01-01 size>10MB ext:pdf sort:-size" or "missing:true"')
+    command.add_argument("--list", action="append", help="list to search (repeatable; default: all)")
+    command.add_argument("--refresh", action="store_true",
+                         help="re-read sizes and dates from disk (by default only after the catalog changed)")
+    command.set_defaults(handler=cmd_find)
+
+    command = commands.add_parser("reindex", parents=[common], help="extract .docx/.pdf text of list entries into the text store")
+    command.add_argument("--list", action="append", help="list to index (repeatable; default: all)")
+    command.add_argument("--timeout", type=float, default=60.0, help="seconds allowed per document")
+    command.add_argument("--prune", action="store_true", help="drop stored text of files that no longer exist")
+    command.add_argument("-v", "--verbose", action="store_true", help="print every indexed file")
+    command.set_defaults(handler=cmd_reindex)
+
+    command = commands.add_parser("verify", parents=[common], help="check the catalog against the disk")
+    command.add_argument("--fix", action="store_true",
+                         help="drop entries of missing files, duplicate lines and notes without an entry, and finish interrupted list removals")
+    command.set_defaults(handler=cmd_verify)
+
+    command = commands.add_parser("dedupe", parents=[common], help="find entries with identical content")
+    command.add_argument("--list", action="append", help="list to check (repeatable; default: all)")
+    command.add_argument("--min-size", type=int, default=1, help="ignore files smaller than this many bytes")
+    command.add_argument("--remove", action="store_true", help="keep one entry per list for each duplicate group")
+    command.add_argument("--delete-copies", action="store_true", help="with --remove, delete the removed copies")
+    command.set_defaults(handler=cmd_dedupe)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args, Output(args.json))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
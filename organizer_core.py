@@ -0,0 +1,950 @@
+import errno
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+CATALOG_LOCK = threading.Lock()  # Serializes catalog file writes across UI and worker threads
+
+MAX_LISTED_FILES = 700  # Files loaded per directory listing
+DATE_FIELDS = {"modified": 0, "created": 1, "accessed": 2}
+
+# How a list holds a file: its own copy, a copy-on-write clone, a link, or just the original's path
+STORAGE_MODES = ("copy", "reflink", "hardlink", "symlink", "reference")
+AUTO_MODE = "auto"  # The cheapest of reflink, hardlink, symlink, reference that works for the file
+FICLONE = 0x40049409  # Linux ioctl that clones a file's extents (Btrfs, XFS, bcachefs...)
+MOVE_CHUNK = 8 * 1024 * 1024  # Buffer for moves that have to copy across filesystems
+REMOVING_PREFIX = ".removing-"  # Folder of a removed list while its files are deleted
+
+
+def scan_directory(path, limit=MAX_LISTED_FILES, span=None):
+    """Paths of the regular files directly inside path, at most limit of them.
+
+    span, if given, gets an "entries" count of every directory entry looked at.
+    """
+    files = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if span is not None:
+                span.add("entries")
+            if entry.is_file():
+                files.append(entry.path)
+                if limit and len(files) >= limit:
+                    break
+    return files
+
+
+def file_date(file_path, date_type, stats=None):
+    """The modified/created/accessed time of a file; 0 if it cannot be read.
+
+    stats maps paths to known (mtime, ctime, atime) and is used before the disk.
+    """
+    times = stats.get(file_path) if stats else None
+    if times:
+        return times[DATE_FIELDS.get(date_type, 0)]
+    try:
+        if date_type == "created":
+            return os.path.getctime(file_path)
+        elif date_type == "accessed":
+            return os.path.getatime(file_path)
+        return os.path.getmtime(file_path)
+    except Exception:
+        return 0
+
+
+def sort_by_date(paths, date_type, stats=None):
+    """Sort paths in place, newest first."""
+    paths.sort(key=lambda f: file_date(f, date_type, stats), reverse=True)
+    return paths
+
+
+def filter_paths(paths, query):
+    """Paths whose file name contains query, case-insensitively (the search box rule)."""
+    query = query.strip().lower()
+    if not query:
+        return list(paths)
+    return [path for path in paths if query in os.path.basename(path).lower()]
+
+
+def catalog_line(file_path, section_name, mode="copy"):
+    """One catalog line; the storage mode is only written for entries that are not plain copies."""
+    if mode and mode != "copy":
+        return f"{file_path}|||{section_name}|||{mode}\n"
+    return f"{file_path}|||{section_name}\n"
+
+
+def parse_catalog_line(line):
+    """(path, section, storage mode) of a catalog line, or None if it is not one."""
+    if "|||" not in line:
+        return None
+    fields = line.strip().split("|||")
+    mode = fields[2] if len(fields) > 2 and fields[2] in STORAGE_MODES else "copy"
+    return fields[0].strip(), fields[1], mode
+
+
+def read_catalog_entries(catalog_file):
+    """All (path, section, storage mode) entries of the catalog, in file order."""
+    entries = []
+    if os.path.exists(catalog_file):
+        with open(catalog_file, "r", encoding="utf-8") as file:
+            for line in file:
+                entry = parse_catalog_line(line)
+                if entry:
+                    entries.append(entry)
+    return entries
+
+
+def read_catalog(catalog_file):
+    """All (path, section) entries of the saved files catalog, in file order."""
+    return [(file_path, section) for file_path, section, _ in read_catalog_entries(catalog_file)]
+
+
+def section_entries(catalog_file, section_names, with_modes=False):
+    """Catalog entries of the given sections, grouped in section order.
+
+    Entries are (path, section), or (path, section, storage mode) with with_modes.
+    """
+    by_section = {name: [] for name in section_names}
+    for file_path, section, mode in read_catalog_entries(catalog_file):
+        if section in by_section:
+            by_section[section].append((file_path, mode))
+    if with_modes:
+        return [(file_path, name, mode) for name in section_names for file_path, mode in by_section[name]]
+    return [(file_path, name) for name in section_names for file_path, _ in by_section[name]]
+
+
+def list_line(list_id, name, folder):
+    return f"{list_id}|||{name}|||{folder}\n"
+
+
+def parse_list_line(line):
+    """(id, name, folder) of a sections.txt line, or None for a blank one.
+
+    Lines from before lists had ids hold just the name, which then serves as
+    id and folder too, so the catalog and folders written back then still match.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if "|||" not in line:
+        return line, line, line
+    fields = line.split("|||")
+    list_id, name = fields[0], fields[1]
+    return list_id, name, fields[2] if len(fields) > 2 and fields[2] else list_id
+
+
+def read_lists(sections_file):
+    """All (id, name, folder) lists, in order, and whether any line still has the old format."""
+    lists, legacy = [], False
+    if os.path.exists(sections_file):
+        with open(sections_file, "r", encoding="utf-8") as file:
+            for line in file:
+                entry = parse_list_line(line)
+                if entry:
+                    lists.append(entry)
+                    legacy = legacy or "|||" not in line
+    return lists, legacy
+
+
+def stage_lines(path, lines, suffix=".tmp", sync=False):
+    """Write lines to a new temporary file next to path, with path's mode; returns its name.
+
+    Each call gets its own name, so writers in other threads or processes
+    never share (or replace each other's) half-written temporaries.
+    """
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=suffix,
+                                     dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.writelines(lines)
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+        try:
+            shutil.copymode(path, temp_path)
+        except FileNotFoundError:
+            os.chmod(temp_path, 0o644)  # mkstemp leaves new files readable by the owner only
+    except BaseException:
+        remove_quietly(temp_path)
+        raise
+    return temp_path
+
+
+def remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def write_lines_atomically(path, lines):
+    """Replace a file's contents in one step, so readers never see a half-written file."""
+    temp_path = stage_lines(path, lines)
+    try:
+        os.replace(temp_path, path)
+    except BaseException:
+        remove_quietly(temp_path)
+        raise
+
+
+def commit_files(journal_path, contents):
+    """Replace several files together: after a crash either none or all of them change.
+
+    contents maps paths to their new lines. Each is written to a side file
+    of its own first; the journal naming them is the commit point, and
+    recover_journal() finishes replacing the files if the process dies
+    after writing it.
+    """
+    staged = []
+    try:
+        for path, lines in contents.items():
+            staged.append([stage_lines(path, lines, ".commit", sync=True), path])
+        journal_temp = stage_lines(journal_path, [json.dumps(staged)], sync=True)
+        os.replace(journal_temp, journal_path)
+    except BaseException:
+        for temp_path, _ in staged:
+            remove_quietly(temp_path)
+        raise
+    finish_commit(journal_path, staged)
+
+
+def recover_journal(journal_path):
+    """Finish a commit_files() whose journal was written; returns the number of files replaced."""
+    try:
+        with open(journal_path, "r", encoding="utf-8") as file:
+            staged = json.load(file)
+    except FileNotFoundError:
+        return 0
+    except ValueError:
+        staged = []  # Torn journals are never renamed into place; nothing to replay
+    return finish_commit(journal_path, staged)
+
+
+def finish_commit(journal_path, staged):
+    """Move the staged [temp path, path] pairs into place, then drop the journal; returns the files replaced."""
+    replaced = 0
+    for temp_path, path in staged:
+        try:
+            os.replace(temp_path, path)
+            replaced += 1
+        except FileNotFoundError:
+            pass  # Already replaced before the crash
+    try:
+        os.remove(journal_path)
+    except FileNotFoundError:
+        pass
+    return replaced
+
+
+def append_catalog(catalog_file, entries):
+    """Append (path, section) or (path, section, storage mode) entries to the catalog in one write."""
+    with CATALOG_LOCK, open(catalog_file, "a", encoding="utf-8") as file:
+        file.writelines(catalog_line(*entry) for entry in entries)
+
+
+def retarget_symlinks(entries, moved):
+    """Point symlink entries at the new path of the file they link to.
+
+    entries are (path, section, storage mode); moved maps same_path(old
+    path) to the new path. Returns the number of links changed.
+    """
+    retargeted = 0
+    for path, _, mode in entries:
+        if mode != "symlink":
+            continue
+        try:
+            target = os.readlink(path)
+        except OSError:
+            continue
+        new_target = moved.get(same_path(os.path.join(os.path.dirname(path), target)))
+        if new_target is None:
+            continue
+        temp_path = path + ".relink"
+        try:
+            if os.path.lexists(temp_path):
+                os.remove(temp_path)
+            os.symlink(os.path.abspath(new_target), temp_path)
+            os.replace(temp_path, path)  # The link is never missing, only swapped
+            retargeted += 1
+        except OSError as e:
+            print(f"[ERROR] Could not point {path} at {new_target}: {e}")
+    return retargeted
+
+
+def unique_list_path(section_folder, base_name, planned=(), stamp=None):
+    """A free path for base_name in a list folder; taken names get a timestamp suffix.
+
+    planned holds paths already promised to other files of the same batch.
+    """
+    stamp = stamp or int(time.time())
+    dest_path = os.path.join(section_folder, base_name)
+    counter = 1
+    while dest_path in planned or os.path.lexists(dest_path):
+        name, ext = os.path.splitext(base_name)
+        suffix = f"{stamp}" if counter == 1 else f"{stamp}_{counter}"
+        dest_path = os.path.join(section_folder, f"{name}_{suffix}{ext}")
+        counter += 1
+    return dest_path
+
+
+def move_file(source, dest_path):
+    """Move a file: a rename within one filesystem, else a streamed copy and then a delete.
+
+    A cross-device copy is written under a temporary name and renamed into
+    place, so an interrupted move never leaves a partial file at dest_path,
+    and the source is only deleted once the copy is complete. Returns the
+    number of bytes copied (0 for a rename).
+    """
+    try:
+        os.rename(source, dest_path)
+        return 0
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    temp_path = dest_path + ".part"
+    try:
+        with open(source, "rb") as src, open(temp_path, "wb") as dest:
+            shutil.copyfileobj(src, dest, MOVE_CHUNK)
+        shutil.copystat(source, temp_path)
+        os.replace(temp_path, dest_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    os.remove(source)
+    return os.path.getsize(dest_path)
+
+
+def reflink(source, dest_path):
+    """Clone source copy-on-write: instant, and no space used until either file changes.
+
+    Raises OSError where the filesystem (or platform) cannot clone.
+    """
+    if sys.platform == "darwin":
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(source), os.fsencode(dest_path), 0) != 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), dest_path)
+        return
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform", dest_path)
+    import fcntl
+    with open(source, "rb") as src, open(dest_path, "xb") as dest:
+        try:
+            fcntl.ioctl(dest.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dest.close()
+            os.remove(dest_path)
+            raise
+    shutil.copystat(source, dest_path)
+
+
+def place_file(source, dest_path, mode="copy"):
+    """Make dest_path hold source as mode says; returns (catalog path, mode used).
+
+    AUTO_MODE tries a reflink, then a hardlink (same device only), then a
+    symlink, and finally records the original path itself. "reference"
+    places nothing and returns the original path.
+    """
+    if mode == AUTO_MODE:
+        for candidate in ("reflink", "hardlink", "symlink"):
+            try:
+                return place_file(source, dest_path, candidate)
+            except OSError:
+                continue
+        return os.path.abspath(source), "reference"
+    if mode == "reference":
+        return os.path.abspath(source), mode
+    if mode == "reflink":
+        reflink(source, dest_path)
+    elif mode == "hardlink":
+        os.link(source, dest_path)
+    elif mode == "symlink":
+        os.symlink(os.path.abspath(source), dest_path)
+    elif mode == "copy":
+        shutil.copy2(source, dest_path)  # Preserve metadata
+    else:
+        raise ValueError(f"Unknown storage mode: {mode}")
+    return dest_path, mode
+
+
+def load_notes(notes_file):
+    """Notes keyed by (normalized path, section)."""
+    notes = {}
+    if os.path.exists(notes_file):
+        with open(notes_file, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    file_path, section, note = line.split("|||", 2)
+                    notes[(os.path.normpath(file_path.strip()), section.strip())] = note.strip()
+                except ValueError:
+                    print(f"[Invalid note line]: {line}")
+    return notes
+
+
+def save_notes(notes_file, notes):
+    """Rewrite the notes file atomically; callers changing notes hold CATALOG_LOCK around the read too."""
+    write_lines_atomically(notes_file, note_lines(notes))
+
+
+def note_lines(notes):
+    return [f"{file_path}|||{section}|||{note}\n" for (file_path, section), note in notes.items()]
+
+
+def same_path(path):
+    """Comparison key the catalog uses for paths."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+class Organizer:
+    """Batch API over the same folders, lists and notes files the app uses.
+
+    Each call takes many items and touches each catalog file once: it is read
+    once, changed in memory and written back atomically. Copies and folder
+    listings run on a thread pool. Nothing here needs Qt, so organization jobs
+    over hundreds of thousands of files can run from scripts.
+    """
+    DEFAULT_WORKERS = min(16, (os.cpu_count() or 2) * 2)
+    DEFAULT_STORAGE_KEY = "*"  # Line of the storage file that sets the mode for lists without their own
+
+    def __init__(self, base_dir=".", catalog_file="saved_files_all.txt", notes_file="notes.txt",
+                 sections_file="sections.txt", lists_dir=None, workers=None, storage_file="list_storage.txt",
+                 tags_file="tags.txt", index_file="catalog_index.db", journal_file="catalog.journal"):
+        self.catalog_file = os.path.join(base_dir, catalog_file)
+        self.notes_file = os.path.join(base_dir, notes_file)
+        self.sections_file = os.path.join(base_dir, sections_file)
+        self.storage_file = os.path.join(base_dir, storage_file)
+        self.tags_file = os.path.join(base_dir, tags_file)
+        self._tag_index = None
+        self._tag_signature = None
+        self._tag_lock = threading.RLock()
+        self.index_file = os.path.join(base_dir, index_file)
+        self._catalog_index = None
+        self.lists_dir = lists_dir or os.path.join(base_dir, "lists")
+        self.workers = workers or self.DEFAULT_WORKERS
+        self.journal_file = os.path.join(base_dir, journal_file)
+        with CATALOG_LOCK:
+            if recover_journal(self.journal_file):
+                print(f"[INFO] Finished an interrupted catalog update from {self.journal_file}")
+
+    # --- Folders ---
+
+    def scan(self, roots, recursive=True, limit=None):
+        """Yield the files under roots; each level of folders is listed in parallel."""
+        pending = list(roots)
+        produced = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while pending:
+                next_level = []
+                for files, folders in pool.map(self._list_folder, pending):
+                    for path in files:
+                        yield path
+                        produced += 1
+                        if limit and produced >= limit:
+                            return
+                    next_level.extend(folders)
+                pending = next_level if recursive else []
+
+    @staticmethod
+    def _list_folder(path):
+        files, folders = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        folders.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry.path)
+        except OSError as e:
+            print(f"[ERROR] Could not list {path}: {e}")
+        return files, folders
+
+    # --- Lists ---
+
+    def lists(self):
+        """(id, name, folder) of every list, in order; an old name-per-line sections file is migrated."""
+        lists, legacy = read_lists(self.sections_file)
+        if legacy:
+            with CATALOG_LOCK:
+                lists, legacy = read_lists(self.sections_file)
+                if legacy:
+                    write_lines_atomically(self.sections_file, [list_line(*entry) for entry in lists])
+        return lists
+
+    def sections(self):
+        """Ids of the lists, in order: what catalog entries, notes and storage modes are keyed by."""
+        return [list_id for list_id, _, _ in self.lists()]
+
+    def list_names(self):
+        return {list_id: name for list_id, name, _ in self.lists()}
+
+    def list_id(self, name):
+        """Id of the list called name (an id is accepted too), or None."""
+        lists = self.lists()
+        for list_id, list_name, _ in lists:
+            if list_name == name:
+                return list_id
+        return name if any(list_id == name for list_id, _, _ in lists) else None
+
+    def list_folder(self, list_id):
+        """Folder holding a list's copies (lists/<folder>/)."""
+        for known_id, _, folder in self.lists():
+            if known_id == list_id:
+                return os.path.join(self.lists_dir, folder)
+        return os.path.join(self.lists_dir, list_id)
+
+    @staticmethod
+    def _check_list_name(name):
+        if not name or "|||" in name or "\n" in name:
+            raise ValueError(f"Not a valid list name: {name!r}")
+
+    def add_lists(self, names):
+        """Create the lists named that do not exist yet; returns {name: id} for all of them.
+
+        New lists get a fresh id and a folder named after the list (made
+        unique), so renaming them later never touches the catalog.
+        """
+        result = {}
+        with CATALOG_LOCK:
+            lists, _ = read_lists(self.sections_file)
+            ids = {name: list_id for list_id, name, _ in lists}
+            folders = {same_path(os.path.join(self.lists_dir, folder)) for _, _, folder in lists}
+            added = []
+            for name in dict.fromkeys(name.strip() for name in names):
+                self._check_list_name(name)
+                if name not in ids:
+                    list_id = uuid.uuid4().hex[:8]
+                    folder = name
+                    while same_path(os.path.join(self.lists_dir, folder)) in folders or (
+                            os.path.exists(os.path.join(self.lists_dir, folder))):
+                        folder = f"{name} ({uuid.uuid4().hex[:4]})"
+                    folders.add(same_path(os.path.join(self.lists_dir, folder)))
+                    ids[name] = list_id
+                    added.append((list_id, name, folder))
+                result[name] = ids[name]
+            if added:
+                write_lines_atomically(self.sections_file, [list_line(*entry) for entry in lists + added])
+        return result
+
+    def _ensure_lists(self, list_ids):
+        """Register ids the catalog uses but sections.txt lacks, named after themselves (as before ids)."""
+        with CATALOG_LOCK:
+            lists, _ = read_lists(self.sections_file)
+            known = {list_id for list_id, _, _ in lists}
+            missing = [list_id for list_id in dict.fromkeys(list_ids) if list_id not in known]
+            if missing:
+                write_lines_atomically(self.sections_file, [list_line(*entry) for entry in lists] +
+                                       [list_line(list_id, list_id, list_id) for list_id in missing])
+
+    def rename_list(self, list_id, new_name):
+        """Give a list a new name: one sections.txt line changes, its entries, notes and folder stay."""
+        new_name = new_name.strip()
+        self._check_list_name(new_name)
+        with CATALOG_LOCK:
+            lists, _ = read_lists(self.sections_file)
+            if any(name == new_name and known_id != list_id for known_id, name, _ in lists):
+                raise ValueError(f"The list '{new_name}' already exists")
+            if not any(known_id == list_id for known_id, _, _ in lists):
+                raise ValueError(f"No list with id {list_id!r}")
+            write_lines_atomically(self.sections_file, [
+                list_line(known_id, new_name if known_id == list_id else name, folder)
+                for known_id, name, folder in lists])
+
+    def remove_list(self, list_id, delete_files=True, progress=None, stop_event=None):
+        """Remove a list with its entries, notes and storage mode; with delete_files, its folder too.
+
+        The list leaves the catalog first, in one step per file, with its
+        folder renamed aside; the files are deleted afterwards, with progress
+        called as (done, total). Originals of references are never touched.
+        Setting stop_event leaves the rest of the files for 'organizer_cli.py
+        verify --fix'. Returns (entries removed, files deleted, [(path, error), ...]).
+        """
+        removed, trash = self.detach_list(list_id, delete_files)
+        deleted, failures = self._delete_tree(trash, progress, stop_event) if trash else (0, [])
+        return removed, deleted, failures
+
+    def detach_list(self, list_id, move_folder=True):
+        """Take a list out of the catalog files, the first half of remove_list.
+
+        With move_folder its folder is renamed aside, for the caller to delete.
+        Returns (entries removed, folder left to delete or None).
+        """
+        folder = self.list_folder(list_id)
+        trash = None
+        with CATALOG_LOCK:
+            if move_folder and os.path.isdir(folder):
+                trash = os.path.join(self.lists_dir, f"{REMOVING_PREFIX}{list_id}-{int(time.time())}")
+                os.rename(folder, trash)  # Atomic: the list's files are gone from lists/ at once
+            lists, _ = read_lists(self.sections_file)
+            write_lines_atomically(self.sections_file, [list_line(*entry) for entry in lists if entry[0] != list_id])
+            catalog = read_catalog_entries(self.catalog_file)
+            kept = [entry for entry in catalog if entry[1] != list_id]
+            if len(kept) != len(catalog):
+                write_lines_atomically(self.catalog_file, [catalog_line(*entry) for entry in kept])
+            notes = load_notes(self.notes_file)
+            remaining = {key: note for key, note in notes.items() if key[1] != list_id}
+            if len(remaining) != len(notes):
+                save_notes(self.notes_file, remaining)
+            modes = self.storage_modes()
+            if modes.pop(list_id, None) is not None:
+                write_lines_atomically(self.storage_file, [f"{name}|||{value}\n" for name, value in modes.items()])
+        if trash and os.path.exists(self.tags_file):
+            inside = same_path(folder) + os.sep
+            copies = [path for path, section, _ in catalog if section == list_id and same_path(path).startswith(inside)]
+            if copies:
+                self._change_tags(lambda index, paths: index.forget(paths), copies)
+        return len(catalog) - len(kept), trash
+
+    @staticmethod
+    def _delete_tree(folder, progress=None, stop_event=None):
+        """Delete a folder's files one by one, then the folder; returns (files deleted, failures)."""
+        files = []
+        for root, _, names in os.walk(folder):
+            files.extend(os.path.join(root, name) for name in names)
+        failures = []
+        for done, path in enumerate(files, 1):
+            if stop_event is not None and stop_event.is_set():
+                return done - 1 - len(failures), failures
+            try:
+                os.remove(path)  # Links go, not what they point at
+            except OSError as e:
+                failures.append((path, str(e)))
+            if progress:
+                progress(done, len(files))
+        shutil.rmtree(folder, ignore_errors=True)
+        return len(files) - len(failures), failures
+
+    def storage_modes(self):
+        """Storage mode per list id; DEFAULT_STORAGE_KEY holds the default for the rest."""
+        modes = {}
+        if os.path.exists(self.storage_file):
+            with open(self.storage_file, "r", encoding="utf-8") as file:
+                for line in file:
+                    if "|||" in line:
+                        name, mode = line.strip().rsplit("|||", 1)
+                        if mode in STORAGE_MODES or mode == AUTO_MODE:
+                            modes[name] = mode
+        return modes
+
+    def storage_mode(self, section_name):
+        """How files added to a list (by id) are stored: its own mode, else the default, else copies."""
+        modes = self.storage_modes()
+        return modes.get(section_name) or modes.get(self.DEFAULT_STORAGE_KEY) or "copy"
+
+    def set_storage_mode(self, section_name, mode):
+        """Set a list's storage mode by list id (section_name None sets the default); mode None clears it."""
+        if mode is not None and mode not in STORAGE_MODES and mode != AUTO_MODE:
+            raise ValueError(f"Unknown storage mode: {mode}")
+        key = self.DEFAULT_STORAGE_KEY if section_name is None else section_name
+        with CATALOG_LOCK:
+            modes = self.storage_modes()
+            if mode is None:
+                modes.pop(key, None)
+            else:
+                modes[key] = mode
+            write_lines_atomically(self.storage_file, [f"{name}|||{value}\n" for name, value in modes.items()])
+
+    def entries(self, sections=None, with_modes=False):
+        """Catalog entries as (path, section), or (path, section, storage mode) with with_modes.
+
+        sections, if given, limits them to some lists, grouped in that order.
+        """
+        if sections is None:
+            entries = read_catalog_entries(self.catalog_file)
+            return entries if with_modes else [(path, section) for path, section, _ in entries]
+        return section_entries(self.catalog_file, list(sections), with_modes)
+
+    def save_to_list(self, files, section_name, mode=None, progress=None):
+        """Copy (or link) files into a list and record them with one catalog append.
+
+        section_name is the list's id (an id sections.txt lacks is added as
+        a list of that name). mode is one of STORAGE_MODES or AUTO_MODE, by
+        default the list's storage_mode. Files whose name is already in the list are skipped, as
+        in the app. progress, if given, is called with (done, total) as files
+        are placed. Returns ([(source, catalog path), ...], [(source, error), ...]).
+        """
+        placed, failures = self.place(files, section_name, mode, progress)
+        if placed:
+            self.record([(dest_path, section_name, used) for _, dest_path, used in placed])
+        return [(source, dest_path) for source, dest_path, _ in placed], failures
+
+    def place(self, files, section_name, mode=None, progress=None):
+        """The file work of save_to_list, without touching the catalog.
+
+        Returns ([(source, catalog path, mode used), ...], [(source, error), ...]).
+        """
+        mode = mode or self.storage_mode(section_name)
+        if mode not in STORAGE_MODES and mode != AUTO_MODE:
+            raise ValueError(f"Unknown storage mode: {mode}")
+        self._ensure_lists([section_name])
+        saved_names = {os.path.basename(path) for path, section in read_catalog(self.catalog_file)
+                       if section == section_name}
+        section_folder = self.list_folder(section_name)
+        os.makedirs(section_folder, exist_ok=True)
+
+        # Destination names are planned here so parallel copies cannot collide
+        jobs = []
+        failures = []
+        planned = set()
+        stamp = int(time.time())
+        for file_path in files:
+            base_name = os.path.basename(file_path)
+            if base_name in saved_names:
+                continue
+            if not os.path.isfile(file_path):
+                failures.append((file_path, "Not a regular file"))
+                continue
+            saved_names.add(base_name)
+            dest_path = unique_list_path(section_folder, base_name, planned, stamp)
+            planned.add(dest_path)
+            jobs.append((file_path, dest_path, mode))
+
+        return self._copy_all(jobs, failures, progress), failures
+
+    def record(self, entries):
+        """Add (path, section) or (path, section, storage mode) entries for files already in place, in one append."""
+        append_catalog(self.catalog_file, entries)
+
+    def _copy_all(self, jobs, failures, progress=None):
+        copied = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for done, (job, (placed, error)) in enumerate(zip(jobs, pool.map(self._copy_file, jobs)), 1):
+                if error:
+                    failures.append((job[0], error))
+                else:
+                    copied.append((job[0],) + placed)
+                if progress:
+                    progress(done, len(jobs))
+        return copied
+
+    @staticmethod
+    def _copy_file(job):
+        """(catalog path, mode used), error for one (source, destination, mode) job."""
+        try:
+            return place_file(*job), None
+        except Exception as e:
+            return None, str(e)
+
+    def remove(self, entries, delete_copies=False):
+        """Take (path, section) entries out of their lists in one catalog rewrite.
+
+        Their notes go too; with delete_copies the file in lists/<section>/ is
+        deleted as well. Returns the number of catalog lines removed.
+        """
+        targets = {(same_path(path), section) for path, section in entries}
+        with CATALOG_LOCK:
+            catalog = read_catalog_entries(self.catalog_file)
+            kept = [entry for entry in catalog if (same_path(entry[0]), entry[1]) not in targets]
+            if len(kept) != len(catalog):
+                write_lines_atomically(self.catalog_file, [catalog_line(*entry) for entry in kept])
+            notes = load_notes(self.notes_file)
+            remaining = {key: note for key, note in notes.items() if (same_path(key[0]), key[1]) not in targets}
+            if len(remaining) != len(notes):
+                save_notes(self.notes_file, remaining)
+
+        if delete_copies:
+            folders = {list_id: same_path(os.path.join(self.lists_dir, folder)) + os.sep
+                       for list_id, _, folder in self.lists()}
+            for path, section in entries:
+                # Only what the list itself holds: a reference's path is the original file
+                section_folder = folders.get(section) or same_path(os.path.join(self.lists_dir, section)) + os.sep
+                if not same_path(path).startswith(section_folder):
+                    continue
+                try:
+                    if os.path.lexists(path):
+                        os.remove(path)  # For links this removes the link, not the original
+                except OSError as e:
+                    print(f"[ERROR] Failed to delete saved file: {path} - {e}")
+        return len(catalog) - len(kept)
+
+    def move(self, entries, target_section):
+        """Move (path, section) entries to another list: drop them, then save them there."""
+        entries = [(path, section) for path, section in entries if section != target_section]
+        copied, failures = self.save_to_list([path for path, _ in entries], target_section)
+        failed = {path for path, _ in failures}
+        self.remove([(path, section) for path, section in entries if path not in failed])
+        return copied, failures
+
+    def rename(self, renames):
+        """Rename files on disk, then update the catalog, notes and tags in one transaction.
+
+        renames holds (old path, new name or path, section); the entries of a
+        renamed file follow it in every list. Files may swap or shift names
+        among themselves. Returns ([(old, new), ...], [(old, error), ...]).
+        """
+        from batch_rename import rename_files  # batch_rename imports this module
+        moves, failures, seen = [], [], set()
+        for old_path, new_name, _ in renames:
+            new_path = new_name if os.path.dirname(new_name) else os.path.join(os.path.dirname(old_path), new_name)
+            if same_path(old_path) in seen:
+                continue
+            seen.add(same_path(old_path))
+            if not os.path.lexists(old_path):
+                failures.append((old_path, "File not found"))
+                continue
+            moves.append((old_path, new_path))
+        done, rename_failures = rename_files(moves)
+        failures.extend(rename_failures)
+        if done:
+            self.relocate(done)
+        return done, failures
+
+    def relocate(self, moves):
+        """Point the catalog entries, notes and tags of moved files at their new paths, in every list.
+
+        Symlink entries that link to a moved file are pointed at its new
+        path too. moves holds (old path, new path). The changed files are
+        committed together through the journal. Returns the number of entries changed.
+        """
+        moved = {same_path(old): new for old, new in moves}
+        contents = {}
+        with CATALOG_LOCK, self._tag_lock:
+            catalog = read_catalog_entries(self.catalog_file)
+            updated = [(moved.get(same_path(path), path), section, mode) for path, section, mode in catalog]
+            retarget_symlinks(updated, moved)
+            changed = sum(1 for before, after in zip(catalog, updated) if before != after)
+            if changed:
+                contents[self.catalog_file] = [catalog_line(*entry) for entry in updated]
+
+            notes = load_notes(self.notes_file)
+            relocated = {}
+            for (path, section), note in notes.items():
+                new_path = moved.get(same_path(path))
+                relocated[(os.path.normpath(new_path) if new_path else path, section)] = note
+            if relocated != notes:
+                contents[self.notes_file] = note_lines(relocated)
+
+            index = self.tag_index() if os.path.exists(self.tags_file) else None
+            if index is not None and index.relocate(moves, save=False):
+                contents[self.tags_file] = index.lines()
+            if contents:
+                try:
+                    commit_files(self.journal_file, contents)
+                except OSError:
+                    self._tag_index = None  # Its relocated tags never reached tags.txt
+                    raise
+                self._tag_signature = self._tags_signature()
+        return changed
+
+    # --- Tags ---
+
+    def tag_index(self):
+        """The TagIndex over tags.txt, reloaded only when the file changed since the last call."""
+        from tag_index import TagIndex  # tag_index imports this module
+        with self._tag_lock:
+            signature = self._tags_signature()
+            if self._tag_index is None or signature != self._tag_signature:
+                self._tag_index = TagIndex(self.tags_file)
+                self._tag_signature = signature
+            return self._tag_index
+
+    def _tags_signature(self):
+        return self._file_signature(self.tags_file)
+
+    @staticmethod
+    def _file_signature(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _change_tags(self, change, *args):
+        with self._tag_lock:
+            result = change(self.tag_index(), *args)
+            self._tag_signature = self._tags_signature()
+            return result
+
+    def tag(self, paths, tags):
+        """Give every file in paths every tag in tags (one write of tags.txt)."""
+        self._change_tags(lambda index, *args: index.add_tags(*args), list(paths), list(tags))
+
+    def untag(self, paths, tags):
+        self._change_tags(lambda index, *args: index.remove_tags(*args), list(paths), list(tags))
+
+    def tags(self):
+        """{tag: number of files}."""
+        with self._tag_lock:
+            return self.tag_index().tags()
+
+    def tags_of(self, paths):
+        """{path: [tags]} for the given paths."""
+        with self._tag_lock:
+            index = self.tag_index()
+            return {path: index.tags_of(path) for path in paths}
+
+    def tag_query(self, expression):
+        """Paths of the files matching a tag query such as 'thesis AND sources NOT archived'."""
+        with self._tag_lock:
+            return self.tag_index().query(expression)
+
+    # --- Structured queries ---
+
+    def catalog_index(self):
+        from catalog_index import CatalogIndex  # catalog_index imports this module
+        if self._catalog_index is None:
+            self._catalog_index = CatalogIndex(self.index_file, workers=self.workers)
+        return self._catalog_index
+
+    def find(self, expression, refresh=False):
+        """Files of the catalog matching a query such as 'modified>2025-01-01 size>10MB ext:pdf missing:true'.
+
+        The query is answered from catalog_index.db. The index is synced with
+        the catalog and the disk only when saved_files_all.txt changed since
+        the last sync, or with refresh=True (files edited in place keep their
+        indexed size and dates until then). Returns (path, size, mtime, ctime,
+        atime, missing) rows in the query's sort order; raises ValueError for
+        a query that cannot be parsed.
+        """
+        from catalog_index import parse_query
+        parse_query(expression)  # Fail before any syncing
+        self.sync_catalog_index(refresh)
+        return self.catalog_index().query(expression)
+
+    def sync_catalog_index(self, force=False):
+        """Bring the index up to date if the catalog changed (or always, with force); returns whether it synced."""
+        index = self.catalog_index()
+        signature = "%s:%s" % (self._file_signature(self.catalog_file) or ("missing", 0))
+        if not force and index.signature() == signature:
+            return False
+        # Read after taking the signature: a write in between leaves an old signature, so the next call syncs again
+        index.sync((path for path, _, _ in read_catalog_entries(self.catalog_file)), signature)
+        return True
+
+    # --- Notes and search ---
+
+    def notes(self):
+        return load_notes(self.notes_file)
+
+    def set_notes(self, updates):
+        """Set many notes at once; updates maps (path, section) to text ('' clears)."""
+        with CATALOG_LOCK:
+            notes = load_notes(self.notes_file)
+            for (path, section), text in updates.items():
+                key = (os.path.normpath(path), section)
+                if text:
+                    notes[key] = text.strip()
+                else:
+                    notes.pop(key, None)
+            save_notes(self.notes_file, notes)
+
+    def search(self, query, sections=None, in_notes=True):
+        """Catalog entries whose file name (or note) contains query, case-insensitively.
+
+        Yields (path, section, note).
+        """
+        query = query.strip().lower()
+        notes = load_notes(self.notes_file)
+        for path, section in self.entries(sections):
+            note = notes.get((os.path.normpath(path), section), "")
+            if query in os.path.basename(path).lower() or (in_notes and query in note.lower()):
+                yield path, section, note
@@ -0,0 +1,583 @@
+"""Optional local service that owns the catalog for every window and script.
+
+    python organizer_daemon.py                    # serves the catalog in the working directory
+    python organizer_daemon.py --catalog-dir ~/Organizer --lists-dir ~/Organizer/lists
+
+While it runs, the app and organizer_cli.py send list jobs to it instead of
+rewriting the catalog files themselves, so their writes are serialized and
+none are lost. The catalog, notes and list names are kept in memory and
+reloaded only when a file changes on disk; every change, whoever made it, is
+pushed to subscribed clients.
+
+Clients speak newline-delimited JSON over a Unix socket:
+    {"id": 1, "method": "entries", "params": {"sections": ["Receipts"]}}
+    {"id": 1, "result": [["/path/a.pdf", "Receipts"]]}
+Long jobs (save_to_list, move) send {"id": 1, "progress": [done, total]}
+lines before their result. Reads are answered from the last loaded copy of
+the files and never wait for a job; a client opens a connection per
+concurrent call, so a window is not held up behind its own background jobs.
+A connection that sends {"method": "subscribe"} then receives events such as
+    {"event": "changed", "files": ["catalog", "notes", "sections", "tags"]}
+"""
+import argparse
+import hashlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+import organizer_core
+
+if getattr(sys, "frozen", False):
+    BASE_DIR = os.path.dirname(sys.executable)
+else:
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SOCKET_ENV = "FILEORGANIZER_SOCKET"  # Overrides the socket path derived from the catalog folder
+POLL_INTERVAL = 1.0  # Seconds between checks for catalog files changed behind the daemon's back
+PROGRESS_INTERVAL = 0.2  # Seconds between progress messages of one request
+
+
+def socket_path(catalog_dir="."):
+    """The socket of the daemon serving catalog_dir; one daemon per catalog folder."""
+    explicit = os.environ.get(SOCKET_ENV)
+    if explicit:
+        return explicit
+    key = hashlib.sha1(organizer_core.same_path(catalog_dir).encode("utf-8")).hexdigest()[:12]
+    folder = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(folder, f"fileorganizer-{key}.sock")
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DaemonError(RuntimeError):
+    """The daemon could not carry out a request."""
+
+
+# --- Server ---
+
+class CatalogService:
+    """The catalog, notes and list names held in memory and shared by all clients.
+
+    Catalog writes run one at a time through an Organizer; afterwards the
+    changed files are reloaded and subscribers told which ones changed.
+    Copying files into lists happens outside that lock (placements only wait
+    for each other), and reads use the cache, which is replaced as a whole
+    after each reload rather than changed in place, so they never wait.
+    """
+    PROGRESS_METHODS = ("place", "save_to_list", "move")
+
+    def __init__(self, organizer):
+        self.organizer = organizer
+        self.lock = threading.RLock()  # Catalog writes
+        self.placement_lock = threading.RLock()  # Copies into lists, so two jobs never plan the same name
+        self._refresh_lock = threading.Lock()
+        self._signatures = {}
+        self._cache = {}
+        self._subscribers = set()
+        self._subscribers_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.refresh()
+
+    def _files(self):
+        return {
+            "catalog": (self.organizer.catalog_file,
+                        lambda: organizer_core.read_catalog_entries(self.organizer.catalog_file)),
+            "notes": (self.organizer.notes_file, lambda: organizer_core.load_notes(self.organizer.notes_file)),
+            "sections": (self.organizer.sections_file, self.organizer.lists),
+            "tags": (self.organizer.tags_file, self.organizer.tag_index),
+        }
+
+    def refresh(self):
+        """Reload the files that changed on disk; returns their names."""
+        changed = []
+        with self._refresh_lock:
+            cache = dict(self._cache)
+            for name, (path, load) in self._files().items():
+                signature = file_signature(path)
+                if name in cache and signature == self._signatures.get(name):
+                    continue
+                cache[name] = load()
+                self._signatures[name] = signature
+                changed.append(name)
+            self._cache = cache  # Readers holding the old dict keep a consistent view
+        return changed
+
+    # --- Subscriptions ---
+
+    def subscribe(self, send):
+        with self._subscribers_lock:
+            self._subscribers.add(send)
+
+    def unsubscribe(self, send):
+        with self._subscribers_lock:
+            self._subscribers.discard(send)
+
+    def publish(self, changed):
+        if not changed:
+            return
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for send in subscribers:
+            try:
+                send({"event": "changed", "files": changed})
+            except OSError:
+                self.unsubscribe(send)
+
+    def watch(self):
+        """Push changes made by programs that write the files directly."""
+        while not self._stop.wait(POLL_INTERVAL):
+            self.publish(self.refresh())
+
+    def stop(self):
+        self._stop.set()
+
+    # --- Requests ---
+
+    def call(self, method, params, progress=None):
+        handler = getattr(self, f"do_{method}", None)
+        if handler is None:
+            raise DaemonError(f"Unknown method: {method}")
+        if progress is not None and method in self.PROGRESS_METHODS:
+            params = dict(params, progress=progress)
+        return handler(**params)
+
+    def mutate(self, fn, *args, **kwargs):
+        with self.lock:
+            result = fn(*args, **kwargs)
+        self.publish(self.refresh())
+        return result
+
+    def do_ping(self):
+        return {"pid": os.getpid(), "catalog": os.path.abspath(self.organizer.catalog_file),
+                "lists_dir": os.path.abspath(self.organizer.lists_dir)}
+
+    def do_lists(self):
+        return list(self._cache["sections"])
+
+    def do_sections(self):
+        return [list_id for list_id, _, _ in self.do_lists()]
+
+    def do_entries(self, sections=None, with_modes=False):
+        catalog = self._cache["catalog"]
+        if sections is not None:
+            by_section = {name: [] for name in sections}
+            for entry in catalog:
+                if entry[1] in by_section:
+                    by_section[entry[1]].append(entry)
+            catalog = [entry for name in sections for entry in by_section[name]]
+        return catalog if with_modes else [(path, section) for path, section, _ in catalog]
+
+    def do_notes(self):
+        notes = self._cache["notes"]
+        return [(path, section, note) for (path, section), note in notes.items()]
+
+    def do_search(self, query, sections=None, in_notes=True):
+        query = query.strip().lower()
+        notes = self._cache["notes"]
+        results = []
+        for path, section in self.do_entries(sections):
+            note = notes.get((os.path.normpath(path), section), "")
+            if query in os.path.basename(path).lower() or (in_notes and query in note.lower()):
+                results.append((path, section, note))
+        return results
+
+    def do_add_lists(self, names):
+        return self.mutate(self.organizer.add_lists, names)
+
+    def do_rename_list(self, list_id, new_name):
+        return self.mutate(self.organizer.rename_list, list_id, new_name)
+
+    def do_detach_list(self, list_id, move_folder=True):
+        return self.mutate(self.organizer.detach_list, list_id, move_folder)
+
+    def do_place(self, files, section_name, mode=None, progress=None):
+        # Only registering the list takes the catalog lock; the copies run outside it
+        with self.placement_lock:
+            self.mutate(self.organizer._ensure_lists, [section_name])
+            return self.organizer.place(files, section_name, mode, progress)
+
+    def do_save_to_list(self, files, section_name, mode=None, progress=None):
+        with self.placement_lock:
+            placed, failures = self.do_place(files, section_name, mode, progress)
+            if placed:
+                self.mutate(self.organizer.record, [(dest_path, section_name, used) for _, dest_path, used in placed])
+        return [(source, dest_path) for source, dest_path, _ in placed], failures
+
+    def do_record(self, entries):
+        return self.mutate(self.organizer.record, [tuple(entry) for entry in entries])
+
+    def do_remove(self, entries, delete_copies=False):
+        return self.mutate(self.organizer.remove, [tuple(entry) for entry in entries], delete_copies)
+
+    def do_move(self, entries, target_section, progress=None):
+        # Organizer.move, with the copies made outside the catalog lock
+        entries = [(path, section) for path, section in entries if section != target_section]
+        with self.placement_lock:
+            copied, failures = self.do_save_to_list([path for path, _ in entries], target_section, progress=progress)
+            failed = {path for path, _ in failures}
+            self.mutate(self.organizer.remove, [(path, section) for path, section in entries if path not in failed])
+        return copied, failures
+
+    def do_rename(self, renames):
+        return self.mutate(self.organizer.rename, [tuple(rename) for rename in renames])
+
+    def do_relocate(self, moves):
+        return self.mutate(self.organizer.relocate, [tuple(move) for move in moves])
+
+    def do_set_notes(self, updates):
+        return self.mutate(self.organizer.set_notes, {(path, section): text for path, section, text in updates})
+
+    def do_set_storage_mode(self, section_name, mode):
+        return self.mutate(self.organizer.set_storage_mode, section_name, mode)
+
+    def do_tag(self, paths, tags):
+        return self.mutate(self.organizer.tag, paths, tags)
+
+    def do_untag(self, paths, tags):
+        return self.mutate(self.organizer.untag, paths, tags)
+
+    def do_tags(self):
+        return self.organizer.tags()
+
+    def do_tags_of(self, paths):
+        return self.organizer.tags_of(paths)
+
+    def do_tag_query(self, expression):
+        return self.organizer.tag_query(expression)
+
+
+class ClientHandler(socketserver.StreamRequestHandler):
+    """One client connection: requests answered in order, events pushed after subscribe."""
+
+    def handle(self):
+        service = self.server.service
+        send_lock = threading.Lock()
+
+        def send(message):
+            data = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+            with send_lock:
+                self.wfile.write(data)
+                self.wfile.flush()
+
+        try:
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    send({"error": "Malformed request"})
+                    continue
+                request_id = request.get("id")
+                if request.get("method") == "subscribe":
+                    service.subscribe(send)
+                    send({"id": request_id, "result": True})
+                    continue
+                try:
+                    result = service.call(request.get("method"), request.get("params") or {},
+                                          progress_sender(send, request_id))
+                    send({"id": request_id, "result": result})
+                except OSError:
+                    raise
+                except Exception as e:
+                    send({"id": request_id, "error": f"{type(e).__name__}: {e}"})
+        except OSError:
+            pass  # Client went away
+        finally:
+            service.unsubscribe(send)
+
+
+def progress_sender(send, request_id):
+    """A progress(done, total) callback that sends at most one message per PROGRESS_INTERVAL, and the last."""
+    last_sent = [0.0]
+
+    def progress(done, total):
+        now = time.monotonic()
+        if done < total and now - last_sent[0] < PROGRESS_INTERVAL:
+            return
+        last_sent[0] = now
+        send({"id": request_id, "progress": [done, total]})
+    return progress
+
+
+class CatalogServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, service):
+        self.service = service
+        super().__init__(path, ClientHandler)
+
+
+def serve(organizer, path):
+    """Serve organizer's catalog on path until interrupted."""
+    if os.path.exists(path):
+        try:
+            CatalogClient(path).close()
+            raise SystemExit(f"A daemon is already serving {path}")
+        except OSError:
+            os.remove(path)  # Left behind by a daemon that did not shut down cleanly
+
+    service = CatalogService(organizer)
+    old_umask = os.umask(0o077)  # Only this user may connect
+    try:
+        server = CatalogServer(path, service)
+    finally:
+        os.umask(old_umask)
+    threading.Thread(target=service.watch, name="catalog-watch", daemon=True).start()
+    # shutdown() waits for serve_forever, so it cannot run on the thread the signal interrupts
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    print(f"Serving {os.path.abspath(organizer.catalog_file)} on {path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# --- Client ---
+
+class CatalogClient:
+    """Connections to the daemon for requests; subscribe() opens another one for events.
+
+    Each call borrows an idle connection (opening one if all are busy) and
+    gives it back afterwards, so calls from different threads run side by
+    side instead of queueing on one socket.
+    """
+
+    def __init__(self, path, timeout=300):
+        self.path = path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle = [self._open()]  # Fails here when no daemon listens
+        self._busy = set()
+        self._next_id = 0
+        self._subscriptions = []
+
+    def _open(self):
+        connection = self._connect(self.path, self.timeout)
+        return connection, connection.makefile("rb")
+
+    @staticmethod
+    def _connect(path, timeout):
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix sockets are not available on this platform")
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        try:
+            connection.connect(path)
+        except OSError:
+            connection.close()
+            raise
+        return connection
+
+    def call(self, method, on_progress=None, **params):
+        """The result of a daemon method; on_progress(done, total) gets progress messages of long jobs."""
+        with self._lock:
+            self._next_id += 1
+            request_id = self._next_id
+            connection = self._idle.pop() if self._idle else None
+        if connection is None:
+            connection = self._open()
+        with self._lock:
+            self._busy.add(connection)
+        sock, reader = connection
+        try:
+            sock.sendall((json.dumps({"id": request_id, "method": method, "params": params},
+                                     ensure_ascii=False) + "\n").encode("utf-8"))
+            while True:
+                line = reader.readline()
+                if not line:
+                    raise DaemonError("The daemon closed the connection")
+                reply = json.loads(line)
+                if reply.get("id") != request_id:
+                    continue
+                if "progress" in reply:
+                    if on_progress:
+                        on_progress(*reply["progress"])
+                    continue
+                break
+        except BaseException:
+            self._discard(connection)  # A reply may still be on its way; never reuse it
+            raise
+        with self._lock:
+            self._busy.discard(connection)
+            self._idle.append(connection)
+        if "error" in reply:
+            raise DaemonError(reply["error"])
+        return reply["result"]
+
+    def _discard(self, connection):
+        with self._lock:
+            self._busy.discard(connection)
+        try:
+            connection[0].close()
+        except OSError:
+            pass
+
+    def subscribe(self, callback):
+        """Call callback(event) from a background thread for every pushed event.
+
+        When the daemon goes away callback gets {"event": "disconnected"}.
+        """
+        connection = self._connect(self.path, None)
+        connection.sendall(b'{"id": 0, "method": "subscribe"}\n')
+        self._subscriptions.append(connection)
+
+        def listen():
+            try:
+                for line in connection.makefile("rb"):
+                    message = json.loads(line)
+                    if "event" in message:
+                        callback(message)
+            except (OSError, ValueError):
+                pass
+            callback({"event": "disconnected"})
+
+        threading.Thread(target=listen, name="catalog-events", daemon=True).start()
+
+    def close(self):
+        with self._lock:
+            sockets = [sock for sock, _ in self._idle + list(self._busy)]
+            self._idle, self._busy = [], set()
+        for connection in self._subscriptions + sockets:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            connection.close()
+        self._subscriptions = []
+
+
+class RemoteOrganizer(organizer_core.Organizer):
+    """An Organizer whose list and notes operations run in the daemon.
+
+    Folder scans still run locally. Results come back in the same shapes as
+    Organizer's, with tuples for pairs.
+    """
+
+    def __init__(self, client, **kwargs):
+        super().__init__(**kwargs)
+        self.client = client
+
+    def lists(self):
+        return [tuple(entry) for entry in self.client.call("lists")]
+
+    def add_lists(self, names):
+        return self.client.call("add_lists", names=list(names))
+
+    def rename_list(self, list_id, new_name):
+        self.client.call("rename_list", list_id=list_id, new_name=new_name)
+
+    def detach_list(self, list_id, move_folder=True):
+        # The daemon takes the list out of the catalog; remove_list deletes its files here, with progress
+        removed, trash = self.client.call("detach_list", list_id=list_id, move_folder=move_folder)
+        return removed, trash
+
+    def entries(self, sections=None, with_modes=False):
+        result = self.client.call("entries", sections=list(sections) if sections is not None else None,
+                                  with_modes=with_modes)
+        return [tuple(entry) for entry in result]
+
+    def save_to_list(self, files, section_name, mode=None, progress=None):
+        copied, failures = self.client.call("save_to_list", on_progress=progress, files=list(files),
+                                            section_name=section_name, mode=mode)
+        return [tuple(item) for item in copied], [tuple(item) for item in failures]
+
+    def place(self, files, section_name, mode=None, progress=None):
+        placed, failures = self.client.call("place", on_progress=progress, files=list(files),
+                                            section_name=section_name, mode=mode)
+        return [tuple(item) for item in placed], [tuple(item) for item in failures]
+
+    def record(self, entries):
+        self.client.call("record", entries=[list(entry) for entry in entries])
+
+    def remove(self, entries, delete_copies=False):
+        return self.client.call("remove", entries=[list(entry) for entry in entries], delete_copies=delete_copies)
+
+    def move(self, entries, target_section):
+        copied, failures = self.client.call("move", entries=[list(entry) for entry in entries],
+                                            target_section=target_section)
+        return [tuple(item) for item in copied], [tuple(item) for item in failures]
+
+    def rename(self, renames):
+        done, failures = self.client.call("rename", renames=[list(rename) for rename in renames])
+        return [tuple(item) for item in done], [tuple(item) for item in failures]
+
+    def relocate(self, moves):
+        return self.client.call("relocate", moves=[list(move) for move in moves])
+
+    def notes(self):
+        return {(path, section): note for path, section, note in self.client.call("notes")}
+
+    def set_notes(self, updates):
+        self.client.call("set_notes", updates=[[path, section, text] for (path, section), text in updates.items()])
+
+    def set_storage_mode(self, section_name, mode):
+        self.client.call("set_storage_mode", section_name=section_name, mode=mode)
+
+    def tag(self, paths, tags):
+        self.client.call("tag", paths=list(paths), tags=list(tags))
+
+    def untag(self, paths, tags):
+        self.client.call("untag", paths=list(paths), tags=list(tags))
+
+    def tags(self):
+        return self.client.call("tags")
+
+    def tags_of(self, paths):
+        return self.client.call("tags_of", paths=list(paths))
+
+    def tag_query(self, expression):
+        return self.client.call("tag_query", expression=expression)
+
+    def search(self, query, sections=None, in_notes=True):
+        result = self.client.call("search", query=query, sections=list(sections) if sections is not None else None,
+                                  in_notes=in_notes)
+        return iter([tuple(item) for item in result])
+
+
+def connect(catalog_dir=".", **kwargs):
+    """A RemoteOrganizer if a daemon serves catalog_dir, else None.
+
+    kwargs are Organizer's (lists_dir, workers, ...) for the parts that run locally.
+    """
+    try:
+        client = CatalogClient(socket_path(catalog_dir))
+    except OSError:
+        return None
+    return RemoteOrganizer(client, base_dir=catalog_dir, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--catalog-dir", default=".", help="folder holding saved_files_all.txt, notes.txt, "
+                                                           "sections.txt (default: working directory)")
+    parser.add_argument("--lists-dir", default=os.path.join(BASE_DIR, "lists"), help="folder of list copies")
+    parser.add_argument("--workers", type=int, help="parallel copy workers")
+    parser.add_argument("--socket", help=f"socket path (default: derived from the catalog folder, or ${SOCKET_ENV})")
+    args = parser.parse_args()
+    if not hasattr(socket, "AF_UNIX"):
+        raise SystemExit("The daemon needs Unix domain sockets, which this platform does not provide.")
+
+    organizer = organizer_core.Organizer(base_dir=args.catalog_dir, lists_dir=args.lists_dir, workers=args.workers)
+    serve(organizer, args.socket or socket_path(args.catalog_dir))
+
+
+if __name__ == "__main__":
+    main()
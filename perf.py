@@ -0,0 +1,222 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_right
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+
+class Span:
+    """Counters attached to one timed operation (entries, bytes, syscalls, ...)."""
+
+    def __init__(self, name, counters):
+        self.name = name
+        self.counters = dict(counters)
+
+    def add(self, counter, amount=1):
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def set(self, counter, value):
+        self.counters[counter] = value
+
+
+class PerfRecorder:
+    """Collects timing spans around hot paths.
+
+    Each finished span is kept in a bounded history, folded into per-name
+    totals for the performance panel, and written as one JSON line to a
+    rotating log. Spans may finish on any thread.
+    """
+    HISTORY = 500
+
+    def __init__(self, log_path=None, max_bytes=2 * 1024 * 1024, backups=3):
+        self.log_path = log_path
+        self.recent = deque(maxlen=self.HISTORY)
+        self.totals = {}
+        self._lock = threading.Lock()
+        self._logger = None
+        if log_path:
+            handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backups,
+                                          encoding="utf-8", delay=True)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger = logging.Logger("fileorganizer.perf")
+            self._logger.addHandler(handler)
+
+    @contextmanager
+    def span(self, name, **counters):
+        """Time the enclosed block; the yielded Span collects counters along the way."""
+        span = Span(name, counters)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000, span.counters)
+
+    def record(self, name, duration_ms, counters=None):
+        """Record a finished span measured elsewhere."""
+        entry = {
+            "ts": round(time.time(), 3),
+            "span": name,
+            "ms": round(duration_ms, 3),
+            "thread": threading.current_thread().name,
+        }
+        if counters:
+            entry["counters"] = counters
+        with self._lock:
+            self.recent.append(entry)
+            total = self.totals.get(name)
+            if total is None:
+                total = self.totals[name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0, "counters": {}}
+            total["count"] += 1
+            total["total_ms"] += duration_ms
+            total["max_ms"] = max(total["max_ms"], duration_ms)
+            total["last_ms"] = duration_ms
+            for key, value in (counters or {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    total["counters"][key] = total["counters"].get(key, 0) + value
+        if self._logger is not None:
+            try:
+                self._logger.info(json.dumps(entry, default=str))
+            except Exception as e:
+                print(f"[ERROR] Could not write perf log: {e}")
+
+    def summary(self):
+        """Copies of the per-name totals and the recent spans, newest last."""
+        with self._lock:
+            totals = {name: dict(total, counters=dict(total["counters"])) for name, total in self.totals.items()}
+            return totals, list(self.recent)
+
+    def reset(self):
+        with self._lock:
+            self.recent.clear()
+            self.totals.clear()
+
+
+class EventLoopWatchdog:
+    """Measures event-loop latency and samples the main thread's stack during stalls.
+
+    The UI calls beat() from a repeating timer. A background thread checks how
+    long ago the last beat was; once that passes threshold_ms the loop is
+    stalled, and the thread samples the main thread's Python stack until beats
+    resume. The outermost frame under the event loop names the slot that
+    blocked it.
+    """
+    LATENCY_BUCKETS_MS = (16, 50, 100, 250, 500, 1000)
+    MAX_SAMPLES = 20
+    MAX_STALLS = 200
+
+    def __init__(self, interval_ms=50, threshold_ms=250, recorder=None, main_thread_id=None):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.recorder = recorder
+        self.main_thread_id = main_thread_id or threading.main_thread().ident
+        self.stalls = deque(maxlen=self.MAX_STALLS)
+        self.slots = {}
+        self.beats = 0
+        self.max_latency_ms = 0.0
+        self.histogram = [0] * (len(self.LATENCY_BUCKETS_MS) + 1)
+        self._last_beat = time.monotonic()
+        self._current_stall = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._last_beat = time.monotonic()
+            self._thread = threading.Thread(target=self._watch, name="ui-watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def beat(self):
+        """Called on the UI thread by the heartbeat timer."""
+        now = time.monotonic()
+        with self._lock:
+            latency_ms = max(0.0, (now - self._last_beat - self.interval) * 1000)
+            self._last_beat = now
+            self.beats += 1
+            self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+            self.histogram[bisect_right(self.LATENCY_BUCKETS_MS, latency_ms)] += 1
+            stall, self._current_stall = self._current_stall, None
+            if stall is not None:
+                stall["duration_ms"] = round(latency_ms + self.interval * 1000, 1)
+                self.stalls.append(stall)
+                totals = self.slots.setdefault(stall["slot"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+                totals["count"] += 1
+                totals["total_ms"] += stall["duration_ms"]
+                totals["max_ms"] = max(totals["max_ms"], stall["duration_ms"])
+        if stall is not None and self.recorder is not None:
+            self.recorder.record("ui_stall", stall["duration_ms"], {"slot": stall["slot"], "where": stall["where"]})
+
+    def _watch(self):
+        while not self._stop_event.wait(self.interval):
+            with self._lock:
+                stalled_for = time.monotonic() - self._last_beat
+                if stalled_for < self.threshold:
+                    continue
+                stall = self._current_stall
+                if stall is not None and len(stall["samples"]) >= self.MAX_SAMPLES:
+                    continue
+            stack = self._sample_main_stack()
+            if stack is None:
+                continue
+            with self._lock:
+                if self._current_stall is None:
+                    if time.monotonic() - self._last_beat < self.threshold:
+                        continue  # The loop came back while the stack was being taken
+                    slot, where = self._describe(stack)
+                    self._current_stall = {
+                        "ts": round(time.time() - stalled_for, 3),
+                        "slot": slot,
+                        "where": where,
+                        "stack": stack,
+                        "samples": [],
+                    }
+                self._current_stall["samples"].append(self._describe(stack)[1])
+
+    def _sample_main_stack(self):
+        frame = sys._current_frames().get(self.main_thread_id)
+        if frame is None:
+            return None
+        return [f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}"
+                for entry in traceback.extract_stack(frame)]
+
+    @staticmethod
+    def _describe(stack):
+        """(slot, where): the first frame under the event loop and the innermost frame."""
+        frames = [line for line in stack if not line.endswith(" <module>")]
+        if not frames:
+            return "<event loop>", stack[-1] if stack else ""
+        slot = frames[0]
+        if slot.endswith(" <lambda>") and len(frames) > 1:
+            slot = frames[1]
+        return slot.split(" ", 1)[1], frames[-1]
+
+    def summary(self):
+        """Plain-data copy of the latency histogram, per-slot totals and recent stalls."""
+        with self._lock:
+            labels = [f"<{bound}ms" for bound in self.LATENCY_BUCKETS_MS] + [f">={self.LATENCY_BUCKETS_MS[-1]}ms"]
+            return {
+                "interval_ms": self.interval * 1000,
+                "threshold_ms": self.threshold * 1000,
+                "beats": self.beats,
+                "max_latency_ms": round(self.max_latency_ms, 1),
+                "latency_histogram": dict(zip(labels, self.histogram)),
+                "slots": {slot: dict(totals) for slot, totals in self.slots.items()},
+                "stalls": [dict(stall) for stall in self.stalls],
+            }
+
+    def export(self, path):
+        """Write summary() as JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
@@ -0,0 +1,258 @@
+"""Many-to-many tags on files, answered from per-tag bitmaps.
+
+Tags belong to files, not to list copies: tags.txt holds one line per
+tagged file, path|||tag|||tag... The index numbers the files and keeps one
+Python int per tag whose bit i is set when file i carries the tag, so a
+query such as
+
+    thesis AND sources NOT archived
+    (draft OR review) AND NOT "old notes"
+
+costs a few big-integer operations however many files are tagged. Adjacent
+terms are ANDed; NOT binds tighter than AND, and AND tighter than OR.
+"""
+import os
+import re
+
+from organizer_core import same_path, write_lines_atomically
+
+# Positions of the set bits in each byte value, for turning a bitmap back into file ids
+BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+QUERY_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+OPERATORS = {"AND", "OR", "NOT"}
+
+
+class TagQueryError(ValueError):
+    """A tag query that cannot be parsed."""
+
+
+def bitmap_ids(bitmap):
+    """Ids of the set bits of bitmap, ascending."""
+    ids = []
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for offset, value in enumerate(data):
+        if value:
+            base = offset * 8
+            ids.extend(base + bit for bit in BYTE_BITS[value])
+    return ids
+
+
+def ids_bitmap(ids):
+    """A bitmap with the given ids set, built in one pass rather than one big-int OR per id."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    data = bytearray(max(ids) // 8 + 1)
+    for file_id in ids:
+        data[file_id >> 3] |= 1 << (file_id & 7)
+    return int.from_bytes(data, "little")
+
+
+def normalize_tag(tag):
+    return " ".join(tag.split()).lower()
+
+
+def parse_query(expression):
+    """Parse a tag query into nested tuples: ("tag", name), ("not", x), ("and", a, b), ("or", a, b)."""
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = QUERY_TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise TagQueryError(f"Unexpected text at {position + 1}: {expression[position:]!r}")
+        position = match.end()
+        opening, closing, quoted, word = match.groups()
+        if opening or closing:
+            tokens.append(opening or closing)
+        elif quoted is not None:
+            tokens.append(("tag", normalize_tag(quoted)))
+        elif word.upper() in OPERATORS:
+            tokens.append(word.upper())
+        else:
+            tokens.append(("tag", normalize_tag(word)))
+    if not tokens:
+        raise TagQueryError("Empty tag query")
+
+    def parse_or(index):
+        node, index = parse_and(index)
+        while index < len(tokens) and tokens[index] == "OR":
+            right, index = parse_and(index + 1)
+            node = ("or", node, right)
+        return node, index
+
+    def parse_and(index):
+        node, index = parse_not(index)
+        while index < len(tokens) and tokens[index] not in ("OR", ")"):
+            if tokens[index] == "AND":
+                index += 1
+            right, index = parse_not(index)
+            node = ("and", node, right)
+        return node, index
+
+    def parse_not(index):
+        if index < len(tokens) and tokens[index] == "NOT":
+            node, index = parse_not(index + 1)
+            return ("not", node), index
+        return parse_term(index)
+
+    def parse_term(index):
+        if index >= len(tokens):
+            raise TagQueryError("Query ends where a tag was expected")
+        token = tokens[index]
+        if token == "(":
+            node, index = parse_or(index + 1)
+            if index >= len(tokens) or tokens[index] != ")":
+                raise TagQueryError("Missing closing parenthesis")
+            return node, index + 1
+        if isinstance(token, tuple):
+            return token, index + 1
+        raise TagQueryError(f"Expected a tag, found {token!r}")
+
+    node, index = parse_or(0)
+    if index != len(tokens):
+        raise TagQueryError(f"Unexpected {tokens[index]!r}")
+    return node
+
+
+class TagIndex:
+    """Tags of files, held as one bitmap per tag over numbered files.
+
+    Ids of files that lose all their tags are not reused until the index is
+    reloaded, so bitmaps never need renumbering in place.
+    """
+
+    def __init__(self, tags_file):
+        self.tags_file = tags_file
+        self.paths = []  # File id -> path
+        self._ids = {}  # same_path(path) -> file id
+        self._tags_by_id = []  # File id -> set of tags
+        self._bitmaps = {}  # Tag -> bitmap of file ids
+        self._universe = 0  # Bits of every file with at least one tag
+        self.load()
+
+    def load(self):
+        self.paths, self._ids, self._tags_by_id, self._bitmaps, self._universe = [], {}, [], {}, 0
+        if not os.path.exists(self.tags_file):
+            return
+        ids_by_tag = {}
+        with open(self.tags_file, "r", encoding="utf-8") as file:
+            for line in file:
+                fields = line.rstrip("\n").split("|||")
+                tags = set(filter(None, map(normalize_tag, fields[1:])))
+                if not tags:
+                    continue
+                file_id = self._id(fields[0].strip(), True)
+                self._tags_by_id[file_id] |= tags
+                for tag in tags:
+                    ids_by_tag.setdefault(tag, []).append(file_id)
+        self._bitmaps = {tag: ids_bitmap(ids) for tag, ids in ids_by_tag.items()}
+        self._universe = ids_bitmap(file_id for file_id, tags in enumerate(self._tags_by_id) if tags)
+
+    def save(self):
+        write_lines_atomically(self.tags_file, self.lines())
+
+    def lines(self):
+        """tags.txt as lines, for saving it together with other catalog files."""
+        return ["|||".join([path] + sorted(tags)) + "\n"
+                for path, tags in zip(self.paths, self._tags_by_id) if tags]
+
+    def _id(self, path, create):
+        key = same_path(path)
+        file_id = self._ids.get(key)
+        if file_id is None and create:
+            file_id = len(self.paths)
+            self._ids[key] = file_id
+            self.paths.append(path)
+            self._tags_by_id.append(set())
+        return file_id
+
+    def _add(self, paths, tags):
+        tags = set(filter(None, map(normalize_tag, tags)))
+        if not tags:
+            return
+        ids = [self._id(path, True) for path in paths]
+        mask = ids_bitmap(ids)
+        for tag in tags:
+            for file_id in ids:
+                self._tags_by_id[file_id].add(tag)
+            self._bitmaps[tag] = self._bitmaps.get(tag, 0) | mask
+        self._universe |= mask
+
+    def _discard(self, paths, tags):
+        ids = [file_id for file_id in (self._id(path, False) for path in paths) if file_id is not None]
+        mask = ids_bitmap(ids)
+        for tag in set(map(normalize_tag, tags)):
+            if tag not in self._bitmaps:
+                continue
+            for file_id in ids:
+                self._tags_by_id[file_id].discard(tag)
+            self._bitmaps[tag] &= ~mask
+            if not self._bitmaps[tag]:
+                del self._bitmaps[tag]
+        self._universe &= ~ids_bitmap(file_id for file_id in ids if not self._tags_by_id[file_id])
+
+    # --- Changes (each saves tags.txt once) ---
+
+    def add_tags(self, paths, tags):
+        self._add(paths, tags)
+        self.save()
+
+    def remove_tags(self, paths, tags):
+        self._discard(paths, tags)
+        self.save()
+
+    def forget(self, paths):
+        """Drop every tag of these files (e.g. copies that were deleted)."""
+        paths = list(paths)
+        tags = set()
+        for path in paths:
+            file_id = self._id(path, False)
+            if file_id is not None:
+                tags |= self._tags_by_id[file_id]
+        if tags:
+            self._discard(paths, tags)
+            self.save()
+
+    def relocate(self, moves, save=True):
+        """Carry tags over to files' new paths; moves holds (old path, new path).
+
+        With save=False the caller writes lines() itself.
+        """
+        carried = []
+        for old_path, new_path in moves:
+            file_id = self._id(old_path, False)
+            if file_id is not None and self._tags_by_id[file_id]:
+                carried.append((old_path, new_path, set(self._tags_by_id[file_id])))
+        # All files leave before any arrives, so swapped names keep their own tags
+        for old_path, _, tags in carried:
+            self._discard([old_path], tags)
+        for _, new_path, tags in carried:
+            self._add([new_path], tags)
+        changed = bool(carried)
+        if changed and save:
+            self.save()
+        return changed
+
+    # --- Lookups ---
+
+    def tags(self):
+        """{tag: number of files}, by tag name."""
+        return {tag: bin(bitmap).count("1") for tag, bitmap in sorted(self._bitmaps.items())}
+
+    def tags_of(self, path):
+        file_id = self._id(path, False)
+        return sorted(self._tags_by_id[file_id]) if file_id is not None else []
+
+    def query(self, expression):
+        """Paths of the files matching a tag query, in the order they were first tagged."""
+        return [self.paths[file_id] for file_id in bitmap_ids(self.evaluate(parse_query(expression)))]
+
+    def evaluate(self, node):
+        kind = node[0]
+        if kind == "tag":
+            return self._bitmaps.get(node[1], 0)
+        if kind == "not":
+            return self._universe & ~self.evaluate(node[1])
+        left, right = self.evaluate(node[1]), self.evaluate(node[2])
+        return left & right if kind == "and" else left | right
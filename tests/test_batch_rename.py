@@ -0,0 +1,80 @@
+import os
+
+import batch_rename
+from batch_rename import rename_files
+
+
+def make_files(folder, contents):
+    paths = {}
+    for name, text in contents.items():
+        path = os.path.join(folder, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        paths[name] = path
+    return paths
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def test_swap_goes_through_temporary_names(tmp_path):
+    paths = make_files(tmp_path, {"a.txt": "A", "b.txt": "B"})
+    done, failures = rename_files([(paths["a.txt"], paths["b.txt"]), (paths["b.txt"], paths["a.txt"])])
+    assert failures == []
+    assert sorted(done) == sorted([(paths["a.txt"], paths["b.txt"]), (paths["b.txt"], paths["a.txt"])])
+    assert read(paths["a.txt"]) == "B" and read(paths["b.txt"]) == "A"
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "b.txt"]
+
+
+def test_shifted_numbering_keeps_every_file(tmp_path):
+    paths = make_files(tmp_path, {"1.txt": "one", "2.txt": "two", "3.txt": "three"})
+    new = {name: os.path.join(tmp_path, f"{int(name[0]) + 1}.txt") for name in paths}
+    done, failures = rename_files([(paths[name], new[name]) for name in ("1.txt", "2.txt", "3.txt")])
+    assert failures == [] and len(done) == 3
+    assert [read(os.path.join(tmp_path, f"{n}.txt")) for n in (2, 3, 4)] == ["one", "two", "three"]
+    assert sorted(os.listdir(tmp_path)) == ["2.txt", "3.txt", "4.txt"]
+
+
+def test_name_taken_outside_the_batch_fails_without_touching_either_file(tmp_path):
+    paths = make_files(tmp_path, {"a.txt": "A", "c.txt": "C"})
+    done, failures = rename_files([(paths["a.txt"], paths["c.txt"])])
+    assert done == [] and [old for old, _ in failures] == [paths["a.txt"]]
+    assert read(paths["a.txt"]) == "A" and read(paths["c.txt"]) == "C"
+
+
+def test_file_that_cannot_take_its_new_name_is_put_back(tmp_path, monkeypatch):
+    paths = make_files(tmp_path, {"a.txt": "A", "b.txt": "B"})
+    real_rename = os.rename
+
+    def rename(source, dest):
+        if dest == paths["b.txt"] and os.path.basename(source).startswith(".renaming-") and source.endswith("-a.txt"):
+            raise OSError("disk said no")
+        real_rename(source, dest)
+
+    monkeypatch.setattr(batch_rename.os, "rename", rename)
+    done, failures = rename_files([(paths["a.txt"], paths["b.txt"]), (paths["b.txt"], paths["a.txt"])])
+    # a cannot reach b.txt and goes back; b then finds a.txt taken and goes back too
+    assert done == []
+    assert sorted(old for old, _ in failures) == sorted([paths["a.txt"], paths["b.txt"]])
+    assert read(paths["a.txt"]) == "A" and read(paths["b.txt"]) == "B"
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "b.txt"]
+
+
+def test_file_stuck_at_its_temporary_name_is_reported_there(tmp_path, monkeypatch):
+    paths = make_files(tmp_path, {"a.txt": "A", "b.txt": "B"})
+    real_rename = os.rename
+
+    def rename(source, dest):
+        if ".renaming-" in source:
+            raise OSError("disk said no")
+        real_rename(source, dest)
+
+    monkeypatch.setattr(batch_rename.os, "rename", rename)
+    done, failures = rename_files([(paths["a.txt"], paths["b.txt"]), (paths["b.txt"], paths["a.txt"])])
+    assert len(failures) == 2
+    assert sorted(old for old, _ in done) == sorted([paths["a.txt"], paths["b.txt"]])
+    for old, where in done:
+        assert os.path.basename(where).startswith(".renaming-")
+        assert read(where) == ("A" if old == paths["a.txt"] else "B")
@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pytest
+
+from catalog_index import CatalogQueryError, parse_query, parse_size, parse_time
+from organizer_core import Organizer, append_catalog
+
+NOW = datetime(2025, 6, 15, 12, 0).timestamp()
+DAY_START = datetime(2025, 1, 1).timestamp()
+DAY_END = datetime(2025, 1, 2).timestamp()
+
+
+def test_after_a_day_starts_at_its_end():
+    assert parse_query("modified>2025-01-01", NOW) == ("mtime >= ?", [DAY_END], "path")
+
+
+def test_on_or_after_a_day_includes_it():
+    assert parse_query("modified>=2025-01-01", NOW)[:2] == ("mtime >= ?", [DAY_START])
+
+
+def test_before_and_up_to_a_day():
+    assert parse_query("created<2025-01-01", NOW)[:2] == ("ctime < ?", [DAY_START])
+    assert parse_query("created<=2025-01-01", NOW)[:2] == ("ctime < ?", [DAY_END])
+
+
+def test_equal_day_spans_the_whole_day():
+    assert parse_query("accessed=2025-01-01", NOW)[:2] == ("atime >= ? AND atime < ?", [DAY_START, DAY_END])
+
+
+def test_ages_count_back_from_now():
+    assert parse_time("7d", NOW) == (NOW - 7 * 86400, NOW - 7 * 86400)
+    assert parse_time("today", NOW) == (datetime(2025, 6, 15).timestamp(), datetime(2025, 6, 16).timestamp())
+
+
+def test_month_and_year_spans():
+    assert parse_time("2024-12", NOW) == (datetime(2024, 12, 1).timestamp(), datetime(2025, 1, 1).timestamp())
+    assert parse_time("2024", NOW) == (datetime(2024, 1, 1).timestamp(), datetime(2025, 1, 1).timestamp())
+
+
+def test_sizes_use_powers_of_1024():
+    assert parse_size("10MB") == 10 * 1024 ** 2
+    assert parse_size("1.5k") == 1536
+    assert parse_query("size>10MB")[:2] == ("size > ?", [10 * 1024 ** 2])
+
+
+def test_ext_and_type():
+    assert parse_query("ext:pdf,.DOCX")[:2] == ("ext IN (?, ?)", [".pdf", ".docx"])
+    condition, parameters, _ = parse_query("type:audio")
+    assert condition.startswith("ext IN (") and ".mp3" in parameters
+
+
+def test_sort_descending_and_words():
+    condition, parameters, order = parse_query('sort:-size "tax return" missing:false')
+    assert order == "size DESC, path"
+    assert condition == "path LIKE ? ESCAPE '\\' AND missing = ?"
+    assert parameters == ["%tax return%", 0]
+
+
+def test_like_wildcards_are_escaped():
+    assert parse_query("100%_done")[1] == ["%100\\%\\_done%"]
+
+
+@pytest.mark.parametrize("query", [
+    "size>lots", "modified>someday", "ext>pdf", "type:spreadsheet", "missing:maybe", "sort:color", "color:red",
+])
+def test_bad_queries_raise(query):
+    with pytest.raises(CatalogQueryError):
+        parse_query(query, NOW)
+
+
+def test_find_syncs_only_after_the_catalog_changes(tmp_path):
+    organizer = Organizer(base_dir=str(tmp_path))
+    small = tmp_path / "small.txt"
+    small.write_text("x")
+    append_catalog(organizer.catalog_file, [(str(small), "L")])
+    assert [row[0] for row in organizer.find("size<1KB")] == [str(small)]
+
+    small.write_text("x" * 4096)  # Edited in place: the catalog did not change
+    assert [row[0] for row in organizer.find("size<1KB")] == [str(small)]
+    assert organizer.find("size<1KB", refresh=True) == []
+
+    big = tmp_path / "big.txt"
+    big.write_text("y" * 2048)
+    append_catalog(organizer.catalog_file, [(str(big), "L")])
+    assert sorted(row[0] for row in organizer.find("size>1KB")) == sorted([str(small), str(big)])
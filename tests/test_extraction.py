@@ -0,0 +1,228 @@
+import os
+import subprocess
+import sys
+import threading
+import zipfile
+from array import array
+
+import pytest
+
+import extraction
+from extraction import (ExtractedTextStore, ExtractionCancelled, ExtractionFailed, ExtractionPool, ExtractionTimeout,
+                        extract_docx_text, iter_docx_paragraphs, join_pages, split_pages)
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ExtractedTextStore(str(tmp_path / "extracted_text.db"))
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Files parsed by get_or_extract; .txt files "extract" to their upper-cased contents."""
+    parsed = []
+
+    def extract(file_path, cancel_event):
+        parsed.append(file_path)
+        with open(file_path, "r", encoding="utf-8") as file:
+            return file.read().upper(), None
+
+    monkeypatch.setitem(extraction.EXTRACTORS, ".txt", extract)
+    return parsed
+
+
+def test_each_version_is_parsed_once(tmp_path, store, parses):
+    path = str(tmp_path / "a.txt")
+    write(path, "hello")
+    assert store.get_or_extract(path) == ("HELLO", None)
+    assert store.get_or_extract(path) == ("HELLO", None)
+    assert parses == [path]
+
+
+def test_a_change_in_size_invalidates_the_text(tmp_path, store, parses):
+    path = str(tmp_path / "a.txt")
+    write(path, "hello")
+    store.get_or_extract(path)
+    mtime = os.stat(path).st_mtime_ns
+    write(path, "hello again")
+    os.utime(path, ns=(mtime, mtime))  # Same mtime: only the size tells them apart
+    assert store.get(path) is None
+    assert store.get_or_extract(path) == ("HELLO AGAIN", None)
+    assert len(parses) == 2
+
+
+def test_a_change_in_mtime_invalidates_the_text(tmp_path, store, parses):
+    path = str(tmp_path / "a.txt")
+    write(path, "hello")
+    store.get_or_extract(path)
+    write(path, "HOWDY")  # Same size
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000_000))
+    assert store.get(path) is None
+    assert store.get_or_extract(path) == ("HOWDY", None)
+
+
+def test_text_is_stored_under_the_version_that_was_parsed(tmp_path, store):
+    path = str(tmp_path / "a.txt")
+    write(path, "before")
+    signature = extraction.file_signature(path)
+    write(path, "edited while parsing")
+    store.put(path, "BEFORE", None, signature)
+    assert store.get(path) is None
+    assert store.get(path, signature) == ("BEFORE", None)
+
+
+def test_page_offsets_round_trip(tmp_path, store):
+    path = str(tmp_path / "a.pdf")
+    write(path, "pdf bytes")
+    pages = ["first page\n", "", "third page\n"]
+    text, offsets = join_pages(pages)
+    store.put(path, text, offsets)
+    stored_text, stored_offsets = store.get(path)
+    assert stored_offsets == array("Q", [0, 11, 11])
+    assert split_pages(stored_text, stored_offsets) == pages
+
+
+def test_the_store_is_shared_across_connections(tmp_path, store, parses):
+    path = str(tmp_path / "a.txt")
+    write(path, "hello")
+    store.get_or_extract(path)
+    assert ExtractedTextStore(store.db_path).get(path) == ("HELLO", None)
+
+
+def test_prune_drops_deleted_files(tmp_path, store, parses):
+    kept, deleted = str(tmp_path / "kept.txt"), str(tmp_path / "deleted.txt")
+    for path in (kept, deleted):
+        write(path, "text")
+        store.get_or_extract(path)
+    os.remove(deleted)
+    assert store.prune() == 1
+    assert store.get(kept) == ("TEXT", None)
+
+
+def test_files_without_an_extractor_are_refused(tmp_path, store):
+    path = str(tmp_path / "a.xyz")
+    write(path, "?")
+    with pytest.raises(ValueError):
+        store.get_or_extract(path)
+
+
+WORD = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+MC = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+
+
+def write_docx(path, body):
+    """A .docx holding only word/document.xml with the given body markup."""
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", f'<?xml version="1.0"?><w:document {WORD} {MC}><w:body>'
+                                              f'{body}</w:body></w:document>')
+    return path
+
+
+def paragraph(*runs):
+    return "<w:p>" + "".join(f"<w:r>{run}</w:r>" for run in runs) + "</w:p>"
+
+
+def test_streamed_paragraphs_match_python_docx(tmp_path):
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.add_paragraph("First paragraph")
+    mixed = document.add_paragraph("Bold ")
+    mixed.add_run("and plain").bold = True
+    document.add_paragraph("")
+    document.add_paragraph("Tab\there, break\nthere")
+    table = document.add_table(rows=2, cols=2)
+    for row, cells in enumerate(table.rows):
+        for column, cell in enumerate(cells.cells):
+            cell.text = f"cell {row}.{column}"
+    document.add_paragraph("After the table")
+    path = str(tmp_path / "a.docx")
+    document.save(path)
+
+    expected = []
+    for block in document.iter_inner_content():
+        if isinstance(block, docx.table.Table):
+            expected.extend(cell_paragraph.text for row in block.rows for cell in row.cells
+                            for cell_paragraph in cell.paragraphs)
+        else:
+            expected.append(block.text)
+    assert list(iter_docx_paragraphs(path)) == expected
+    assert extract_docx_text(path) == "\n\n".join(text for text in expected if text.strip())
+
+
+def test_text_box_paragraphs_come_once_and_before_their_anchor(tmp_path):
+    text_box = ("<mc:AlternateContent><mc:Choice Requires=\"wps\"><w:drawing><w:txbxContent>"
+                + paragraph("<w:t>In the box</w:t>") +
+                "</w:txbxContent></w:drawing></mc:Choice><mc:Fallback><w:pict><w:txbxContent>"
+                + paragraph("<w:t>In the box</w:t>") +
+                "</w:txbxContent></w:pict></mc:Fallback></mc:AlternateContent>")
+    path = write_docx(str(tmp_path / "a.docx"), paragraph("<w:t>Anchor </w:t>", text_box, "<w:t>text</w:t>"))
+    assert list(iter_docx_paragraphs(path)) == ["In the box", "Anchor text"]
+
+
+def test_tabs_and_breaks_become_whitespace(tmp_path):
+    path = write_docx(str(tmp_path / "a.docx"), paragraph("<w:t>a</w:t><w:tab/><w:t>b</w:t><w:br/><w:t>c</w:t>"))
+    assert list(iter_docx_paragraphs(path)) == ["a\tb\nc"]
+
+
+def test_cancelled_extraction_stops(tmp_path):
+    path = write_docx(str(tmp_path / "a.docx"), paragraph("<w:t>one</w:t>") * 3)
+    cancel_event = threading.Event()
+    paragraphs = iter_docx_paragraphs(path, cancel_event)
+    assert next(paragraphs) == "one"
+    cancel_event.set()
+    with pytest.raises(ExtractionCancelled):
+        next(paragraphs)
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ExtractionPool(str(tmp_path / "extracted_text.db"), workers=1, timeout=10.0)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+def test_hanging_job_times_out_and_its_worker_is_replaced(tmp_path, pool):
+    hanging = str(tmp_path / "hangs.docx")
+    os.mkfifo(hanging)  # Opening it blocks until a writer shows up, which never happens
+    document = write_docx(str(tmp_path / "a.docx"), paragraph("<w:t>still works</w:t>"))
+
+    with pytest.raises(ExtractionTimeout):
+        pool.call("docx_paragraphs", hanging, timeout=1.0)
+    assert pool.call("docx_paragraphs", document) == ["still works"]
+
+
+def test_failing_job_reports_and_the_worker_carries_on(tmp_path, pool):
+    broken = str(tmp_path / "broken.docx")
+    write(broken, "not a zip")
+    document = write_docx(str(tmp_path / "a.docx"), paragraph("<w:t>fine</w:t>"))
+
+    with pytest.raises(ExtractionFailed, match="BadZipFile"):
+        pool.call("docx_paragraphs", broken)
+    assert pool.call("docx_paragraphs", document) == ["fine"]
+
+
+def test_partial_results_arrive_before_the_job_finishes(tmp_path, pool):
+    count = extraction.DOCX_PARAGRAPH_BATCH + 5
+    document = write_docx(str(tmp_path / "a.docx"), paragraph("<w:t>line</w:t>") * count)
+    partials = []
+    rest = pool.call("docx_paragraphs", document, on_partial=partials.append)
+    assert [len(batch) for batch in partials] == [extraction.DOCX_PARAGRAPH_BATCH] and len(rest) == 5
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the job object cap is not exercised here")
+def test_memory_cap_turns_a_runaway_allocation_into_memory_error():
+    script = ("import extraction\n"
+              "extraction.limit_memory(512 * 1024 * 1024)\n"
+              "try:\n"
+              "    bytearray(1024 * 1024 * 1024)\n"
+              "except MemoryError:\n"
+              "    print('capped')\n")
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60,
+                            cwd=os.path.dirname(os.path.abspath(extraction.__file__)))
+    assert result.stdout.strip() == "capped", result.stderr
@@ -0,0 +1,102 @@
+import json
+import os
+
+import pytest
+
+import organizer_core
+from organizer_core import Organizer, commit_files, recover_journal
+
+
+class Crash(Exception):
+    pass
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def crash_before_replacing(monkeypatch, journal, contents):
+    """Run commit_files up to its commit point, dying where the files would be replaced; returns the journal."""
+    def die(journal_path, staged):
+        raise Crash()
+
+    with monkeypatch.context() as patch:
+        patch.setattr(organizer_core, "finish_commit", die)
+        with pytest.raises(Crash):
+            commit_files(journal, contents)
+    with open(journal, "r", encoding="utf-8") as file:
+        return {path: temp_path for temp_path, path in json.load(file)}
+
+
+def test_commit_replaces_every_file_and_leaves_nothing_behind(tmp_path):
+    first, second, journal = (str(tmp_path / name) for name in ("first.txt", "second.txt", "catalog.journal"))
+    write(first, "old 1\n")
+    commit_files(journal, {first: ["new 1\n"], second: ["new 2\n"]})
+    assert read(first) == "new 1\n" and read(second) == "new 2\n"
+    assert sorted(os.listdir(tmp_path)) == ["first.txt", "second.txt"]
+
+
+def test_recovery_replays_a_commit_interrupted_after_the_journal(tmp_path, monkeypatch):
+    first, second, journal = (str(tmp_path / name) for name in ("first.txt", "second.txt", "catalog.journal"))
+    write(first, "old 1\n")
+    write(second, "old 2\n")
+    crash_before_replacing(monkeypatch, journal, {first: ["new 1\n"], second: ["new 2\n"]})
+    assert read(first) == "old 1\n" and os.path.exists(journal)
+
+    assert recover_journal(journal) == 2
+    assert read(first) == "new 1\n" and read(second) == "new 2\n"
+    assert sorted(os.listdir(tmp_path)) == ["first.txt", "second.txt"]
+
+
+def test_recovery_skips_files_replaced_before_the_crash(tmp_path, monkeypatch):
+    first, second, journal = (str(tmp_path / name) for name in ("first.txt", "second.txt", "catalog.journal"))
+    write(first, "old 1\n")
+    write(second, "old 2\n")
+    staged = crash_before_replacing(monkeypatch, journal, {first: ["new 1\n"], second: ["new 2\n"]})
+    os.replace(staged[first], first)
+
+    assert recover_journal(journal) == 1
+    assert read(first) == "new 1\n" and read(second) == "new 2\n"
+    assert not os.path.exists(journal)
+
+
+def test_staged_files_of_two_interrupted_commits_do_not_collide(tmp_path, monkeypatch):
+    first, journal = str(tmp_path / "first.txt"), str(tmp_path / "catalog.journal")
+    write(first, "old 1\n")
+    earlier = crash_before_replacing(monkeypatch, journal, {first: ["from one process\n"]})
+    later = crash_before_replacing(monkeypatch, journal, {first: ["from another\n"]})
+    assert earlier[first] != later[first] and read(earlier[first]) == "from one process\n"
+
+    assert recover_journal(journal) == 1
+    assert read(first) == "from another\n"
+
+
+def test_torn_journal_changes_nothing(tmp_path):
+    first, journal = str(tmp_path / "first.txt"), str(tmp_path / "catalog.journal")
+    write(first, "old 1\n")
+    write(first + ".staged.commit", "new 1\n")
+    write(journal + ".tmp", json.dumps([[first + ".staged.commit", first]])[:10])  # Died before the rename
+
+    assert recover_journal(journal) == 0
+    assert read(first) == "old 1\n"
+
+
+def test_organizer_finishes_an_interrupted_commit_on_start(tmp_path, monkeypatch):
+    organizer = Organizer(base_dir=str(tmp_path), lists_dir=str(tmp_path / "lists"))
+    write(organizer.catalog_file, "/old/a.txt|||L\n")
+    write(organizer.notes_file, "/old/a.txt|||L|||note\n")
+    crash_before_replacing(monkeypatch, organizer.journal_file, {
+        organizer.catalog_file: ["/new/a.txt|||L\n"],
+        organizer.notes_file: ["/new/a.txt|||L|||note\n"],
+    })
+
+    organizer = Organizer(base_dir=str(tmp_path), lists_dir=str(tmp_path / "lists"))
+    assert organizer.entries() == [("/new/a.txt", "L")]
+    assert list(organizer.notes()) == [(os.path.normpath("/new/a.txt"), "L")]
+    assert not os.path.exists(organizer.journal_file)
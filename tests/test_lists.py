@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+from organizer_core import REMOVING_PREFIX, Organizer, append_catalog
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+@pytest.fixture
+def organizer(tmp_path):
+    return Organizer(base_dir=str(tmp_path), lists_dir=str(tmp_path / "lists"))
+
+
+def save(organizer, tmp_path, list_id, name, text="x"):
+    source = str(tmp_path / name)
+    write(source, text)
+    [(_, saved)], failures = organizer.save_to_list([source], list_id)
+    assert failures == []
+    return saved
+
+
+def test_name_per_line_sections_file_is_migrated_with_names_as_ids(tmp_path, organizer):
+    write(organizer.sections_file, "Work\nHome\n")
+    work_file = str(tmp_path / "lists" / "Work" / "a.txt")
+    append_catalog(organizer.catalog_file, [(work_file, "Work")])
+
+    assert organizer.lists() == [("Work", "Work", "Work"), ("Home", "Home", "Home")]
+    assert read(organizer.sections_file) == "Work|||Work|||Work\nHome|||Home|||Home\n"
+    assert organizer.entries(["Work"]) == [(work_file, "Work")]
+    assert organizer.list_folder("Work") == str(tmp_path / "lists" / "Work")
+
+
+def test_rename_changes_only_the_sections_file(tmp_path, organizer):
+    list_id = organizer.add_lists(["Drafts"])["Drafts"]
+    saved = save(organizer, tmp_path, list_id, "a.txt")
+    organizer.set_notes({(saved, list_id): "check this"})
+    catalog, notes = read(organizer.catalog_file), read(organizer.notes_file)
+
+    organizer.rename_list(list_id, "Final")
+    assert organizer.list_names() == {list_id: "Final"}
+    assert organizer.list_id("Final") == list_id and organizer.list_id("Drafts") is None
+    assert read(organizer.catalog_file) == catalog and read(organizer.notes_file) == notes
+    assert organizer.list_folder(list_id) == os.path.dirname(saved) and os.path.exists(saved)
+
+
+def test_rename_refuses_taken_names_and_unknown_ids(organizer):
+    ids = organizer.add_lists(["One", "Two"])
+    with pytest.raises(ValueError):
+        organizer.rename_list(ids["One"], "Two")
+    with pytest.raises(ValueError):
+        organizer.rename_list("missing", "Three")
+    with pytest.raises(ValueError):
+        organizer.rename_list(ids["One"], "a|||b")
+    assert organizer.list_names() == {ids["One"]: "One", ids["Two"]: "Two"}
+
+
+def test_new_list_gets_its_own_folder_next_to_a_leftover_one(tmp_path, organizer):
+    os.makedirs(str(tmp_path / "lists" / "Photos"))
+    list_id = organizer.add_lists(["Photos"])["Photos"]
+    folder = organizer.list_folder(list_id)
+    assert folder != str(tmp_path / "lists" / "Photos")
+    assert os.path.basename(folder).startswith("Photos (")
+
+
+def test_remove_takes_the_list_its_entries_notes_mode_and_folder(tmp_path, organizer):
+    ids = organizer.add_lists(["Old", "Kept"])
+    old_file = save(organizer, tmp_path, ids["Old"], "a.txt")
+    kept_file = save(organizer, tmp_path, ids["Kept"], "b.txt")
+    organizer.set_notes({(old_file, ids["Old"]): "gone", (kept_file, ids["Kept"]): "stays"})
+    organizer.set_storage_mode(ids["Old"], "hardlink")
+    organizer.set_storage_mode(ids["Kept"], "symlink")
+
+    removed, deleted, failures = organizer.remove_list(ids["Old"])
+    assert (removed, deleted, failures) == (1, 1, [])
+    assert organizer.lists() == [(ids["Kept"], "Kept", "Kept")]
+    assert organizer.entries() == [(kept_file, ids["Kept"])]
+    assert organizer.notes() == {(kept_file, ids["Kept"]): "stays"}
+    assert organizer.storage_modes() == {ids["Kept"]: "symlink"}
+    assert sorted(os.listdir(tmp_path / "lists")) == ["Kept"]
+
+
+def test_detach_moves_the_folder_aside_for_deleting_later(tmp_path, organizer):
+    list_id = organizer.add_lists(["Big"])["Big"]
+    saved = save(organizer, tmp_path, list_id, "a.txt")
+
+    removed, trash = organizer.detach_list(list_id)
+    assert removed == 1 and organizer.lists() == [] and organizer.entries() == []
+    assert os.path.basename(trash).startswith(REMOVING_PREFIX)
+    assert os.listdir(trash) == [os.path.basename(saved)] and not os.path.exists(saved)
+
+
+def test_removing_a_list_of_references_leaves_the_originals(tmp_path, organizer):
+    list_id = organizer.add_lists(["Refs"])["Refs"]
+    source = str(tmp_path / "original.txt")
+    write(source, "keep me")
+    organizer.save_to_list([source], list_id, mode="reference")
+
+    assert organizer.remove_list(list_id)[0] == 1
+    assert read(source) == "keep me"
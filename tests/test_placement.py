@@ -0,0 +1,171 @@
+import errno
+import os
+
+import pytest
+
+import organizer_core
+from organizer_core import AUTO_MODE, Organizer, move_file, place_file
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / "report.txt")
+    write(path, "original")
+    return path
+
+
+def no_reflinks(source, dest_path):
+    raise OSError(errno.EOPNOTSUPP, "Operation not supported", dest_path)
+
+
+def test_copy_is_a_separate_file(tmp_path, source):
+    dest = str(tmp_path / "copy.txt")
+    assert place_file(source, dest, "copy") == (dest, "copy")
+    write(source, "edited")
+    assert read(dest) == "original"
+
+
+def test_hardlink_shares_the_file(tmp_path, source):
+    dest = str(tmp_path / "link.txt")
+    assert place_file(source, dest, "hardlink") == (dest, "hardlink")
+    assert os.path.samefile(source, dest) and os.stat(source).st_nlink == 2
+
+
+def test_symlink_points_at_the_absolute_original(tmp_path, source, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dest = str(tmp_path / "link.txt")
+    assert place_file("report.txt", dest, "symlink") == (dest, "symlink")
+    assert os.path.islink(dest) and os.readlink(dest) == source
+
+
+def test_reference_places_nothing(tmp_path, source):
+    dest = str(tmp_path / "ref.txt")
+    assert place_file(source, dest, "reference") == (source, "reference")
+    assert not os.path.lexists(dest)
+
+
+def test_explicit_reflink_fails_where_cloning_is_unsupported(tmp_path, source, monkeypatch):
+    monkeypatch.setattr(organizer_core, "reflink", no_reflinks)
+    with pytest.raises(OSError):
+        place_file(source, str(tmp_path / "clone.txt"), "reflink")
+
+
+def test_auto_falls_back_to_a_hardlink_without_reflinks(tmp_path, source, monkeypatch):
+    monkeypatch.setattr(organizer_core, "reflink", no_reflinks)
+    dest = str(tmp_path / "auto.txt")
+    assert place_file(source, dest, AUTO_MODE) == (dest, "hardlink")
+    assert os.path.samefile(source, dest)
+
+
+def test_auto_falls_back_to_a_symlink_across_devices(tmp_path, source, monkeypatch):
+    def cross_device(source, dest_path):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(organizer_core, "reflink", no_reflinks)
+    monkeypatch.setattr(os, "link", cross_device)
+    dest = str(tmp_path / "auto.txt")
+    assert place_file(source, dest, AUTO_MODE) == (dest, "symlink")
+    assert os.path.islink(dest)
+
+
+def test_auto_records_the_original_when_nothing_can_be_linked(tmp_path, source, monkeypatch):
+    def refuse(*args):
+        raise OSError(errno.EPERM, "Operation not permitted")
+
+    monkeypatch.setattr(organizer_core, "reflink", no_reflinks)
+    monkeypatch.setattr(os, "link", refuse)
+    monkeypatch.setattr(os, "symlink", refuse)
+    dest = str(tmp_path / "auto.txt")
+    assert place_file(source, dest, AUTO_MODE) == (source, "reference")
+    assert not os.path.lexists(dest)
+
+
+def test_unknown_mode_is_refused(tmp_path, source):
+    with pytest.raises(ValueError):
+        place_file(source, str(tmp_path / "x.txt"), "teleport")
+
+
+@pytest.mark.parametrize("mode", ["copy", "hardlink", "symlink", "reference"])
+def test_save_to_list_records_the_mode_used(tmp_path, source, mode):
+    organizer = Organizer(base_dir=str(tmp_path), lists_dir=str(tmp_path / "lists"))
+    list_id = organizer.add_lists(["Reports"])["Reports"]
+    organizer.set_storage_mode(list_id, mode)
+    saved, failures = organizer.save_to_list([source], list_id)
+    assert failures == [] and len(saved) == 1
+    assert organizer.entries([list_id], with_modes=True) == [(saved[0][1], list_id, mode)]
+    expected = source if mode == "reference" else os.path.join(organizer.list_folder(list_id), "report.txt")
+    assert saved[0][1] == expected
+
+
+def test_default_storage_mode_applies_to_lists_without_their_own(tmp_path, source):
+    organizer = Organizer(base_dir=str(tmp_path), lists_dir=str(tmp_path / "lists"))
+    ids = organizer.add_lists(["Linked", "Copied"])
+    organizer.set_storage_mode(None, "hardlink")
+    organizer.set_storage_mode(ids["Copied"], "copy")
+    assert organizer.storage_mode(ids["Linked"]) == "hardlink"
+    assert organizer.storage_mode(ids["Copied"]) == "copy"
+    organizer.set_storage_mode(ids["Copied"], None)
+    assert organizer.storage_mode(ids["Copied"]) == "hardlink"
+
+
+def cross_device_renames(monkeypatch):
+    def rename(source, dest_path):
+        raise OSError(errno.EXDEV, "Invalid cross-device link", source)
+
+    monkeypatch.setattr(os, "rename", rename)
+
+
+def test_move_within_a_filesystem_renames(tmp_path, source):
+    dest = str(tmp_path / "moved.txt")
+    assert move_file(source, dest) == 0
+    assert read(dest) == "original" and not os.path.exists(source)
+
+
+def test_move_across_devices_copies_then_deletes(tmp_path, source, monkeypatch):
+    os.utime(source, (1_000_000_000, 1_000_000_000))
+    cross_device_renames(monkeypatch)
+    dest = str(tmp_path / "moved.txt")
+    assert move_file(source, dest) == len("original")
+    assert read(dest) == "original" and not os.path.exists(source)
+    assert os.stat(dest).st_mtime == 1_000_000_000
+    assert sorted(os.listdir(tmp_path)) == ["moved.txt"]
+
+
+def test_interrupted_cross_device_move_keeps_the_source(tmp_path, source, monkeypatch):
+    def copy_fails(src, dest, length=0):
+        dest.write(b"orig")
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    cross_device_renames(monkeypatch)
+    monkeypatch.setattr(organizer_core.shutil, "copyfileobj", copy_fails)
+    with pytest.raises(OSError):
+        move_file(source, str(tmp_path / "moved.txt"))
+    assert read(source) == "original"
+    assert sorted(os.listdir(tmp_path)) == ["report.txt"]  # No partial file left behind
+
+
+def test_move_errors_other_than_cross_device_are_raised(tmp_path, source):
+    with pytest.raises(OSError):
+        move_file(source, str(tmp_path / "missing" / "moved.txt"))
+    assert read(source) == "original"
+
+
+def test_symlink_entries_follow_a_moved_file(tmp_path, source):
+    organizer = Organizer(base_dir=str(tmp_path), lists_dir=str(tmp_path / "lists"))
+    list_id = organizer.add_lists(["Linked"])["Linked"]
+    [(_, link)], _ = organizer.save_to_list([source], list_id, mode="symlink")
+    dest = str(tmp_path / "moved.txt")
+    move_file(source, dest)
+    organizer.relocate([(source, dest)])
+    assert os.readlink(link) == dest and read(link) == "original"
+    assert organizer.entries([list_id], with_modes=True) == [(link, list_id, "symlink")]
@@ -0,0 +1,45 @@
+import pytest
+
+from tag_index import TagIndex, TagQueryError, parse_query
+
+A, B, C = ("tag", "a"), ("tag", "b"), ("tag", "c")
+
+
+def test_not_binds_tighter_than_and():
+    assert parse_query("NOT a AND b") == ("and", ("not", A), B)
+
+
+def test_and_binds_tighter_than_or():
+    assert parse_query("a OR b AND c") == ("or", A, ("and", B, C))
+    assert parse_query("a AND b OR c") == ("or", ("and", A, B), C)
+
+
+def test_adjacent_terms_are_anded():
+    assert parse_query("a b NOT c") == parse_query("a AND b AND NOT c") == ("and", ("and", A, B), ("not", C))
+    assert parse_query("a b OR c") == ("or", ("and", A, B), C)
+
+
+def test_parentheses_override_precedence():
+    assert parse_query("(a OR b) AND c") == ("and", ("or", A, B), C)
+    assert parse_query("NOT (a OR b)") == ("not", ("or", A, B))
+
+
+def test_operators_are_case_insensitive_and_tags_normalized():
+    assert parse_query('a or  "Old   Notes"') == ("or", A, ("tag", "old notes"))
+    assert parse_query("not NOT a") == ("not", ("not", A))
+
+
+@pytest.mark.parametrize("expression", ["", "a AND", "OR a", "(a OR b", "a)", "NOT", "()"])
+def test_bad_queries_raise(expression):
+    with pytest.raises(TagQueryError):
+        parse_query(expression)
+
+
+def test_query_follows_precedence(tmp_path):
+    index = TagIndex(str(tmp_path / "tags.txt"))
+    index.add_tags(["/x", "/y"], ["a"])
+    index.add_tags(["/y", "/z"], ["b"])
+    index.add_tags(["/z"], ["c"])
+    assert index.query("a OR b AND c") == ["/x", "/y", "/z"]
+    assert index.query("(a OR b) AND c") == ["/z"]
+    assert index.query("NOT a AND b") == ["/z"]